@@ -0,0 +1,83 @@
+"""Compare ``glob`` + ``is_file`` discovery with the ``FileScanner`` scandir walk.
+
+Example::
+
+    uv run python -m benchmarks.bench_file_scan --files 200000 --workers 1 8
+
+Builds a synthetic tree (documents mixed with non-matching files and a large
+``node_modules`` directory) in a temporary folder, then times both listings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from glob import glob
+from pathlib import Path
+
+from sematic_desktop.foundation.file_scan import FileScanner
+
+_EXTENSIONS = {".txt", ".md", ".pdf"}
+_SUFFIXES = (".txt", ".md", ".pdf", ".png", ".js", ".o")
+
+
+def build_tree(root: Path, files: int, *, fanout: int = 50) -> None:
+    """Create ``files`` files spread over ``fanout`` top-level folders, plus node_modules."""
+
+    for index in range(files):
+        folder = root / f"top-{index % fanout}" / f"sub-{index // fanout % fanout}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"file-{index}{_SUFFIXES[index % len(_SUFFIXES)]}").touch()
+    for index in range(files // 2):
+        folder = root / "node_modules" / f"pkg-{index % fanout}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"module-{index}.md").touch()
+
+
+def glob_listing(root: Path) -> list[Path]:
+    """The previous ``list_files`` body: glob everything, then ``is_file`` and filter."""
+
+    files = []
+    for entry in glob(str(root / "**" / "*"), recursive=True):
+        path = Path(entry)
+        if path.is_file() and path.suffix.lower() in _EXTENSIONS:
+            files.append(path)
+    files.sort()
+    return files
+
+
+def timed(function, *args) -> tuple[float, int]:
+    started = time.perf_counter()
+    count = len(function(*args))
+    return time.perf_counter() - started, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--files", type=int, default=50_000, help="Files in the tree (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 8],
+        help="Scanner thread counts to test (default: %(default)s).",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        root = Path(folder)
+        build_tree(root, args.files)
+        seconds, count = timed(glob_listing, root)
+        print(f"{'method':>16} {'seconds':>8} {'files':>8}")
+        print(f"{'glob + is_file':>16} {seconds:>8.2f} {count:>8}")
+        for workers in args.workers:
+            scanner = FileScanner(extensions=_EXTENSIONS, workers=workers)
+            seconds, count = timed(scanner.scan, root)
+            print(f"{f'scandir x{workers}':>16} {seconds:>8.2f} {count:>8}")
+
+
+if __name__ == "__main__":
+    main()
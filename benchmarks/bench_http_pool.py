@@ -0,0 +1,99 @@
+"""Compare per-request latency of one-shot ``urllib`` calls and the keep-alive pool.
+
+Example::
+
+    uv run python -m benchmarks.bench_http_pool --requests 2000 --threads 1 4
+
+A local stub server answers every POST with a small embedding payload, so the numbers
+isolate connection setup/teardown from model time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib import request
+
+from sematic_desktop.foundation.http_pool import HttpConnectionPool
+
+_RESPONSE = json.dumps({"embedding": [0.0] * 768}).encode("utf-8")
+_PAYLOAD = json.dumps({"model": "embeddinggemma:latest", "prompt": "hello world"}).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(_RESPONSE)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+def urllib_post(url: str) -> bytes:
+    """One request per connection, as ``remote_embeddings`` did before the pool."""
+
+    req = request.Request(url, data=_PAYLOAD, headers={"Content-Type": "application/json"})
+    with request.urlopen(req, timeout=30) as response:
+        return response.read()
+
+
+def run(post: Callable[[str], bytes], url: str, *, requests: int, threads: int) -> float:
+    """Return the mean wall-clock microseconds per request."""
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(lambda _: post(url), range(requests)):
+            pass
+    return (time.perf_counter() - started) * 1_000_000 / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--requests", type=int, default=2_000, help="Requests per run (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=[1, 4],
+        help="Concurrent callers to test (default: %(default)s).",
+    )
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/embeddings"
+    print(f"{'threads':>8} {'urllib (us/req)':>16} {'pooled (us/req)':>16} {'saving':>8}")
+    try:
+        for threads in args.threads:
+            pool = HttpConnectionPool(max_connections=threads)
+            one_shot = run(urllib_post, url, requests=args.requests, threads=threads)
+            pooled = run(
+                partial(pool.post, body=_PAYLOAD), url, requests=args.requests, threads=threads
+            )
+            pool.close()
+            print(
+                f"{threads:>8} {one_shot:>16.1f} {pooled:>16.1f} "
+                f"{(1 - pooled / one_shot) * 100:>7.0f}%"
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
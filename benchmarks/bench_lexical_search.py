@@ -0,0 +1,97 @@
+"""Time BM25 lookups of exact identifiers through ``LanceMetadataStore.search_text``.
+
+Example::
+
+    uv run python -m benchmarks.bench_lexical_search --documents 20000 --queries 200
+
+Writes synthetic markdown rows (prose plus one contract number each) to a temporary
+metadata table and reports the median search latency twice: while the rows are
+still matched by Lance's scan of unindexed fragments, and after ``compact()`` has
+folded them into the full-text indexes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from sematic_desktop.data.stores import LanceMetadataStore
+from sematic_desktop.services.maintenance import DEFAULT_RETENTION
+
+_WORDS = (
+    "lease tenant invoice shipment warranty renewal clause payment schedule delivery "
+    "inspection liability notice premises supplier quantity deadline approval budget"
+).split()
+
+
+def build_rows(documents: int, *, seed: int = 7) -> list[dict[str, object]]:
+    """Return ``documents`` metadata rows, each with a unique ``CN-<n>`` identifier."""
+
+    generator = random.Random(seed)
+    rows = []
+    for index in range(documents):
+        prose = " ".join(generator.choices(_WORDS, k=300))
+        rows.append(
+            {
+                "source_path": f"/docs/{index}.txt",
+                "markdown_path": f"/md/{index}.txt.md",
+                "description": " ".join(generator.choices(_WORDS, k=12)),
+                "tags": [],
+                "content": f"# Contract CN-{index:06d}\n\n{prose}",
+            }
+        )
+    return rows
+
+
+def time_searches(
+    store: LanceMetadataStore, documents: int, queries: int, top_k: int
+) -> tuple[float, int]:
+    """Return the median latency of ``queries`` identifier searches and the top-1 hits."""
+
+    generator = random.Random(11)
+    latencies = []
+    hits = 0
+    for _ in range(queries):
+        target = generator.randrange(documents)
+        started = time.perf_counter()
+        results = store.search_text(f"CN-{target:06d}", limit=top_k)
+        latencies.append(time.perf_counter() - started)
+        hits += bool(results) and results[0]["source_path"] == f"/docs/{target}.txt"
+    return statistics.median(latencies), hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--documents", type=int, default=5_000, help="Rows to index (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--queries", type=int, default=100, help="Timed searches (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--top-k", type=int, default=5, help="Results per search (default: %(default)s)."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        store = LanceMetadataStore(folder, "properties")
+        rows = build_rows(args.documents)
+        for start in range(0, len(rows), 1_000):
+            store.upsert_many(rows[start : start + 1_000])
+
+        print(f"documents: {args.documents}")
+        for label in ("unindexed", "indexed"):
+            if label == "indexed":
+                started = time.perf_counter()
+                store.compact(retention=DEFAULT_RETENTION)
+                print(f"index refresh: {(time.perf_counter() - started) * 1000:.1f} ms")
+            median, hits = time_searches(store, args.documents, args.queries, args.top_k)
+            print(f"median search ({label}): {median * 1000:.2f} ms")
+            print(f"identifier ranked first ({label}): {hits}/{args.queries}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Benchmark the vectorized ``search_vectors`` scan against the row-by-row path.
+
+Example::
+
+    uv run python -m benchmarks.bench_search_vectors --rows 10000 100000 1000000
+
+The legacy path materializes every row as a Python dict, so at one million rows it needs
+several gigabytes of RAM; pass ``--legacy-max-rows`` to skip it for the larger tables.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import numpy as np
+import pyarrow as pa
+
+from sematic_desktop.foundation.lance import create_tag_table, search_vectors
+
+
+def legacy_search_vectors(table, vector: list[float], *, limit: int = 5) -> list[dict[str, Any]]:
+    """Row-by-row cosine scan that ``search_vectors`` replaced."""
+
+    query = np.asarray(vector, dtype="float32")
+    rows = table.to_arrow().to_pylist()
+
+    def cosine_distance(other: Sequence[float]) -> float:
+        other_vec = np.asarray(other, dtype="float32")
+        denom = np.linalg.norm(query) * np.linalg.norm(other_vec)
+        if denom == 0:
+            return float("inf")
+        return 1.0 - float(np.dot(query, other_vec) / denom)
+
+    scored_rows = []
+    for row in rows:
+        row["_distance"] = cosine_distance(row["vector"])
+        scored_rows.append((row, row["_distance"]))
+    scored_rows.sort(key=lambda item: item[1])
+    return [row for row, _ in scored_rows[:limit]]
+
+
+def populate_table(table, *, rows: int, dim: int, batch_size: int = 50_000) -> None:
+    """Append ``rows`` random tag embeddings to ``table`` in Arrow batches."""
+
+    rng = np.random.default_rng(0)
+    for start in range(0, rows, batch_size):
+        count = min(batch_size, rows - start)
+        values = rng.standard_normal(count * dim, dtype=np.float32)
+        sources = [f"/docs/file-{index}.txt" for index in range(start, start + count)]
+        table.add(
+            pa.table(
+                {
+                    "source_path": sources,
+                    "markdown_path": [f"{source}.md" for source in sources],
+                    "tag_text": [f"tag {index % 997}" for index in range(start, start + count)],
+                    "vector": pa.ListArray.from_arrays(
+                        pa.array(np.arange(0, (count + 1) * dim, dim, dtype=np.int32)),
+                        pa.array(values),
+                    ),
+                },
+            ),
+        )
+
+
+def time_search(
+    search: Callable[..., list[dict[str, Any]]],
+    table,
+    query: list[float],
+    *,
+    limit: int,
+    repeats: int,
+) -> float:
+    """Return the median wall-clock seconds for ``repeats`` searches."""
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        search(table, query, limit=limit)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="Table sizes to benchmark (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--dim", type=int, default=768, help="Vector dimension (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--limit", type=int, default=5, help="Top-k per query (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=3, help="Timed searches per path (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--legacy-max-rows",
+        type=int,
+        default=None,
+        help="Skip the legacy path above this many rows (default: always run it).",
+    )
+    args = parser.parse_args()
+
+    query = np.random.default_rng(1).standard_normal(args.dim).astype(np.float32).tolist()
+    print(f"{'rows':>10} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as scratch:
+        for rows in args.rows:
+            table = create_tag_table(Path(scratch), f"bench_{rows}")
+            populate_table(table, rows=rows, dim=args.dim)
+            vectorized = time_search(
+                search_vectors, table, query, limit=args.limit, repeats=args.repeats
+            )
+            if args.legacy_max_rows is not None and rows > args.legacy_max_rows:
+                print(f"{rows:>10} {'skipped':>12} {vectorized:>15.4f} {'-':>9}")
+                continue
+            legacy = time_search(
+                legacy_search_vectors, table, query, limit=args.limit, repeats=args.repeats
+            )
+            print(f"{rows:>10} {legacy:>12.4f} {vectorized:>15.4f} {legacy / vectorized:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Report ANN recall@k and latency against the exact ``search_vectors`` scan.
+
+Example::
+
+    uv run python -m benchmarks.bench_vector_index --rows 50000 200000 --index-type IVF_PQ
+
+For every corpus size the script records the exact top-k for a fixed query set, builds
+the requested index, and sweeps ``nprobes``/``refine_factor`` so settings can be picked
+per corpus size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+from sematic_desktop.foundation.lance import create_doc_table, search_vectors, vector_metric
+
+
+def build_table(root: Path, *, rows: int, dim: int, batch_size: int = 50_000):
+    """Create a fixed-size vector table filled with clustered random embeddings."""
+
+    table = create_doc_table(root, f"bench_{rows}", dim=dim)
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((64, dim), dtype=np.float32)
+    for start in range(0, rows, batch_size):
+        count = min(batch_size, rows - start)
+        labels = rng.integers(0, len(centers), size=count)
+        values = centers[labels] + 0.3 * rng.standard_normal((count, dim), dtype=np.float32)
+        sources = [f"/docs/file-{index}.txt" for index in range(start, start + count)]
+        table.add(
+            pa.table(
+                {
+                    "source_path": sources,
+                    "markdown_path": [f"{source}.md" for source in sources],
+                    "vector": pa.FixedSizeListArray.from_arrays(pa.array(values.ravel()), dim),
+                },
+                schema=table.schema,
+            ),
+        )
+    return table
+
+
+def exact_neighbours(table, queries: np.ndarray, *, k: int) -> list[set[str]]:
+    """Return the ground-truth ``source_path`` sets from the exact scan."""
+
+    return [
+        {row["source_path"] for row in search_vectors(table, query.tolist(), limit=k)}
+        for query in queries
+    ]
+
+
+def measure(
+    table,
+    queries: np.ndarray,
+    truth: list[set[str]],
+    *,
+    k: int,
+    nprobes: int,
+    refine_factor: int | None,
+) -> tuple[float, float]:
+    """Return (recall@k, median latency in milliseconds) for one setting."""
+
+    recalls = []
+    timings = []
+    for query, expected in zip(queries, truth, strict=True):
+        started = time.perf_counter()
+        rows = search_vectors(
+            table, query.tolist(), limit=k, nprobes=nprobes, refine_factor=refine_factor
+        )
+        timings.append((time.perf_counter() - started) * 1_000)
+        found = {row["source_path"] for row in rows}
+        recalls.append(len(found & expected) / max(len(expected), 1))
+    return statistics.fmean(recalls), statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[50_000, 200_000],
+        help="Corpus sizes to benchmark (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--dim", type=int, default=768, help="Vector dimension (default: %(default)s)."
+    )
+    parser.add_argument("--k", type=int, default=10, help="Top-k (default: %(default)s).")
+    parser.add_argument(
+        "--queries", type=int, default=50, help="Queries per setting (default: %(default)s)."
+    )
+    parser.add_argument(
+        "--index-type",
+        default="IVF_PQ",
+        choices=["IVF_PQ", "IVF_HNSW_SQ"],
+        help="Index to build (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--nprobes",
+        type=int,
+        nargs="+",
+        default=[5, 10, 20, 50],
+        help="nprobes values to sweep (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--refine-factors",
+        type=int,
+        nargs="+",
+        default=[0, 5, 10],
+        help="Refine factors to sweep; 0 disables refinement (default: %(default)s).",
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    print(
+        f"{'rows':>9} {'nprobes':>8} {'refine':>7} {'recall@k':>9} "
+        f"{'ann (ms)':>9} {'exact (ms)':>11}"
+    )
+    with tempfile.TemporaryDirectory() as scratch:
+        for rows in args.rows:
+            table = build_table(Path(scratch), rows=rows, dim=args.dim)
+            sample = table.search().select(["vector"]).limit(args.queries).to_arrow()
+            queries = np.asarray(sample.column("vector").to_pylist(), dtype=np.float32)
+            queries += 0.05 * rng.standard_normal(queries.shape, dtype=np.float32)
+
+            started = time.perf_counter()
+            truth = exact_neighbours(table, queries, k=args.k)
+            exact_ms = (time.perf_counter() - started) * 1_000 / len(queries)
+
+            table.create_index(
+                metric=vector_metric(table), index_type=args.index_type, vector_column_name="vector"
+            )
+            for nprobes in args.nprobes:
+                for refine in args.refine_factors:
+                    recall, latency = measure(
+                        table,
+                        queries,
+                        truth,
+                        k=args.k,
+                        nprobes=nprobes,
+                        refine_factor=refine or None,
+                    )
+                    print(
+                        f"{rows:>9} {nprobes:>8} {refine:>7} {recall:>9.3f} "
+                        f"{latency:>9.2f} {exact_ms:>11.2f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
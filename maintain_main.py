@@ -0,0 +1,62 @@
+"""Compact, prune, and report on the Lance tables of an indexed folder."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from sematic_desktop.presentation.maintenance_cli import (
+    print_maintenance_results,
+    print_prune_result,
+    run_maintenance_cli,
+    run_prune_cli,
+)
+from sematic_desktop.presentation.search_cli import resolve_metadata_folder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compact fragments, optimize indexes, and prune old Lance versions.",
+    )
+    parser.add_argument(
+        "--folder",
+        default="my_folder",
+        help="Source folder that was previously indexed (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--metadata-root",
+        default=None,
+        help="Override path to the '.semantic_index/metadata' root if needed.",
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=float,
+        default=7,
+        help="Keep table versions newer than this many days (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="First remove rows and markdown of files that no longer exist in --folder.",
+    )
+    parser.add_argument(
+        "--output-root",
+        default=None,
+        help="Override path to the '.semantic_index/markdown' root used by --prune.",
+    )
+
+    args = parser.parse_args()
+    metadata_root = Path(args.metadata_root) if args.metadata_root else None
+    if args.prune:
+        output_root = Path(args.output_root) if args.output_root else None
+        print_prune_result(
+            run_prune_cli(Path(args.folder), output_root=output_root, metadata_root=metadata_root)
+        )
+    metadata_folder = resolve_metadata_folder(Path(args.folder), metadata_root)
+    print_maintenance_results(
+        run_maintenance_cli(metadata_folder, retention_days=args.retention_days)
+    )
+
+
+if __name__ == "__main__":
+    main()
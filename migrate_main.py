@@ -0,0 +1,51 @@
+"""One-time migration that rewrites stored embeddings at unit length and backfills content."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from sematic_desktop.presentation.maintenance_cli import (
+    print_content_backfill_result,
+    print_normalize_results,
+    run_content_backfill_cli,
+    run_normalize_cli,
+)
+from sematic_desktop.presentation.search_cli import resolve_metadata_folder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Normalize embeddings and backfill markdown content stored by older "
+            "sematic-desktop releases."
+        ),
+    )
+    parser.add_argument(
+        "--folder",
+        default="my_folder",
+        help="Source folder that was previously indexed (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--metadata-root",
+        default=None,
+        help="Override path to the '.semantic_index/metadata' root if needed.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10_000,
+        help="Rows rewritten per Lance commit (default: %(default)s).",
+    )
+
+    args = parser.parse_args()
+    metadata_root = Path(args.metadata_root) if args.metadata_root else None
+    metadata_folder = resolve_metadata_folder(Path(args.folder), metadata_root)
+    print_normalize_results(run_normalize_cli(metadata_folder, batch_size=args.batch_size))
+    print_content_backfill_result(
+        run_content_backfill_cli(metadata_folder, batch_size=args.batch_size)
+    )
+
+
+if __name__ == "__main__":
+    main()
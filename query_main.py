@@ -7,6 +7,8 @@ from pathlib import Path
 
 from sematic_desktop.presentation.search_cli import (
     build_search_engine,
+    print_chunk_search,
+    print_hybrid_search,
     print_property_examples,
     print_rag_answer,
     print_tag_search,
@@ -57,6 +59,34 @@ def main() -> None:
         default=3,
         help="Number of tag matches to show (default: %(default)s).",
     )
+    parser.add_argument(
+        "--chunk-query",
+        default="",
+        help="Passage-level semantic query over markdown chunks (skipped when empty).",
+    )
+    parser.add_argument(
+        "--chunk-limit",
+        type=int,
+        default=3,
+        help="Number of documents to show for the passage query (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--search-query",
+        default="",
+        help="Keyword-aware query fusing BM25 and vector rankings (skipped when empty).",
+    )
+    parser.add_argument(
+        "--search-mode",
+        choices=("hybrid", "lexical"),
+        default="hybrid",
+        help="'lexical' ranks by BM25 only and never calls Ollama (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--search-limit",
+        type=int,
+        default=5,
+        help="Number of documents to show for --search-query (default: %(default)s).",
+    )
     parser.add_argument(
         "--qa-question",
         default="What are the most important updates?",
@@ -68,12 +98,29 @@ def main() -> None:
         default=3,
         help="Number of documents to ground RAG answers with (default: %(default)s).",
     )
+    parser.add_argument(
+        "--qa-token-budget",
+        type=int,
+        default=None,
+        help="Approximate prompt tokens of passages to ground RAG answers with "
+        "(default: the engine's context_token_budget).",
+    )
+    parser.add_argument(
+        "--resident-cache-mb",
+        type=int,
+        default=256,
+        help="Keep each embedding table's vectors in memory across the queries of this run "
+        "when it fits in this many MiB; 0 disables (default: %(default)s).",
+    )
 
     args = parser.parse_args()
     folder = Path(args.folder)
     metadata_root = Path(args.metadata_root) if args.metadata_root else None
     metadata_folder = resolve_metadata_folder(folder, metadata_root)
-    engine = build_search_engine(metadata_folder)
+    engine = build_search_engine(
+        metadata_folder,
+        resident_cache_max_bytes=args.resident_cache_mb * 1024 * 1024 or None,
+    )
 
     metadata_store = engine.metadata_store
     property_rows = query_properties(
@@ -88,7 +135,25 @@ def main() -> None:
     print_tag_search(engine, query=args.tag_query, top_k=args.tag_limit)
     print()
 
-    print_rag_answer(engine, question=args.qa_question, top_k=args.qa_top_k)
+    if args.search_query:
+        print_hybrid_search(
+            engine,
+            query=args.search_query,
+            top_k=args.search_limit,
+            lexical_only=args.search_mode == "lexical",
+        )
+        print()
+
+    if args.chunk_query:
+        print_chunk_search(engine, query=args.chunk_query, top_k=args.chunk_limit)
+        print()
+
+    print_rag_answer(
+        engine,
+        question=args.qa_question,
+        top_k=args.qa_top_k,
+        token_budget=args.qa_token_budget,
+    )
 
 
 if __name__ == "__main__":
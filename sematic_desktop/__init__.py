@@ -1,6 +1,7 @@
 """Core package for sematic-desktop utilities."""
 
 from .data.stores import LanceEmbeddingStore, LanceMetadataStore
+from .middleware.chunking import MarkdownChunker
 from .middleware.embeddings import EmbeddingGemmaClient, EmbeddingGemmaError
 from .middleware.routing import ConversionRouter, FileSignals, gather_file_signals
 from .middleware.summarizer import MarkdownSummarizer, MarkdownSummary
@@ -25,6 +26,7 @@ __all__ = [
     "FileSignals",
     "LanceEmbeddingStore",
     "LanceMetadataStore",
+    "MarkdownChunker",
     "MarkdownIndexService",
     "MarkdownSummarizer",
     "MarkdownSummary",
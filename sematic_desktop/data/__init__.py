@@ -1,5 +1,5 @@
 """Data access layer for Lance-backed storage."""
 
-from .stores import LanceEmbeddingStore, LanceMetadataStore
+from .stores import LanceEmbeddingStore, LanceManifestStore, LanceMetadataStore
 
-__all__ = ["LanceEmbeddingStore", "LanceMetadataStore"]
+__all__ = ["LanceEmbeddingStore", "LanceManifestStore", "LanceMetadataStore"]
@@ -2,26 +2,71 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 from sematic_desktop.foundation.lance import (
+    CHUNK_KEY_COLUMNS,
+    CHUNK_SCALAR_INDEXES,
+    DOC_KEY_COLUMNS,
+    DOC_SCALAR_INDEXES,
+    METADATA_SCALAR_INDEXES,
+    METADATA_TEXT_COLUMNS,
+    TAG_KEY_COLUMNS,
+    TAG_SCALAR_INDEXES,
+    TableStats,
+    compact_table,
+    create_chunk_table,
     create_doc_table,
+    create_manifest_table,
     create_metadata_table,
     create_tag_table,
+    delete_source_rows,
+    ensure_scalar_indexes,
+    ensure_vector_index,
     fetch_metadata_rows,
+    find_vector_index,
+    list_chunk_sources,
     list_doc_sources,
+    list_metadata_sources,
     list_tag_pairs,
+    mark_vectors_normalized,
+    normalize_stored_vectors,
+    read_manifest_rows,
+    replace_source_rows,
+    search_text,
     search_vectors,
+    table_stats,
+    unit_vector,
+    upsert_manifest_rows,
     upsert_metadata_row,
+    upsert_metadata_rows,
     upsert_vectors,
+    vector_dimension,
+    vectors_are_normalized,
 )
+from sematic_desktop.foundation.vector_cache import ResidentVectorMatrix
 
-__all__ = ["LanceMetadataStore", "LanceEmbeddingStore"]
+__all__ = ["LanceManifestStore", "LanceMetadataStore", "LanceEmbeddingStore"]
+
+# Columns returned with each vector hit, per variant; searches read nothing else.
+_RESULT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "document": ("source_path", "markdown_path"),
+    "tags": ("source_path", "markdown_path", "tag_text"),
+    "chunks": ("source_path", "markdown_path", "chunk_index", "start", "end", "heading"),
+}
 
 
 class LanceMetadataStore:
-    """Persists metadata for each document into a Lance table."""
+    """Persists metadata for each document into a Lance table.
+
+    ``source_path`` carries a BTREE index so lookups, deletes, and merge-inserts seek
+    instead of scanning. The markdown ``content`` and the ``description`` carry
+    full-text indexes that ``search_text`` ranks with BM25 without writing to the
+    table. Opening the store never writes: ``ensure_scalar_indexes()`` creates the
+    indexes and, like ``compact()``, folds new rows into them.
+    """
 
     def __init__(self, root: Path | str, table_name: str) -> None:
         self.root = Path(root).expanduser().resolve()
@@ -44,24 +89,163 @@ class LanceMetadataStore:
         upsert_metadata_row(self.table, record)
         self._known_sources = None
 
-    def fetch_by_paths(self, paths: list[str]) -> dict[str, dict[str, Any]]:
+    def upsert_many(self, records: list[dict[str, Any]]) -> None:
+        """Replace or insert every record in one commit."""
+
+        if not records:
+            return
+        for record in records:
+            record["source_path"] = self._normalize_path(record["source_path"])
+        upsert_metadata_rows(self.table, records)
+        self._known_sources = None
+
+    def fetch_by_paths(
+        self, paths: list[str], *, columns: Sequence[str] | None = None
+    ) -> dict[str, dict[str, Any]]:
         """Return metadata rows keyed by ``source_path`` for the provided paths."""
 
-        return fetch_metadata_rows(self.table, paths)
+        return fetch_metadata_rows(self.table, paths, columns=columns)
+
+    def missing_content(self) -> list[dict[str, Any]]:
+        """Return the records written before the markdown ``content`` column existed."""
+
+        missing = list_metadata_sources(self.table, where="content IS NULL")
+        return list(fetch_metadata_rows(self.table, sorted(missing)).values())
+
+    def search_text(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        columns: Sequence[str] = ("source_path", "markdown_path", "description", "tags"),
+    ) -> list[dict[str, Any]]:
+        """Return records ranked by BM25 over ``content`` and ``description``.
+
+        Rows carry their score in ``_score``; only ``columns`` are read.
+        """
+
+        return search_text(
+            self.table, query, columns=METADATA_TEXT_COLUMNS, limit=limit, select=columns
+        )
+
+    def sources(self) -> set[str]:
+        """Return every ``source_path`` with a metadata record."""
+
+        return set(self._load_known_sources())
+
+    def delete_sources(self, paths: Sequence[Path | str]) -> None:
+        """Remove the records for ``paths`` with batched ``IN`` deletes."""
+
+        if not paths:
+            return
+        delete_source_rows(self.table, [self._normalize_path(path) for path in paths])
+        self._known_sources = None
+
+    def ensure_scalar_indexes(self, *, min_unindexed_rows: int = 500) -> dict[str, str]:
+        """Fold recently written rows into the ``source_path`` and full-text indexes.
+
+        Unindexed rows are matched by a flat BM25 scan that re-tokenizes their content
+        on every search, so the indexes are refreshed after fewer new rows than the
+        embedding tables' (see ``ensure_scalar_indexes`` in the foundation layer).
+        """
+
+        return ensure_scalar_indexes(
+            self.table, METADATA_SCALAR_INDEXES, min_unindexed_rows=min_unindexed_rows
+        )
+
+    def tables(self) -> dict[str, Any]:
+        """Return the Lance tables owned by this store keyed by name."""
+
+        return {self.table_name: self.table}
+
+    def stats(self) -> dict[str, TableStats]:
+        """Return row, fragment, version, and byte counts per table."""
+
+        return {name: table_stats(table) for name, table in self.tables().items()}
+
+    def compact(self, *, retention: timedelta) -> None:
+        """Compact the metadata table and prune versions older than ``retention``."""
+
+        compact_table(self.table, retention=retention)
+        self._known_sources = None
 
     def _load_known_sources(self) -> set[str]:
         if self._known_sources is None:
-            arrow_table = self.table.to_arrow(columns=["source_path"])
-            if arrow_table.num_rows:
-                column = arrow_table.column("source_path")
-                self._known_sources = set(str(value) for value in column.to_pylist())
-            else:
-                self._known_sources = set()
+            self._known_sources = list_metadata_sources(self.table)
         return self._known_sources
 
 
+class LanceManifestStore:
+    """Records the size, mtime, and content hash of every indexed source file.
+
+    The manifest lives next to the metadata and embedding tables and lets each run
+    tell new, changed, unchanged, and removed files apart without reconverting.
+    """
+
+    def __init__(self, root: Path | str, table_name: str = "manifest") -> None:
+        self.root = Path(root).expanduser().resolve()
+        self.table_name = table_name
+        self.table = create_manifest_table(self.root, self.table_name)
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Return every manifest row keyed by ``source_path``."""
+
+        return read_manifest_rows(self.table)
+
+    def fetch(self, paths: list[str]) -> dict[str, dict[str, Any]]:
+        """Return the manifest rows for ``paths`` only, keyed by ``source_path``."""
+
+        return fetch_metadata_rows(self.table, paths)
+
+    def upsert_many(self, records: list[dict[str, Any]]) -> None:
+        """Replace or insert every entry in one commit."""
+
+        if not records:
+            return
+        for record in records:
+            record["source_path"] = str(Path(record["source_path"]).expanduser().resolve())
+        upsert_manifest_rows(self.table, records)
+
+    def sources(self) -> set[str]:
+        """Return every ``source_path`` recorded in the manifest."""
+
+        return list_metadata_sources(self.table)
+
+    def delete_sources(self, paths: Sequence[Path | str]) -> None:
+        """Forget the entries for ``paths``."""
+
+        if paths:
+            delete_source_rows(self.table, [str(path) for path in paths])
+
+    def tables(self) -> dict[str, Any]:
+        """Return the Lance tables owned by this store keyed by name."""
+
+        return {self.table_name: self.table}
+
+
 class LanceEmbeddingStore:
-    """Persists embeddings for each document/variant combination."""
+    """Persists embeddings for each document/variant combination.
+
+    Variants are "document" (one vector per file), "tags" (one per tag), and "chunks"
+    (one per markdown chunk, with its byte offsets and heading trail). A batch that
+    carries a document's vector replaces all of its tags and chunks, so write each
+    document's embeddings together; a batch of chunks alone replaces just its chunks.
+
+    Vector columns are fixed-size lists whose width comes from the first embedding
+    written (or the first stored row of an existing table). Vectors are scaled to unit
+    length on write so searches can rank by inner product; tables created before that
+    change need a one-time ``normalize_existing()``. Once a table holds
+    ``vector_index_min_rows`` rows an ANN index is built for it; the index is re-checked
+    after every ``vector_index_check_rows`` written rows so large ingests extend or
+    rebuild it. ``source_path`` (and ``tag_text`` on the tag table) carry scalar
+    indexes, created by ``ensure_scalar_indexes()``, so per-document lookups and
+    merge-inserts stay sub-linear.
+
+    Long-lived readers can pass ``resident_cache_max_bytes`` to keep each table's
+    vectors in memory between searches; the copy follows the Lance table version and
+    is skipped for tables that would not fit under the cap or that have an ANN index,
+    which is queried instead so ``nprobes``/``refine_factor`` keep applying.
+    """
 
     def __init__(
         self,
@@ -69,14 +253,35 @@ class LanceEmbeddingStore:
         doc_table_name: str = "emb_doc",
         *,
         tag_table_name: str = "emb_tags",
+        chunk_table_name: str = "emb_chunks",
+        vector_index_min_rows: int = 50_000,
+        vector_index_type: str = "IVF_PQ",
+        vector_index_check_rows: int = 10_000,
+        resident_cache_max_bytes: int | None = None,
     ) -> None:
         self.root = Path(root).expanduser().resolve()
         self.doc_table_name = doc_table_name
         self.tag_table_name = tag_table_name
+        self.chunk_table_name = chunk_table_name
+        self.vector_index_min_rows = vector_index_min_rows
+        self.vector_index_type = vector_index_type
+        self.vector_index_check_rows = vector_index_check_rows
         self.doc_table = create_doc_table(self.root, self.doc_table_name)
         self.tag_table = create_tag_table(self.root, self.tag_table_name)
+        self.chunk_table = create_chunk_table(self.root, self.chunk_table_name)
         self._known_documents: set[str] | None = None
         self._known_tag_pairs: set[tuple[str, str]] | None = None
+        self._known_chunk_sources: set[str] | None = None
+        self._rows_since_index_check = 0
+        self._vector_dim: int | None = None
+        self._resident: dict[str, ResidentVectorMatrix] = {}
+        if resident_cache_max_bytes is not None:
+            self._resident = {
+                variant: ResidentVectorMatrix(
+                    key_columns=columns, max_bytes=resident_cache_max_bytes
+                )
+                for variant, columns in _RESULT_COLUMNS.items()
+            }
 
     def _normalize_path(self, source_path: Path | str) -> str:
         return str(Path(source_path).expanduser().resolve())
@@ -89,6 +294,8 @@ class LanceEmbeddingStore:
         if variant == "tags":
             pairs = self._load_known_tag_pairs()
             return any(source == normalized for source, _ in pairs)
+        if variant == "chunks":
+            return normalized in self._load_known_chunk_sources()
         raise ValueError(f"Unknown embedding variant '{variant}'")
 
     def upsert_many(self, records: list[dict[str, Any]]) -> None:
@@ -96,6 +303,7 @@ class LanceEmbeddingStore:
             return
         doc_records: list[dict[str, Any]] = []
         tag_records: list[dict[str, Any]] = []
+        chunk_records: list[dict[str, Any]] = []
         for record in records:
             variant = record.get("variant")
             source_path = self._normalize_path(record["source_path"])
@@ -106,7 +314,7 @@ class LanceEmbeddingStore:
                     {
                         "source_path": source_path,
                         "markdown_path": markdown_path,
-                        "vector": vector,
+                        "vector": unit_vector(vector).tolist(),
                     },
                 )
             elif variant == "tags":
@@ -118,9 +326,24 @@ class LanceEmbeddingStore:
                         "source_path": source_path,
                         "markdown_path": markdown_path,
                         "tag_text": tag_text,
-                        "vector": vector,
+                        "vector": unit_vector(vector).tolist(),
+                    },
+                )
+            elif variant == "chunks":
+                chunk_records.append(
+                    {
+                        "source_path": source_path,
+                        "markdown_path": markdown_path,
+                        "chunk_index": int(record["chunk_index"]),
+                        "start": int(record["start"]),
+                        "end": int(record["end"]),
+                        "heading": str(record.get("heading") or ""),
+                        "vector": unit_vector(vector).tolist(),
                     },
                 )
+        written = doc_records or tag_records or chunk_records
+        if written:
+            self._ensure_vector_dimension(len(written[0]["vector"]))
         upsert_vectors(
             doc_table=self.doc_table,
             tag_table=self.tag_table,
@@ -129,29 +352,235 @@ class LanceEmbeddingStore:
         )
         if doc_records:
             self._known_documents = None
-        if tag_records:
+        if tag_records or doc_records:
             self._known_tag_pairs = None
+        if chunk_records or doc_records:
+            # A document record starts a full rewrite, so chunks it no longer has go too.
+            replace_source_rows(
+                self.chunk_table,
+                chunk_records,
+                key_columns=CHUNK_KEY_COLUMNS,
+                sources=[record["source_path"] for record in doc_records],
+            )
+            self._known_chunk_sources = None
+        self._rows_since_index_check += len(doc_records) + len(tag_records) + len(chunk_records)
+        if self._rows_since_index_check >= self.vector_index_check_rows:
+            self.ensure_vector_indexes()
+
+    def sources(self, variant: str) -> set[str]:
+        """Return every ``source_path`` with a ``variant`` ("document"/"tags"/"chunks") vector."""
+
+        if variant == "document":
+            return set(self._load_known_documents())
+        if variant == "tags":
+            return {source for source, _ in self._load_known_tag_pairs()}
+        if variant == "chunks":
+            return set(self._load_known_chunk_sources())
+        raise ValueError(f"Unknown embedding variant '{variant}'")
+
+    def delete_sources(self, paths: Sequence[Path | str], *, variant: str | None = None) -> None:
+        """Remove the vectors of ``paths`` with batched ``IN`` deletes.
+
+        ``variant`` limits the delete to the document, tag, or chunk table; by default
+        all three are cleared.
+        """
+
+        if not paths:
+            return
+        if variant not in {None, "document", "tags", "chunks"}:
+            raise ValueError(f"Unknown embedding variant '{variant}'")
+        normalized = [self._normalize_path(path) for path in paths]
+        if variant in {None, "document"}:
+            delete_source_rows(self.doc_table, normalized)
+            self._known_documents = None
+        if variant in {None, "tags"}:
+            delete_source_rows(self.tag_table, normalized)
+            self._known_tag_pairs = None
+        if variant in {None, "chunks"}:
+            delete_source_rows(self.chunk_table, normalized)
+            self._known_chunk_sources = None
+
+    def _ensure_vector_dimension(self, dim: int) -> None:
+        if self._vector_dim == dim:
+            return
+        if vector_dimension(self.doc_table) != dim:
+            self.doc_table = create_doc_table(self.root, self.doc_table_name, dim=dim)
+        if vector_dimension(self.tag_table) != dim:
+            self.tag_table = create_tag_table(self.root, self.tag_table_name, dim=dim)
+        if vector_dimension(self.chunk_table) != dim:
+            self.chunk_table = create_chunk_table(self.root, self.chunk_table_name, dim=dim)
+        self._vector_dim = dim
+        self._flag_empty_tables_normalized()
+
+    def _flag_empty_tables_normalized(self) -> None:
+        # Called before the first write (and by ``normalize_existing``) rather than on
+        # open, so a store opened only for searching leaves the tables untouched.
+        for table in (self.doc_table, self.tag_table, self.chunk_table):
+            if not vectors_are_normalized(table) and not table.count_rows():
+                mark_vectors_normalized(table)
+
+    def normalize_existing(self, *, batch_size: int = 10_000) -> dict[str, int]:
+        """Backfill unit-length vectors in tables written before normalization.
+
+        Returns the number of rows rewritten per table; tables that are already flagged
+        as normalized are left untouched and report zero; empty tables are only flagged.
+        """
+
+        self._flag_empty_tables_normalized()
+        rewritten = {
+            self.doc_table_name: normalize_stored_vectors(
+                self.doc_table, key_columns=DOC_KEY_COLUMNS, batch_size=batch_size
+            ),
+            self.tag_table_name: normalize_stored_vectors(
+                self.tag_table, key_columns=TAG_KEY_COLUMNS, batch_size=batch_size
+            ),
+            self.chunk_table_name: normalize_stored_vectors(
+                self.chunk_table, key_columns=CHUNK_KEY_COLUMNS, batch_size=batch_size
+            ),
+        }
+        if any(rewritten.values()):
+            self.ensure_vector_indexes()
+        return rewritten
+
+    def ensure_vector_indexes(self) -> dict[str, str]:
+        """Build or refresh the ANN indexes and return the action taken per table."""
+
+        self._rows_since_index_check = 0
+        return {
+            name: ensure_vector_index(
+                table,
+                min_rows=self.vector_index_min_rows,
+                index_type=self.vector_index_type,
+            )
+            for name, table in self.tables().items()
+        }
+
+    def tables(self) -> dict[str, Any]:
+        """Return the Lance tables owned by this store keyed by name."""
+
+        return {
+            self.doc_table_name: self.doc_table,
+            self.tag_table_name: self.tag_table,
+            self.chunk_table_name: self.chunk_table,
+        }
+
+    def stats(self) -> dict[str, TableStats]:
+        """Return row, fragment, version, and byte counts per table."""
+
+        return {name: table_stats(table) for name, table in self.tables().items()}
+
+    def compact(self, *, retention: timedelta) -> None:
+        """Compact the embedding tables and prune versions older than ``retention``."""
+
+        for table in self.tables().values():
+            compact_table(table, retention=retention)
+        self._known_documents = None
+        self._known_tag_pairs = None
+        self._known_chunk_sources = None
 
-    def search(self, vector: list[float], *, variant: str, limit: int = 5) -> list[dict[str, Any]]:
+    def ensure_scalar_indexes(self) -> dict[str, dict[str, str]]:
+        """Create or refresh the ``source_path``/``tag_text`` indexes; return actions per table."""
+
+        return {
+            self.doc_table_name: ensure_scalar_indexes(self.doc_table, DOC_SCALAR_INDEXES),
+            self.tag_table_name: ensure_scalar_indexes(self.tag_table, TAG_SCALAR_INDEXES),
+            self.chunk_table_name: ensure_scalar_indexes(self.chunk_table, CHUNK_SCALAR_INDEXES),
+        }
+
+    def search(
+        self,
+        vector: list[float],
+        *,
+        variant: str,
+        limit: int = 5,
+        nprobes: int | None = None,
+        refine_factor: int | None = None,
+    ) -> list[dict[str, Any]]:
         if variant == "document":
-            rows = search_vectors(self.doc_table, vector, limit=limit)
+            rows = self._search_table(
+                self.doc_table,
+                vector,
+                variant=variant,
+                limit=limit,
+                nprobes=nprobes,
+                refine_factor=refine_factor,
+            )
             for row in rows:
                 row["variant"] = "document"
                 row["variant_label"] = None
             return rows
         if variant == "tags":
-            rows = search_vectors(self.tag_table, vector, limit=limit)
+            rows = self._search_table(
+                self.tag_table,
+                vector,
+                variant=variant,
+                limit=limit,
+                nprobes=nprobes,
+                refine_factor=refine_factor,
+            )
             for row in rows:
                 row["variant"] = "tags"
                 row["variant_label"] = row.get("tag_text")
             return rows
+        if variant == "chunks":
+            rows = self._search_table(
+                self.chunk_table,
+                vector,
+                variant=variant,
+                limit=limit,
+                nprobes=nprobes,
+                refine_factor=refine_factor,
+            )
+            for row in rows:
+                row["variant"] = "chunks"
+                row["variant_label"] = row.get("heading") or None
+            return rows
         raise ValueError(f"Unknown embedding variant '{variant}'")
 
+    def evict_resident_cache(self) -> None:
+        """Release the in-memory vector copies; the next search reloads them."""
+
+        for cache in self._resident.values():
+            cache.evict()
+
+    def _search_table(
+        self,
+        table,
+        vector: list[float],
+        *,
+        variant: str,
+        limit: int,
+        nprobes: int | None,
+        refine_factor: int | None,
+    ) -> list[dict[str, Any]]:
+        cache = self._resident.get(variant)
+        if cache is not None and vector and limit > 0:
+            if find_vector_index(table) is None:
+                rows = cache.search(table, vector, limit=limit)
+                if rows is not None:
+                    return rows
+            elif cache.nbytes:
+                # The ANN index (tuned by nprobes/refine_factor) serves this table now.
+                cache.evict()
+        return search_vectors(
+            table,
+            vector,
+            limit=limit,
+            columns=_RESULT_COLUMNS[variant],
+            nprobes=nprobes,
+            refine_factor=refine_factor,
+        )
+
     def _load_known_documents(self) -> set[str]:
         if self._known_documents is None:
             self._known_documents = list_doc_sources(self.doc_table)
         return self._known_documents
 
+    def _load_known_chunk_sources(self) -> set[str]:
+        if self._known_chunk_sources is None:
+            self._known_chunk_sources = list_chunk_sources(self.chunk_table)
+        return self._known_chunk_sources
+
     def _load_known_tag_pairs(self) -> set[tuple[str, str]]:
         if self._known_tag_pairs is None:
             self._known_tag_pairs = list_tag_pairs(self.tag_table)
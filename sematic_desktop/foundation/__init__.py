@@ -8,46 +8,163 @@ from .conversion import (
     extract_markdown_from_docling,
     extract_markdown_from_markitdown,
 )
+from .file_scan import (
+    DEFAULT_EXCLUDED_DIRS,
+    IGNORE_FILE_NAMES,
+    FileScanner,
+    IgnoreRules,
+    ScannedFile,
+)
+from .file_watch import (
+    FileEvent,
+    FileWatcher,
+    InotifyWatcher,
+    PollingWatcher,
+    inotify_available,
+    open_file_watcher,
+)
+from .http_pool import HttpConnectionPool, default_http_pool
 from .lance import (
+    CHUNK_KEY_COLUMNS,
+    CHUNK_SCALAR_INDEXES,
+    DOC_KEY_COLUMNS,
+    DOC_SCALAR_INDEXES,
+    MANIFEST_KEY_COLUMNS,
+    METADATA_KEY_COLUMNS,
+    METADATA_SCALAR_INDEXES,
+    METADATA_TEXT_COLUMNS,
+    TAG_KEY_COLUMNS,
+    TAG_SCALAR_INDEXES,
+    LanceChunkTable,
     LanceDocTable,
+    LanceManifestTable,
     LanceMetadataTable,
     LanceTagTable,
+    TableStats,
+    compact_table,
+    cosine_distances,
+    create_chunk_table,
     create_doc_table,
+    create_manifest_table,
     create_metadata_table,
     create_tag_table,
     delete_doc_vector,
+    delete_source_rows,
     delete_tag_vector,
+    ensure_scalar_indexes,
+    ensure_vector_index,
     fetch_metadata_rows,
+    find_vector_index,
+    inner_product_distances,
+    list_chunk_sources,
     list_doc_sources,
+    list_metadata_sources,
     list_tag_pairs,
+    mark_vectors_normalized,
+    merge_rows,
+    normalize_stored_vectors,
+    read_manifest_rows,
+    replace_source_rows,
+    search_text,
     search_vectors,
+    table_stats,
+    top_k_indices,
+    unit_vector,
+    upsert_manifest_rows,
     upsert_metadata_row,
+    upsert_metadata_rows,
     upsert_vectors,
+    vector_dimension,
+    vector_matrix,
+    vector_metric,
+    vector_type,
+    vectors_are_normalized,
 )
-from .ollama import run_ollama_prompt
-from .remote_embeddings import request_embedding_vector
+from .ollama import chat_ollama_http, generate_ollama_http, run_ollama_prompt
+from .remote_embeddings import request_embedding_vector, request_embedding_vectors
+from .sqlite_cache import SqliteCache
+from .vector_cache import ResidentVectorMatrix, latest_version
 
 __all__ = [
+    "CHUNK_KEY_COLUMNS",
+    "CHUNK_SCALAR_INDEXES",
     "ConversionPlan",
+    "DEFAULT_EXCLUDED_DIRS",
+    "DOC_KEY_COLUMNS",
+    "DOC_SCALAR_INDEXES",
+    "FileEvent",
+    "FileScanner",
+    "FileWatcher",
+    "HttpConnectionPool",
+    "IGNORE_FILE_NAMES",
+    "IgnoreRules",
+    "InotifyWatcher",
+    "LanceChunkTable",
     "LanceDocTable",
+    "LanceManifestTable",
     "LanceMetadataTable",
     "LanceTagTable",
+    "MANIFEST_KEY_COLUMNS",
+    "METADATA_KEY_COLUMNS",
+    "METADATA_SCALAR_INDEXES",
+    "METADATA_TEXT_COLUMNS",
+    "PollingWatcher",
+    "ResidentVectorMatrix",
+    "ScannedFile",
+    "SqliteCache",
+    "TAG_KEY_COLUMNS",
+    "TAG_SCALAR_INDEXES",
+    "TableStats",
     "build_conversion_plan",
+    "chat_ollama_http",
+    "compact_table",
     "convert_with_docling",
     "convert_with_markitdown",
+    "cosine_distances",
+    "create_chunk_table",
     "create_doc_table",
+    "create_manifest_table",
     "create_metadata_table",
     "create_tag_table",
+    "default_http_pool",
     "delete_doc_vector",
+    "delete_source_rows",
     "delete_tag_vector",
+    "ensure_scalar_indexes",
+    "ensure_vector_index",
     "extract_markdown_from_docling",
     "extract_markdown_from_markitdown",
     "fetch_metadata_rows",
+    "find_vector_index",
+    "generate_ollama_http",
+    "inner_product_distances",
+    "inotify_available",
+    "latest_version",
+    "list_chunk_sources",
     "list_doc_sources",
+    "list_metadata_sources",
     "list_tag_pairs",
+    "mark_vectors_normalized",
+    "merge_rows",
+    "normalize_stored_vectors",
+    "open_file_watcher",
+    "read_manifest_rows",
+    "replace_source_rows",
     "request_embedding_vector",
+    "request_embedding_vectors",
     "run_ollama_prompt",
+    "search_text",
     "search_vectors",
+    "table_stats",
+    "top_k_indices",
+    "unit_vector",
+    "upsert_manifest_rows",
     "upsert_metadata_row",
+    "upsert_metadata_rows",
     "upsert_vectors",
+    "vector_dimension",
+    "vector_matrix",
+    "vector_metric",
+    "vector_type",
+    "vectors_are_normalized",
 ]
@@ -0,0 +1,358 @@
+"""Fast file discovery with ``os.scandir`` and .gitignore-style ignore files."""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from stat import S_ISDIR
+from typing import Iterable, Sequence
+
+__all__ = [
+    "DEFAULT_EXCLUDED_DIRS",
+    "IGNORE_FILE_NAMES",
+    "FileScanner",
+    "IgnoreRules",
+    "ScannedFile",
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXCLUDED_DIRS: frozenset[str] = frozenset(
+    {
+        ".semantic_index",
+        "node_modules",
+        "__pycache__",
+        ".git",
+        ".hg",
+        ".svn",
+        ".venv",
+        "venv",
+        ".tox",
+    }
+)
+IGNORE_FILE_NAMES: tuple[str, ...] = (".gitignore", ".semanticignore")
+
+
+@dataclass(frozen=True, slots=True)
+class ScannedFile:
+    """A discovered file and the single ``stat`` taken while scanning it."""
+
+    path: Path
+    stat: os.stat_result
+
+
+@dataclass(frozen=True, slots=True)
+class _IgnoreRule:
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+    anchored: bool
+
+
+class IgnoreRules:
+    """Patterns from one ignore file, applied to paths below its directory.
+
+    Supports the common .gitignore syntax: ``#`` comments, ``!`` negation, a trailing
+    ``/`` for directories only, a leading or inner ``/`` to anchor the pattern to the
+    ignore file's directory, and ``*``, ``?``, ``[...]``, and ``**`` wildcards.
+    ``base`` is the directory relative to the scan root in POSIX form ("" for the root).
+    """
+
+    def __init__(self, lines: Iterable[str], *, base: str = "") -> None:
+        self.base = base
+        self.rules = [rule for rule in map(_parse_rule, lines) if rule is not None]
+
+    @classmethod
+    def from_file(cls, path: Path | str, *, base: str = "") -> IgnoreRules:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as handle:
+                return cls(handle.read().splitlines(), base=base)
+        except OSError as exc:
+            logger.warning("Unable to read ignore file %s: %s", path, exc)
+            return cls((), base=base)
+
+    def match(self, relative: str, *, is_dir: bool) -> bool | None:
+        """Return True/False if a rule decides ``relative`` (from the scan root), else None."""
+
+        local = relative[len(self.base) + 1 :] if self.base else relative
+        name = local.rsplit("/", 1)[-1]
+        decision = None
+        for rule in self.rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(local if rule.anchored else name):
+                decision = not rule.negate
+        return decision
+
+
+def _parse_rule(line: str) -> _IgnoreRule | None:
+    line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate or line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    anchored = "/" in line
+    line = line.lstrip("/")
+    if not line:
+        return None
+    return _IgnoreRule(_translate(line), negate, dir_only, anchored)
+
+
+def _translate(pattern: str) -> re.Pattern[str]:
+    parts: list[str] = []
+    index, length = 0, len(pattern)
+    while index < length:
+        char = pattern[index]
+        index += 1
+        if char == "*":
+            if pattern.startswith("*", index):
+                index += 1
+                if pattern.startswith("/", index):
+                    index += 1
+                    parts.append("(?:.*/)?")
+                else:
+                    parts.append(".*")
+            else:
+                parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[" and (end := pattern.find("]", index)) != -1:
+            body = pattern[index:end]
+            parts.append(f"[^{body[1:]}]" if body.startswith("!") else f"[{body}]")
+            index = end + 1
+        elif char == "\\" and index < length:
+            parts.append(re.escape(pattern[index]))
+            index += 1
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts))
+
+
+class FileScanner:
+    """Walk a tree with ``os.scandir`` and return matching files with their stat.
+
+    Extensions are checked on the entry name, so only candidate files are ever
+    stat'ed; directory type checks come from ``scandir`` itself. Directories named in
+    ``excluded_dirs``, hidden entries (unless ``include_hidden``), and paths matched by
+    the ``ignore_file_names`` found along the way are pruned without being entered.
+    Top-level subtrees are walked on up to ``workers`` threads. An empty
+    ``extensions`` set accepts every file.
+
+    Symlinked directories are followed unless ``follow_symlinks`` is False. A scan skips
+    links that resolve inside or above its root (walked anyway) or that overlap a link
+    target it already followed, so each linked tree is walked once and cycles end.
+    """
+
+    def __init__(
+        self,
+        *,
+        extensions: Iterable[str] = (),
+        excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS,
+        ignore_file_names: Sequence[str] = IGNORE_FILE_NAMES,
+        include_hidden: bool = False,
+        workers: int | None = None,
+        follow_symlinks: bool = True,
+    ) -> None:
+        self.extensions = frozenset(extension.lower() for extension in extensions)
+        self.excluded_dirs = frozenset(excluded_dirs)
+        self.ignore_file_names = tuple(ignore_file_names)
+        self.include_hidden = include_hidden
+        self.workers = max(1, workers if workers is not None else min(8, os.cpu_count() or 1))
+        self.follow_symlinks = follow_symlinks
+
+    def scan(self, root: Path | str) -> list[ScannedFile]:
+        """Return every matching file below ``root``, sorted by path."""
+
+        root_path = Path(root)
+        links = self._link_guard(root_path)
+        files, subdirectories = self._scan_directory(str(root_path), "", (), links)
+        if self.workers > 1 and len(subdirectories) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.workers, len(subdirectories)),
+                thread_name_prefix="file-scan",
+            ) as executor:
+                for subtree in executor.map(lambda item: self._walk(*item, links), subdirectories):
+                    files.extend(subtree)
+        else:
+            for item in subdirectories:
+                files.extend(self._walk(*item, links))
+        files.sort(key=lambda scanned: scanned.path)
+        return files
+
+    def scan_paths(
+        self, root: Path | str, paths: Iterable[Path]
+    ) -> tuple[list[ScannedFile], list[Path]]:
+        """Scan only ``paths`` (files or directories below ``root``).
+
+        Ignore files and exclusions between ``root`` and each path apply as in a full
+        scan. Returns the matching files plus the paths that no longer exist.
+        """
+
+        root_path = Path(root)
+        links = self._link_guard(root_path)
+        found: dict[Path, ScannedFile] = {}
+        missing: list[Path] = []
+        for path in paths:
+            relative = path.relative_to(root_path).as_posix()
+            rules = self._rules_above(root_path, relative)
+            if rules is None:
+                continue
+            try:
+                path_stat = path.stat()
+            except FileNotFoundError:
+                missing.append(path)
+                continue
+            except OSError:
+                continue
+            if S_ISDIR(path_stat.st_mode):
+                if relative != "." and (
+                    path.name in self.excluded_dirs or _decide(rules, relative, is_dir=True)
+                ):
+                    continue
+                walked = self._walk(str(path), "" if relative == "." else relative, rules, links)
+                for scanned in walked:
+                    found[scanned.path] = scanned
+            elif self._accepts_file(path.name) and not _decide(rules, relative, is_dir=False):
+                found[path] = ScannedFile(path, path_stat)
+        return sorted(found.values(), key=lambda scanned: scanned.path), missing
+
+    def _link_guard(self, root: Path) -> _LinkGuard | None:
+        return _LinkGuard(root) if self.follow_symlinks else None
+
+    def _walk(
+        self,
+        directory: str,
+        relative: str,
+        rules: tuple[IgnoreRules, ...],
+        links: _LinkGuard | None,
+    ) -> list[ScannedFile]:
+        files: list[ScannedFile] = []
+        pending = [(directory, relative, rules)]
+        while pending:
+            found, subdirectories = self._scan_directory(*pending.pop(), links)
+            files.extend(found)
+            pending.extend(subdirectories)
+        return files
+
+    def _scan_directory(
+        self,
+        directory: str,
+        relative: str,
+        rules: tuple[IgnoreRules, ...],
+        links: _LinkGuard | None,
+    ) -> tuple[list[ScannedFile], list[tuple[str, str, tuple[IgnoreRules, ...]]]]:
+        try:
+            with os.scandir(directory) as iterator:
+                entries = list(iterator)
+        except OSError as exc:
+            logger.debug("Skipping unreadable directory %s: %s", directory, exc)
+            return [], []
+        rules = rules + self._ignore_files(directory, relative, entries)
+        files: list[ScannedFile] = []
+        subdirectories: list[tuple[str, str, tuple[IgnoreRules, ...]]] = []
+        for entry in entries:
+            name = entry.name
+            if not self.include_hidden and name.startswith("."):
+                continue
+            entry_relative = f"{relative}/{name}" if relative else name
+            try:
+                if entry.is_dir(follow_symlinks=links is not None):
+                    if name in self.excluded_dirs or _decide(rules, entry_relative, is_dir=True):
+                        continue
+                    if links is None or not entry.is_symlink() or links.follow(entry.path):
+                        subdirectories.append((entry.path, entry_relative, rules))
+                elif (
+                    self._accepts_file(name)
+                    and entry.is_file()
+                    and not _decide(rules, entry_relative, is_dir=False)
+                ):
+                    files.append(ScannedFile(Path(entry.path), entry.stat()))
+            except OSError:
+                continue
+        return files, subdirectories
+
+    def _ignore_files(
+        self, directory: str, relative: str, entries: list[os.DirEntry[str]]
+    ) -> tuple[IgnoreRules, ...]:
+        if not self.ignore_file_names:
+            return ()
+        present = {entry.name: entry.path for entry in entries}
+        return tuple(
+            IgnoreRules.from_file(present[name], base=relative)
+            for name in self.ignore_file_names
+            if name in present
+        )
+
+    def _rules_above(self, root: Path, relative: str) -> tuple[IgnoreRules, ...] | None:
+        """Load the ignore files from ``root`` down to the parent of ``relative``.
+
+        Returns None when ``relative`` is hidden or lies inside a pruned directory.
+        """
+
+        parts = [] if relative == "." else relative.split("/")
+        if not self.include_hidden and any(part.startswith(".") for part in parts):
+            return None
+        rules = self._ignore_files_at(root, "")
+        current, current_relative = root, ""
+        for part in parts[:-1]:
+            current, current_relative = current / part, f"{current_relative}{part}"
+            if part in self.excluded_dirs or _decide(rules, current_relative, is_dir=True):
+                return None
+            rules += self._ignore_files_at(current, current_relative)
+            current_relative += "/"
+        return rules
+
+    def _ignore_files_at(self, directory: Path, relative: str) -> tuple[IgnoreRules, ...]:
+        return tuple(
+            IgnoreRules.from_file(directory / name, base=relative)
+            for name in self.ignore_file_names
+            if (directory / name).is_file()
+        )
+
+    def _accepts_file(self, name: str) -> bool:
+        if not self.extensions:
+            return True
+        dot = name.rfind(".")
+        return dot > 0 and name[dot:].lower() in self.extensions
+
+
+class _LinkGuard:
+    """Decides which symlinked directories one scan follows; shared by its threads."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = os.path.realpath(root)
+        self._followed: set[str] = set()
+        self._lock = threading.Lock()
+
+    def follow(self, path: str) -> bool:
+        target = os.path.realpath(path)
+        if _within(target, self.root) or _within(self.root, target):
+            return False
+        with self._lock:
+            if any(_within(target, seen) or _within(seen, target) for seen in self._followed):
+                return False
+            self._followed.add(target)
+        return True
+
+
+def _within(path: str, parent: str) -> bool:
+    return path == parent or path.startswith(parent.rstrip(os.sep) + os.sep)
+
+
+def _decide(rules: Sequence[IgnoreRules], relative: str, *, is_dir: bool) -> bool:
+    """Return whether ``relative`` is ignored; deeper ignore files override shallower ones."""
+
+    ignored = False
+    for rules_file in rules:
+        decision = rules_file.match(relative, is_dir=is_dir)
+        if decision is not None:
+            ignored = decision
+    return ignored
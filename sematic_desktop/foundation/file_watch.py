@@ -0,0 +1,272 @@
+"""Filesystem change notification via inotify, with a polling fallback."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+from .file_scan import DEFAULT_EXCLUDED_DIRS, FileScanner
+
+__all__ = [
+    "FileEvent",
+    "FileWatcher",
+    "InotifyWatcher",
+    "PollingWatcher",
+    "inotify_available",
+    "open_file_watcher",
+]
+
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE
+    | _IN_ATTRIB
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+@dataclass(frozen=True, slots=True)
+class FileEvent:
+    """A path that changed: ``kind`` is "changed", "removed", or "rescan".
+
+    "removed" may name a directory, meaning everything below it is gone; "rescan"
+    means events were lost (queue overflow) and the whole tree must be re-checked.
+    """
+
+    path: Path
+    kind: str
+
+
+class FileWatcher(Protocol):
+    root: Path
+
+    def read(self, timeout: float) -> list[FileEvent]: ...
+
+    def close(self) -> None: ...
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not all(
+        hasattr(libc, name) for name in ("inotify_init1", "inotify_add_watch", "inotify_rm_watch")
+    ):
+        return None
+    return libc
+
+
+_libc = _load_libc()
+
+
+def inotify_available() -> bool:
+    """Return whether the kernel inotify API can be used on this platform."""
+
+    return _libc is not None
+
+
+def _is_hidden(name: str) -> bool:
+    return name.startswith(".")
+
+
+class InotifyWatcher:
+    """Recursive inotify watch on ``root`` (Linux only).
+
+    New directories are watched as they appear and reported as "changed" so the
+    caller can pick up files written before the watch was in place. Directories in
+    ``DEFAULT_EXCLUDED_DIRS`` are not watched, nor are hidden ones unless
+    ``include_hidden`` is set.
+    """
+
+    def __init__(self, root: Path | str, *, include_hidden: bool = False) -> None:
+        if _libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        self.root = Path(root).expanduser().resolve()
+        self.include_hidden = include_hidden
+        self._fd = _libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._directories: dict[int, Path] = {}
+        self._add_tree(self.root)
+
+    def read(self, timeout: float) -> list[FileEvent]:
+        """Wait up to ``timeout`` seconds and return the events that arrived."""
+
+        ready, _, _ = select.select([self._fd], [], [], max(timeout, 0.0))
+        if not ready:
+            return []
+        events: list[FileEvent] = []
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+            events.extend(self._parse(buffer))
+        return events
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _parse(self, buffer: bytes) -> list[FileEvent]:
+        events: list[FileEvent] = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = buffer[offset : offset + length].split(b"\0", 1)[0]
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                events.append(FileEvent(self.root, "rescan"))
+                continue
+            if mask & _IN_IGNORED:
+                self._directories.pop(wd, None)
+                continue
+            directory = self._directories.get(wd)
+            if directory is None:
+                continue
+            if not raw_name:
+                # Subdirectories are reported through their parent's events.
+                if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF) and directory == self.root:
+                    events.append(FileEvent(directory, "removed"))
+                continue
+            name = os.fsdecode(raw_name)
+            if not self.include_hidden and _is_hidden(name):
+                continue
+            if mask & _IN_ISDIR and name in DEFAULT_EXCLUDED_DIRS:
+                continue
+            path = directory / name
+            if mask & (_IN_DELETE | _IN_MOVED_FROM):
+                if mask & _IN_ISDIR:
+                    self._drop_tree(path)
+                events.append(FileEvent(path, "removed"))
+            elif mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._add_tree(path)
+                    events.append(FileEvent(path, "changed"))
+            elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_ATTRIB):
+                events.append(FileEvent(path, "changed"))
+        return events
+
+    def _drop_tree(self, top: Path) -> None:
+        for wd, directory in list(self._directories.items()):
+            if directory == top or top in directory.parents:
+                _libc.inotify_rm_watch(self._fd, wd)
+                del self._directories[wd]
+
+    def _add_tree(self, top: Path) -> None:
+        for directory, subdirectories, _ in os.walk(top):
+            subdirectories[:] = [
+                name
+                for name in subdirectories
+                if name not in DEFAULT_EXCLUDED_DIRS
+                and (self.include_hidden or not _is_hidden(name))
+            ]
+            wd = _libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), _WATCH_MASK | _IN_ONLYDIR
+            )
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error in {errno.ENOENT, errno.ENOTDIR}:
+                    continue
+                raise OSError(error, f"inotify_add_watch({directory}): {os.strerror(error)}")
+            self._directories[wd] = Path(directory)
+
+
+class PollingWatcher:
+    """Detect changes by re-scanning ``root`` at most every ``interval`` seconds.
+
+    Each scan walks the tree with ``FileScanner`` (skipping excluded directories) and
+    compares (size, mtime) per file against the previous scan, so only files that
+    differ are reported.
+    """
+
+    def __init__(
+        self, root: Path | str, *, interval: float = 2.0, include_hidden: bool = False
+    ) -> None:
+        self.root = Path(root).expanduser().resolve()
+        self.interval = interval
+        self.include_hidden = include_hidden
+        self._scanner = FileScanner(include_hidden=include_hidden, ignore_file_names=(), workers=1)
+        self._snapshot = self._scan()
+        self._scanned_at = time.monotonic()
+
+    def read(self, timeout: float) -> list[FileEvent]:
+        """Scan once ``interval`` has elapsed (waiting at most ``timeout``) and diff."""
+
+        wait = self._scanned_at + self.interval - time.monotonic()
+        if wait > timeout:
+            time.sleep(max(timeout, 0.0))
+            return []
+        if wait > 0:
+            time.sleep(wait)
+        snapshot = self._scan()
+        self._scanned_at = time.monotonic()
+        previous, self._snapshot = self._snapshot, snapshot
+        events = [
+            FileEvent(Path(path), "changed")
+            for path, signature in snapshot.items()
+            if previous.get(path) != signature
+        ]
+        events.extend(FileEvent(Path(path), "removed") for path in previous if path not in snapshot)
+        return events
+
+    def close(self) -> None:
+        self._snapshot = {}
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        return {
+            str(scanned.path): (scanned.stat.st_size, scanned.stat.st_mtime_ns)
+            for scanned in self._scanner.scan(self.root)
+        }
+
+
+def open_file_watcher(
+    root: Path | str, *, backend: str = "auto", poll_interval: float = 2.0
+) -> FileWatcher:
+    """Return an inotify watcher when available (``backend="auto"``), else a poller."""
+
+    if backend not in {"auto", "inotify", "polling"}:
+        raise ValueError(f"Unknown watch backend: {backend!r}")
+    if backend == "inotify" or (backend == "auto" and inotify_available()):
+        try:
+            return InotifyWatcher(root)
+        except OSError:
+            if backend == "inotify":
+                raise
+    return PollingWatcher(root, interval=poll_interval)
@@ -0,0 +1,141 @@
+"""Keep-alive HTTP connection pool shared by the Ollama HTTP helpers."""
+
+from __future__ import annotations
+
+import http.client
+import threading
+from typing import Any
+from urllib.parse import urlsplit
+
+__all__ = ["HttpConnectionPool", "default_http_pool"]
+
+_RETRYABLE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class HttpConnectionPool:
+    """Thread-safe pool of persistent ``http.client`` connections per host.
+
+    At most ``max_connections`` connections per host are open at once; callers beyond
+    that wait for one to be released. Idle connections are reused (most recent
+    first), and a request that fails because the server closed a reused connection is
+    retried once on a fresh one.
+    """
+
+    def __init__(self, *, max_connections: int = 8, timeout: float = 120.0) -> None:
+        self.max_connections = max(1, max_connections)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._slots: dict[tuple[str, str, int], threading.BoundedSemaphore] = {}
+
+    def post(
+        self,
+        url: str,
+        body: bytes,
+        *,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> bytes:
+        """POST ``body`` to ``url`` and return the response body."""
+
+        parts = urlsplit(url)
+        key = (parts.scheme or "http", parts.hostname or "127.0.0.1", parts.port or 0)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        request_headers = {"Content-Type": "application/json", **(headers or {})}
+        slot = self._slot(key)
+        with slot:
+            connection, reused = self._acquire(key, timeout)
+            try:
+                try:
+                    status, data = self._send(connection, path, body, request_headers)
+                except _RETRYABLE_ERRORS:
+                    if not reused:
+                        raise
+                    # The server dropped an idle connection; http.client reopens it.
+                    connection.close()
+                    status, data = self._send(connection, path, body, request_headers)
+            except BaseException:
+                connection.close()
+                raise
+            self._release(key, connection)
+        if status >= 400:
+            detail = data.decode("utf-8", errors="ignore").strip()
+            raise RuntimeError(f"HTTP {status} from {url}: {detail or 'no body'}")
+        return data
+
+    def close(self) -> None:
+        """Close every idle connection."""
+
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _slot(self, key: tuple[str, str, int]) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(self.max_connections)
+            return slot
+
+    def _acquire(
+        self, key: tuple[str, str, int], timeout: float | None
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+        if connection is None:
+            return self._connect(key, timeout), False
+        connection.timeout = timeout if timeout is not None else self.timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(connection.timeout)
+        return connection, True
+
+    def _release(self, key: tuple[str, str, int], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append(connection)
+
+    def _connect(
+        self, key: tuple[str, str, int], timeout: float | None
+    ) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        factory: Any = (
+            http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        )
+        return factory(host, port or None, timeout=timeout if timeout is not None else self.timeout)
+
+    @staticmethod
+    def _send(
+        connection: http.client.HTTPConnection,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+    ) -> tuple[int, bytes]:
+        connection.request("POST", path, body=body, headers=headers)
+        response = connection.getresponse()
+        data = response.read()
+        if response.will_close:
+            connection.close()
+        return response.status, data
+
+
+_default_pool: HttpConnectionPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def default_http_pool() -> HttpConnectionPool:
+    """Return the process-wide pool used when callers do not pass their own."""
+
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = HttpConnectionPool()
+        return _default_pool
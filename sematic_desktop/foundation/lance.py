@@ -2,16 +2,42 @@
 
 from __future__ import annotations
 
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, Iterable, Mapping, Sequence
 
 import lancedb
 import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
+from lancedb.query import MultiMatchQuery
+
+logger = logging.getLogger(__name__)
 
 LanceMetadataTable = Any
 LanceDocTable = Any
 LanceTagTable = Any
+LanceManifestTable = Any
+LanceChunkTable = Any
+
+CHUNK_KEY_COLUMNS: tuple[str, ...] = ("source_path", "chunk_index")
+DOC_KEY_COLUMNS: tuple[str, ...] = ("source_path",)
+MANIFEST_KEY_COLUMNS: tuple[str, ...] = ("source_path",)
+METADATA_KEY_COLUMNS: tuple[str, ...] = ("source_path",)
+TAG_KEY_COLUMNS: tuple[str, ...] = ("source_path", "tag_text")
+
+METADATA_TEXT_COLUMNS: tuple[str, ...] = ("content", "description")
+METADATA_SCALAR_INDEXES: dict[str, str] = {
+    "source_path": "BTREE",
+    **{column: "FTS" for column in METADATA_TEXT_COLUMNS},
+}
+DOC_SCALAR_INDEXES: dict[str, str] = {"source_path": "BTREE"}
+TAG_SCALAR_INDEXES: dict[str, str] = {"source_path": "BTREE", "tag_text": "BITMAP"}
+CHUNK_SCALAR_INDEXES: dict[str, str] = {"source_path": "BTREE"}
+
+_NORMALIZED_KEY = b"normalized"
 
 
 def _connect(root: Path | str):
@@ -21,7 +47,11 @@ def _connect(root: Path | str):
 
 
 def create_metadata_table(root: Path | str, table_name: str) -> LanceMetadataTable:
-    """Return a Lance table for metadata, creating it if needed."""
+    """Return a Lance table for metadata, creating it if needed.
+
+    ``content`` holds the converted markdown for full-text search; tables created
+    before it existed gain the column (empty) when opened.
+    """
 
     db = _connect(root)
     schema = pa.schema(
@@ -37,6 +67,26 @@ def create_metadata_table(root: Path | str, table_name: str) -> LanceMetadataTab
             pa.field("file_type", pa.string()),
             pa.field("description", pa.string()),
             pa.field("tags", pa.list_(pa.string())),
+            pa.field("content", pa.string()),
+        ]
+    )
+    if table_name in db.table_names():
+        table = db.open_table(table_name)
+        _upgrade_fields(table, schema)
+        return table
+    return db.create_table(table_name, schema=schema)
+
+
+def create_manifest_table(root: Path | str, table_name: str) -> LanceManifestTable:
+    """Return the Lance table recording each indexed file's size, mtime, and content hash."""
+
+    db = _connect(root)
+    schema = pa.schema(
+        [
+            pa.field("source_path", pa.string()),
+            pa.field("size_bytes", pa.int64()),
+            pa.field("mtime_ns", pa.int64()),
+            pa.field("content_hash", pa.string()),
         ]
     )
     if table_name in db.table_names():
@@ -44,57 +94,160 @@ def create_metadata_table(root: Path | str, table_name: str) -> LanceMetadataTab
     return db.create_table(table_name, schema=schema)
 
 
-def create_doc_table(root: Path | str, table_name: str) -> LanceDocTable:
-    """Return a Lance table for document embeddings."""
+def vector_type(dim: int | None) -> pa.DataType:
+    """Return the Arrow type for vectors of width ``dim`` (variable-length when unknown)."""
+
+    if dim:
+        return pa.list_(pa.float32(), dim)
+    return pa.list_(pa.float32())
+
+
+def vector_dimension(table) -> int | None:
+    """Return the fixed vector width of ``table``; ``None`` for variable-length columns."""
+
+    field_type = table.schema.field("vector").type
+    if pa.types.is_fixed_size_list(field_type):
+        return field_type.list_size
+    return None
+
+
+def create_doc_table(root: Path | str, table_name: str, *, dim: int | None = None) -> LanceDocTable:
+    """Return a Lance table for document embeddings.
+
+    ``dim`` fixes the width of the vector column. Without it, existing tables are
+    migrated using the width of their first stored vector and new tables stay
+    variable-length until the first embedding is written.
+    """
 
     schema = pa.schema(
         [
             pa.field("source_path", pa.string()),
             pa.field("markdown_path", pa.string()),
-            pa.field("vector", pa.list_(pa.float32())),
+            pa.field("vector", vector_type(dim)),
         ]
     )
     return _create_or_upgrade(root, table_name, schema)
 
 
-def create_tag_table(root: Path | str, table_name: str) -> LanceTagTable:
-    """Return a Lance table for tag embeddings."""
+def create_tag_table(root: Path | str, table_name: str, *, dim: int | None = None) -> LanceTagTable:
+    """Return a Lance table for tag embeddings (see ``create_doc_table`` for ``dim``)."""
 
     schema = pa.schema(
         [
             pa.field("source_path", pa.string()),
             pa.field("markdown_path", pa.string()),
             pa.field("tag_text", pa.string()),
-            pa.field("vector", pa.list_(pa.float32())),
+            pa.field("vector", vector_type(dim)),
+        ]
+    )
+    return _create_or_upgrade(root, table_name, schema)
+
+
+def create_chunk_table(
+    root: Path | str, table_name: str, *, dim: int | None = None
+) -> LanceChunkTable:
+    """Return a Lance table for chunk embeddings (see ``create_doc_table`` for ``dim``).
+
+    ``start``/``end`` are byte offsets of the chunk in the markdown artifact.
+    """
+
+    schema = pa.schema(
+        [
+            pa.field("source_path", pa.string()),
+            pa.field("markdown_path", pa.string()),
+            pa.field("chunk_index", pa.int32()),
+            pa.field("start", pa.int64()),
+            pa.field("end", pa.int64()),
+            pa.field("heading", pa.string()),
+            pa.field("vector", vector_type(dim)),
         ]
     )
     return _create_or_upgrade(root, table_name, schema)
 
 
+def _read_columns(
+    table,
+    columns: Sequence[str],
+    *,
+    where: str | None = None,
+    limit: int | None = None,
+    row_ids: bool = False,
+) -> pa.Table:
+    """Return only ``columns`` from ``table``, optionally filtered by ``where``."""
+
+    query = table.search().select(list(columns))
+    if where:
+        query = query.where(where)
+    if row_ids:
+        query = query.with_row_id(True)
+    return query.limit(limit).to_arrow()
+
+
 def _create_or_upgrade(root: Path | str, table_name: str, schema: pa.Schema):
     db = _connect(root)
-    if table_name in db.table_names():
-        table = db.open_table(table_name)
-        current_fields = list(table.schema.names)
-        expected_fields = [field.name for field in schema]
-        if current_fields != expected_fields:
-            rows = table.to_arrow().to_pylist()
-            db.drop_table(table_name)
-            table = db.create_table(table_name, schema=schema)
-            if rows:
-                table.add(rows)
-        return table
-    return db.create_table(table_name, schema=schema)
+    if table_name not in db.table_names():
+        return db.create_table(table_name, schema=schema)
+    table = db.open_table(table_name)
+    _upgrade_fields(table, schema)
+    _upgrade_vector_column(table, schema.field("vector").type)
+    return table
+
+
+def _upgrade_fields(table, schema: pa.Schema) -> None:
+    """Add missing and drop unknown columns in place instead of rewriting every row."""
+
+    current = set(table.schema.names)
+    missing = [field for field in schema if field.name not in current]
+    if missing:
+        table.add_columns(missing)
+    extra = [name for name in table.schema.names if name not in schema.names]
+    if extra:
+        table.drop_columns(extra)
+
+
+def _upgrade_vector_column(table, target: pa.DataType) -> None:
+    """Cast a variable-length vector column to a fixed-size list of the detected width.
+
+    Lance applies the cast fragment by fragment, so existing tables are rewritten in
+    bounded batches rather than being loaded into memory.
+    """
+
+    current_dim = vector_dimension(table)
+    target_dim = target.list_size if pa.types.is_fixed_size_list(target) else None
+    if current_dim is not None:
+        if target_dim is not None and target_dim != current_dim:
+            raise ValueError(
+                f"Table stores {current_dim}-dimensional vectors but {target_dim} were requested."
+            )
+        return
+    dim = target_dim or _detect_vector_dimension(table)
+    if dim is None:
+        return
+    try:
+        table.alter_columns({"path": "vector", "data_type": vector_type(dim)})
+    except Exception as exc:  # pragma: no cover - tables with mixed widths.
+        logger.warning("Keeping variable-length vectors; unable to cast to %d dims: %s", dim, exc)
+
+
+def _detect_vector_dimension(table) -> int | None:
+    sample = _read_columns(table, ["vector"], where="vector IS NOT NULL", limit=1)
+    if not sample.num_rows:
+        return None
+    return len(sample.column("vector")[0])
 
 
 def upsert_metadata_row(table: LanceMetadataTable, record: dict[str, Any]) -> None:
     """Insert or replace a metadata row."""
 
-    normalized = Path(record["source_path"]).expanduser().resolve()
-    record["source_path"] = str(normalized)
-    escaped = str(record["source_path"]).replace("'", "''")
-    table.delete(where=f"source_path = '{escaped}'")
-    table.add([record])
+    upsert_metadata_rows(table, [record])
+
+
+def upsert_metadata_rows(table: LanceMetadataTable, records: list[dict[str, Any]]) -> None:
+    """Insert or replace metadata rows with a single merge-insert keyed on ``source_path``."""
+
+    for record in records:
+        record["source_path"] = str(Path(record["source_path"]).expanduser().resolve())
+    merge_rows(table, records, key_columns=METADATA_KEY_COLUMNS)
 
 
 def upsert_vectors(
@@ -104,25 +257,71 @@ def upsert_vectors(
     doc_records: list[dict[str, Any]],
     tag_records: list[dict[str, Any]],
 ) -> None:
-    """Insert or replace document/tag embeddings."""
+    """Insert or replace document/tag embeddings with one merge-insert per table.
 
-    for record in doc_records:
-        source = str(Path(record["source_path"]).expanduser().resolve())
-        record["source_path"] = source
-        sanitized = source.replace("'", "''")
-        doc_table.delete(where=f"source_path = '{sanitized}'")
-    if doc_records:
-        doc_table.add(doc_records)
+    Rows are keyed on ``DOC_KEY_COLUMNS``/``TAG_KEY_COLUMNS``; when a batch repeats a
+    key, the last record wins. Every document in ``doc_records`` ends up with exactly
+    the tags in ``tag_records``: tags it no longer has are deleted in the same commit.
+    """
 
+    for record in doc_records:
+        record["source_path"] = str(Path(record["source_path"]).expanduser().resolve())
     for record in tag_records:
-        source = str(Path(record["source_path"]).expanduser().resolve())
-        record["source_path"] = source
-        tag = record["tag_text"].replace("'", "''")
-        sanitized = source.replace("'", "''")
-        where = f"source_path = '{sanitized}' AND tag_text = '{tag}'"
-        tag_table.delete(where=where)
-    if tag_records:
-        tag_table.add(tag_records)
+        record["source_path"] = str(Path(record["source_path"]).expanduser().resolve())
+    merge_rows(doc_table, doc_records, key_columns=DOC_KEY_COLUMNS)
+    replace_source_rows(
+        tag_table,
+        tag_records,
+        key_columns=TAG_KEY_COLUMNS,
+        sources=[record["source_path"] for record in doc_records],
+    )
+
+
+def merge_rows(table, records: list[dict[str, Any]], *, key_columns: Sequence[str]) -> None:
+    """Upsert ``records`` into ``table`` in a single commit keyed on ``key_columns``."""
+
+    if not records:
+        return
+    unique = {tuple(record[column] for column in key_columns): record for record in records}
+    data = pa.Table.from_pylist(list(unique.values()), schema=table.schema)
+    (
+        table.merge_insert(list(key_columns))
+        .when_matched_update_all()
+        .when_not_matched_insert_all()
+        .execute(data)
+    )
+
+
+def replace_source_rows(
+    table,
+    records: list[dict[str, Any]],
+    *,
+    key_columns: Sequence[str],
+    sources: Iterable[str] = (),
+) -> None:
+    """Make ``records`` the only rows of their source paths, in a single commit.
+
+    Works like ``merge_rows`` but also deletes rows of the same ``source_path`` values
+    that the batch does not contain, e.g. the trailing chunks of a document that got
+    shorter. ``sources`` adds paths whose rows are replaced even when the batch has
+    none for them, so they are deleted.
+    """
+
+    unique = {tuple(record[column] for column in key_columns): record for record in records}
+    replaced = sorted({*sources, *(record["source_path"] for record in unique.values())})
+    if not replaced:
+        return
+    if not unique:
+        table.delete(where=_in_predicate("source_path", replaced))
+        return
+    data = pa.Table.from_pylist(list(unique.values()), schema=table.schema)
+    (
+        table.merge_insert(list(key_columns))
+        .when_matched_update_all()
+        .when_not_matched_insert_all()
+        .when_not_matched_by_source_delete(_in_predicate("source_path", replaced))
+        .execute(data)
+    )
 
 
 def delete_doc_vector(table: LanceDocTable, source_path: Path | str) -> None:
@@ -140,31 +339,121 @@ def delete_tag_vector(table: LanceTagTable, source_path: Path | str, tag_text: s
     table.delete(where=f"source_path = '{normalized}' AND tag_text = '{tag}'")
 
 
-def fetch_metadata_rows(table: LanceMetadataTable, paths: list[str]) -> dict[str, dict[str, Any]]:
-    """Return metadata rows keyed by ``source_path``."""
+def delete_source_rows(table, paths: Sequence[str], *, chunk_size: int = 512) -> None:
+    """Delete every row whose ``source_path`` is in ``paths``.
+
+    Issues one ``source_path IN (...)`` delete per ``chunk_size`` paths, so removing
+    many files costs a handful of commits instead of one per file.
+    """
+
+    normalized = sorted({str(Path(path).expanduser().resolve()) for path in paths})
+    for start in range(0, len(normalized), chunk_size):
+        table.delete(where=_in_predicate("source_path", normalized[start : start + chunk_size]))
+
+
+def upsert_manifest_rows(table: LanceManifestTable, records: list[dict[str, Any]]) -> None:
+    """Insert or replace manifest rows with a single merge-insert keyed on ``source_path``."""
+
+    merge_rows(table, records, key_columns=MANIFEST_KEY_COLUMNS)
+
+
+def read_manifest_rows(table: LanceManifestTable) -> dict[str, dict[str, Any]]:
+    """Return every manifest row keyed by ``source_path``."""
+
+    arrow_table = _read_columns(table, table.schema.names)
+    return {row["source_path"]: row for row in arrow_table.to_pylist()}
+
+
+def fetch_metadata_rows(
+    table: LanceMetadataTable,
+    paths: list[str],
+    *,
+    columns: Sequence[str] | None = None,
+    chunk_size: int = 512,
+) -> dict[str, dict[str, Any]]:
+    """Return metadata rows keyed by ``source_path``.
+
+    Only rows matching ``source_path IN (...)`` are read, in chunks of ``chunk_size``
+    paths, and only ``columns`` (plus ``source_path``) are projected when given.
+    """
 
     if not paths:
         return {}
-    normalized = {str(Path(path).expanduser().resolve()) for path in paths}
-    arrow_table = table.to_arrow()
-    rows = arrow_table.to_pylist()
-    return {row["source_path"]: row for row in rows if row["source_path"] in normalized}
+    normalized = sorted({str(Path(path).expanduser().resolve()) for path in paths})
+    selected = list(columns) if columns is not None else table.schema.names
+    if "source_path" not in selected:
+        selected = ["source_path", *selected]
+    rows: dict[str, dict[str, Any]] = {}
+    for start in range(0, len(normalized), chunk_size):
+        chunk = normalized[start : start + chunk_size]
+        arrow_table = _read_columns(table, selected, where=_in_predicate("source_path", chunk))
+        for row in arrow_table.to_pylist():
+            rows[row["source_path"]] = row
+    return rows
+
+
+def search_text(
+    table,
+    query: str,
+    *,
+    columns: Sequence[str],
+    limit: int,
+    select: Sequence[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Return rows ranked by BM25 over the full-text indexed ``columns``.
+
+    Each row carries its score in ``_score`` (higher is better); only ``select``
+    (plus ``_score``) is projected when given. The search only reads: rows written
+    after the index was built are matched by Lance's flat scan of the unindexed
+    fragments until ``ensure_scalar_indexes`` folds them in at indexing time.
+    """
+
+    search = table.search(MultiMatchQuery(query, list(columns)))
+    if select is not None:
+        search = search.select([*select, "_score"])
+    return search.limit(limit).to_list()
+
+
+def _in_predicate(column: str, values: Sequence[str]) -> str:
+    literals = ", ".join(_sql_string(value) for value in values)
+    return f"{column} IN ({literals})"
+
+
+def _sql_string(value: str) -> str:
+    escaped = value.replace("'", "''")
+    return f"'{escaped}'"
+
+
+def list_metadata_sources(table: LanceMetadataTable, *, where: str | None = None) -> set[str]:
+    """Return the source paths recorded in the metadata table (matching ``where``)."""
+
+    arrow_table = _read_columns(table, ["source_path"], where=where)
+    return {str(value) for value in arrow_table.column("source_path").to_pylist()}
 
 
 def list_doc_sources(table: LanceDocTable) -> set[str]:
     """Return the normalized source paths that have doc embeddings."""
 
-    arrow_table = table.to_arrow(columns=["source_path"])
+    arrow_table = _read_columns(table, ["source_path"])
     if not arrow_table.num_rows:
         return set()
     column = arrow_table.column("source_path").to_pylist()
     return {str(Path(value).expanduser().resolve()) for value in column}
 
 
+def list_chunk_sources(table: LanceChunkTable) -> set[str]:
+    """Return the distinct source paths that have chunk embeddings."""
+
+    arrow_table = _read_columns(table, ["source_path"])
+    if not arrow_table.num_rows:
+        return set()
+    return {str(value) for value in pc.unique(arrow_table.column("source_path")).to_pylist()}
+
+
 def list_tag_pairs(table: LanceTagTable) -> set[tuple[str, str]]:
     """Return the normalized source/tag pairs in the tag table."""
 
-    arrow_table = table.to_arrow(columns=["source_path", "tag_text"])
+    arrow_table = _read_columns(table, ["source_path", "tag_text"])
     if not arrow_table.num_rows:
         return set()
     sources = arrow_table.column("source_path").to_pylist()
@@ -175,31 +464,329 @@ def list_tag_pairs(table: LanceTagTable) -> set[tuple[str, str]]:
     }
 
 
-def search_vectors(table, vector: list[float], *, limit: int = 5) -> list[dict[str, Any]]:
-    """Return rows sorted by cosine distance relative to ``vector``."""
+def vectors_are_normalized(table) -> bool:
+    """Return whether every stored vector is known to have unit length."""
+
+    metadata = table.schema.field("vector").metadata or {}
+    return metadata.get(_NORMALIZED_KEY) == b"true"
+
+
+def mark_vectors_normalized(table) -> None:
+    """Record in the vector field metadata that stored vectors have unit length."""
+
+    table.replace_field_metadata("vector", {_NORMALIZED_KEY.decode(): "true"})
+
+
+def vector_metric(table) -> str:
+    """Return the distance metric searches and indexes should use for ``table``."""
+
+    return "dot" if vectors_are_normalized(table) else "cosine"
+
+
+def unit_vector(vector: Sequence[float] | np.ndarray) -> np.ndarray:
+    """Return ``vector`` scaled to unit length (zero vectors are returned unchanged)."""
+
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+def normalize_stored_vectors(
+    table,
+    *,
+    key_columns: Sequence[str],
+    batch_size: int = 10_000,
+) -> int:
+    """Rewrite every stored vector at unit length and flag the table as normalized.
+
+    Rows are streamed in ``batch_size`` batches and written back with ``merge_insert``
+    on ``key_columns``. Any ANN index is dropped because it was trained for cosine
+    distance; rebuild it with ``ensure_vector_index``. Returns the number of rows read.
+    """
+
+    if vectors_are_normalized(table):
+        return 0
+    dim = vector_dimension(table)
+    if dim is None:
+        raise ValueError("Vectors must be stored as fixed-size lists before normalizing.")
+    rewritten = 0
+    for batch in table.search().limit(None).to_batches(batch_size):
+        position = batch.schema.get_field_index("vector")
+        vectors = _unit_vector_array(batch.column(position), dim)
+        updated = batch.set_column(position, batch.schema.field(position), vectors)
+        (
+            table.merge_insert(list(key_columns))
+            .when_matched_update_all()
+            .execute(pa.Table.from_batches([updated]))
+        )
+        rewritten += batch.num_rows
+    index = find_vector_index(table)
+    if index is not None:
+        table.drop_index(index.name)
+    mark_vectors_normalized(table)
+    return rewritten
+
+
+def _unit_vector_array(array: pa.FixedSizeListArray, dim: int) -> pa.FixedSizeListArray:
+    values = array.values.slice(array.offset * dim, len(array) * dim)
+    matrix = values.to_numpy(zero_copy_only=False).reshape(len(array), dim)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    scaled = (matrix / norms).astype(np.float32)
+    return pa.FixedSizeListArray.from_arrays(pa.array(scaled.ravel()), dim, mask=array.is_null())
+
+
+def find_vector_index(table) -> Any | None:
+    """Return the index config covering the ``vector`` column, if one exists."""
+
+    for index in table.list_indices():
+        if list(index.columns) == ["vector"]:
+            return index
+    return None
+
+
+def ensure_vector_index(
+    table,
+    *,
+    min_rows: int,
+    index_type: str = "IVF_PQ",
+    rebuild_ratio: float = 0.5,
+) -> str:
+    """Create, extend, or rebuild the ANN index on ``vector`` and return the action taken.
+
+    Tables below ``min_rows`` stay on the exact scan. Once indexed, rows appended since
+    the last build are folded in through ``optimize()``; when they outnumber the indexed
+    rows by ``rebuild_ratio`` the index is retrained so its partitions match the data.
+    """
+
+    if not pa.types.is_fixed_size_list(table.schema.field("vector").type):
+        return "unsupported"
+    index = find_vector_index(table)
+    if index is None:
+        if table.count_rows() < min_rows:
+            return "below-threshold"
+        table.create_index(
+            metric=vector_metric(table), index_type=index_type, vector_column_name="vector"
+        )
+        return "created"
+    stats = table.index_stats(index.name)
+    if stats is None or not stats.num_unindexed_rows:
+        return "current"
+    if stats.num_unindexed_rows > stats.num_indexed_rows * rebuild_ratio:
+        table.create_index(
+            metric=vector_metric(table),
+            index_type=index_type,
+            vector_column_name="vector",
+            replace=True,
+        )
+        return "rebuilt"
+    table.optimize()
+    return "extended"
+
+
+def ensure_scalar_indexes(
+    table,
+    indexes: Mapping[str, str],
+    *,
+    extend: bool = True,
+    min_unindexed_rows: int = 10_000,
+    refresh_ratio: float = 0.1,
+) -> dict[str, str]:
+    """Create missing scalar indexes and fold new rows into stale ones.
+
+    ``indexes`` maps a column to its index type (``BTREE`` for near-unique keys,
+    ``BITMAP`` for low-cardinality ones, ``FTS`` for an inverted full-text index).
+    Rows written after an index was built are scanned until ``optimize()`` folds them
+    in; with ``extend`` that happens once the unindexed rows reach both
+    ``min_unindexed_rows`` and ``refresh_ratio`` of the indexed ones. Returns the
+    action taken per column.
+    """
+
+    existing = {
+        index.columns[0]: index for index in table.list_indices() if len(index.columns) == 1
+    }
+    actions: dict[str, str] = {}
+    for column, index_type in indexes.items():
+        index = existing.get(column)
+        if index is None:
+            if index_type == "FTS":
+                table.create_fts_index(column, use_tantivy=False)
+            else:
+                table.create_scalar_index(column, index_type=index_type)
+            actions[column] = "created"
+            continue
+        stats = table.index_stats(index.name)
+        if not extend or stats is None or not stats.num_unindexed_rows:
+            actions[column] = "current"
+            continue
+        threshold = max(min_unindexed_rows, stats.num_indexed_rows * refresh_ratio)
+        actions[column] = "stale" if stats.num_unindexed_rows >= threshold else "current"
+    if "stale" in actions.values():
+        table.optimize()
+        actions = {
+            column: "extended" if action == "stale" else action
+            for column, action in actions.items()
+        }
+    return actions
+
+
+@dataclass(frozen=True)
+class TableStats:
+    """Storage footprint of one Lance table."""
+
+    rows: int
+    fragments: int
+    small_fragments: int
+    versions: int
+    bytes: int
+
+
+def table_stats(table) -> TableStats:
+    """Return row, fragment, version, and byte counts for ``table``."""
+
+    stats = table.stats()
+    fragments = stats["fragment_stats"]
+    return TableStats(
+        rows=int(stats["num_rows"]),
+        fragments=int(fragments["num_fragments"]),
+        small_fragments=int(fragments["num_small_fragments"]),
+        versions=len(table.list_versions()),
+        bytes=int(stats["total_bytes"]),
+    )
+
+
+def compact_table(table, *, retention: timedelta) -> None:
+    """Merge small fragments, fold new rows into indexes, and prune old versions.
+
+    Versions older than ``retention`` are deleted; handles opened elsewhere and still
+    pinned to one of them must reopen or ``checkout_latest()`` before reading again.
+    """
+
+    table.optimize(cleanup_older_than=retention)
+
+
+def search_vectors(
+    table,
+    vector: list[float],
+    *,
+    limit: int = 5,
+    columns: Sequence[str] | None = None,
+    nprobes: int | None = None,
+    refine_factor: int | None = None,
+) -> list[dict[str, Any]]:
+    """Return rows sorted by cosine distance relative to ``vector``.
+
+    Tables with an ANN index are queried through it (``nprobes``/``refine_factor`` tune
+    the recall/latency trade-off). Otherwise the vector column is scanned once into a
+    contiguous float32 matrix, scored with a single matrix-vector product, and only the
+    ``limit`` winning rows are turned into Python dictionaries. Only ``columns`` (every
+    column when ``None``) and the vector are read and returned.
+    """
 
     if not vector:
         return []
     query = np.asarray(vector, dtype="float32")
     if query.ndim != 1:
         raise ValueError("Query vector must be one-dimensional.")
-    rows = table.to_arrow().to_pylist()
-    if not rows:
+    if limit <= 0:
+        return []
+    selected = table.schema.names if columns is None else [*columns, "vector"]
+    if find_vector_index(table) is not None:
+        return _search_vector_index(
+            table,
+            query,
+            limit=limit,
+            columns=selected,
+            nprobes=nprobes,
+            refine_factor=refine_factor,
+        )
+    arrow_table = _read_columns(table, selected)
+    if not arrow_table.num_rows:
+        return []
+
+    matrix, positions = vector_matrix(arrow_table.column("vector"), dim=query.shape[0])
+    if not positions.size:
         return []
+    if vectors_are_normalized(table):
+        distances = inner_product_distances(matrix, unit_vector(query))
+    else:
+        distances = cosine_distances(matrix, query)
+    winners = top_k_indices(distances, limit)
+
+    rows = arrow_table.take(pa.array(positions[winners])).to_pylist()
+    for row, distance in zip(rows, distances[winners], strict=True):
+        row["_distance"] = float(distance)
+    return rows
+
+
+def _search_vector_index(
+    table,
+    query: np.ndarray,
+    *,
+    limit: int,
+    columns: Sequence[str],
+    nprobes: int | None,
+    refine_factor: int | None,
+) -> list[dict[str, Any]]:
+    if vectors_are_normalized(table):
+        # Lance reports the dot "distance" as 1 - q.x; with a unit query that equals the
+        # 1 - cos of the exact scan, so scores agree whether or not an index exists.
+        query = unit_vector(query)
+    builder = (
+        table.search(query, vector_column_name="vector")
+        .distance_type(vector_metric(table))
+        .select(list(columns))
+        .limit(limit)
+    )
+    if nprobes is not None:
+        builder = builder.nprobes(nprobes)
+    if refine_factor is not None:
+        builder = builder.refine_factor(refine_factor)
+    return builder.to_list()
+
+
+def vector_matrix(column: pa.ChunkedArray | pa.Array, *, dim: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return a ``(rows, dim)`` float32 matrix plus the table positions it covers.
+
+    Rows whose vector is null or does not have ``dim`` values are left out, so the
+    returned positions map matrix rows back onto the source table.
+    """
+
+    array = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    if pa.types.is_fixed_size_list(array.type) and not array.null_count:
+        lengths = np.full(len(array), array.type.list_size)
+    else:
+        lengths = pc.list_value_length(array).fill_null(0).to_numpy(zero_copy_only=False)
+    valid = lengths == dim
+    positions = np.flatnonzero(valid)
+    if positions.size != len(array):
+        array = array.filter(pa.array(valid))
+    values = array.flatten().to_numpy(zero_copy_only=False)
+    matrix = np.ascontiguousarray(values, dtype=np.float32).reshape(positions.size, dim)
+    return matrix, positions
+
+
+def inner_product_distances(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Return ``1 - dot`` for every matrix row; equals cosine distance for unit vectors."""
+
+    return 1.0 - matrix @ query
+
+
+def cosine_distances(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Return ``1 - cosine`` for every matrix row; zero-norm rows score ``inf``."""
+
+    denominators = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distances = 1.0 - (matrix @ query) / denominators
+    distances[~np.isfinite(distances)] = np.inf
+    return distances
+
+
+def top_k_indices(distances: np.ndarray, limit: int) -> np.ndarray:
+    """Return the indices of the ``limit`` smallest distances in ascending order."""
 
-    def cosine_distance(other: Sequence[float]) -> float:
-        other_vec = np.asarray(other, dtype="float32")
-        denom = np.linalg.norm(query) * np.linalg.norm(other_vec)
-        if denom == 0:
-            return float("inf")
-        similarity = float(np.dot(query, other_vec) / denom)
-        return 1.0 - similarity
-
-    scored_rows: list[tuple[dict[str, Any], float]] = []
-    for row in rows:
-        distance = cosine_distance(row["vector"])
-        row["_distance"] = distance
-        scored_rows.append((row, distance))
-
-    scored_rows.sort(key=lambda item: item[1])
-    return [row for row, _ in scored_rows[:limit]]
+    if limit < distances.size:
+        candidates = np.argpartition(distances, limit - 1)[:limit]
+    else:
+        candidates = np.arange(distances.size)
+    return candidates[np.argsort(distances[candidates], kind="stable")]
@@ -1,9 +1,12 @@
-"""Low-level helper for invoking the Ollama CLI."""
+"""Low-level helpers for invoking Ollama through its CLI or HTTP API."""
 
 from __future__ import annotations
 
+import json
 import subprocess
-from typing import Sequence
+from typing import Any, Sequence
+
+from .http_pool import HttpConnectionPool, default_http_pool
 
 
 def run_ollama_prompt(
@@ -38,3 +41,93 @@ def run_ollama_prompt(
             f"Ollama exited with status {process.returncode}: {stderr or 'no stderr'}"
         )
     return process.stdout.decode("utf-8", errors="ignore").strip()
+
+
+def generate_ollama_http(
+    model: str,
+    prompt: str,
+    *,
+    host: str = "http://127.0.0.1:11434",
+    system: str | None = None,
+    format: str | dict[str, Any] | None = None,
+    options: dict[str, Any] | None = None,
+    keep_alive: str | float | None = None,
+    timeout: float = 120.0,
+    pool: HttpConnectionPool | None = None,
+) -> str:
+    """Send ``prompt`` to Ollama's ``/api/generate`` endpoint and return the response."""
+
+    if not prompt.strip():
+        raise ValueError("Prompt must contain text.")
+    payload: dict[str, Any] = {"model": model, "prompt": prompt}
+    if system is not None:
+        payload["system"] = system
+    data = _post_ollama(
+        f"{host.rstrip('/')}/api/generate",
+        payload,
+        format=format,
+        options=options,
+        keep_alive=keep_alive,
+        timeout=timeout,
+        pool=pool,
+    )
+    response = data.get("response")
+    if not isinstance(response, str):
+        raise RuntimeError("Ollama response did not include generated text.")
+    return response.strip()
+
+
+def chat_ollama_http(
+    model: str,
+    messages: Sequence[dict[str, str]],
+    *,
+    host: str = "http://127.0.0.1:11434",
+    format: str | dict[str, Any] | None = None,
+    options: dict[str, Any] | None = None,
+    keep_alive: str | float | None = None,
+    timeout: float = 120.0,
+    pool: HttpConnectionPool | None = None,
+) -> str:
+    """Send ``messages`` to Ollama's ``/api/chat`` endpoint and return the reply."""
+
+    if not messages:
+        raise ValueError("At least one message is required.")
+    data = _post_ollama(
+        f"{host.rstrip('/')}/api/chat",
+        {"model": model, "messages": list(messages)},
+        format=format,
+        options=options,
+        keep_alive=keep_alive,
+        timeout=timeout,
+        pool=pool,
+    )
+    message = data.get("message")
+    content = message.get("content") if isinstance(message, dict) else None
+    if not isinstance(content, str):
+        raise RuntimeError("Ollama chat response did not include a message.")
+    return content.strip()
+
+
+def _post_ollama(
+    endpoint: str,
+    payload: dict[str, Any],
+    *,
+    format: str | dict[str, Any] | None,
+    options: dict[str, Any] | None,
+    keep_alive: str | float | None,
+    timeout: float,
+    pool: HttpConnectionPool | None,
+) -> dict[str, Any]:
+    payload = {**payload, "stream": False}
+    if format is not None:
+        payload["format"] = format
+    if options:
+        payload["options"] = options
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    body = json.dumps(payload).encode("utf-8")
+    raw = (pool or default_http_pool()).post(endpoint, body, timeout=timeout)
+    data = json.loads(raw.decode("utf-8"))
+    if not isinstance(data, dict):
+        raise RuntimeError("Unexpected Ollama response payload.")
+    return data
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import http.client
 import json
 from typing import Any, Callable
-from urllib import error, request
+
+from .http_pool import HttpConnectionPool, default_http_pool
 
 JsonBytes = bytes
 
@@ -15,11 +17,12 @@ def request_embedding_vector(
     endpoint: str = "http://127.0.0.1:11434/api/embeddings",
     timeout: float = 120.0,
     transport: Callable[[JsonBytes], JsonBytes] | None = None,
+    pool: HttpConnectionPool | None = None,
 ) -> list[float]:
     """Send ``payload`` to Ollama's embedding endpoint and return the vector."""
 
     body = json.dumps(payload).encode("utf-8")
-    raw = _send_request(body, endpoint=endpoint, timeout=timeout, transport=transport)
+    raw = _send_request(body, endpoint=endpoint, timeout=timeout, transport=transport, pool=pool)
     data = json.loads(raw.decode("utf-8"))
     vector = _extract_embedding(data)
     if vector is None:
@@ -27,25 +30,39 @@ def request_embedding_vector(
     return [float(value) for value in vector]
 
 
+def request_embedding_vectors(
+    payload: dict[str, Any],
+    *,
+    endpoint: str = "http://127.0.0.1:11434/api/embed",
+    timeout: float = 120.0,
+    transport: Callable[[JsonBytes], JsonBytes] | None = None,
+    pool: HttpConnectionPool | None = None,
+) -> list[list[float]]:
+    """Send a list ``input`` to Ollama's batch ``/api/embed`` endpoint and return the vectors."""
+
+    body = json.dumps(payload).encode("utf-8")
+    raw = _send_request(body, endpoint=endpoint, timeout=timeout, transport=transport, pool=pool)
+    data = json.loads(raw.decode("utf-8"))
+    vectors = data.get("embeddings")
+    if not isinstance(vectors, list) or len(vectors) != len(payload["input"]):
+        raise RuntimeError("Embedding response did not include one vector per input.")
+    return [[float(value) for value in vector] for vector in vectors]
+
+
 def _send_request(
     body: JsonBytes,
     *,
     endpoint: str,
     timeout: float,
     transport: Callable[[JsonBytes], JsonBytes] | None,
+    pool: HttpConnectionPool | None = None,
 ) -> JsonBytes:
     if transport is not None:
         return transport(body)
 
-    req = request.Request(
-        endpoint,
-        data=body,
-        headers={"Content-Type": "application/json"},
-    )
     try:
-        with request.urlopen(req, timeout=timeout) as response:
-            return response.read()
-    except error.URLError as exc:  # pragma: no cover - network failures are rare.
+        return (pool or default_http_pool()).post(endpoint, body, timeout=timeout)
+    except (OSError, http.client.HTTPException) as exc:  # pragma: no cover - network failures.
         raise RuntimeError(f"Failed to contact Ollama embeddings API: {exc}") from exc
 
 
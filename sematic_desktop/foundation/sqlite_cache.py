@@ -0,0 +1,158 @@
+"""Size-capped key/value store kept in a single SQLite file."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Mapping, Sequence
+
+__all__ = ["SqliteCache"]
+
+_SQLITE_MAX_VARIABLES = 500
+
+
+class SqliteCache:
+    """Persistent ``str -> bytes`` map with least-recently-used eviction.
+
+    Every row is tagged with ``namespace``; opening the file with a different
+    namespace (e.g. another model) deletes the rows written under the old one, so
+    stale entries never outlive the configuration that produced them. Once the
+    stored values exceed ``max_bytes`` the least recently read or written rows are
+    evicted until the total drops to 90% of the cap. Safe to share across threads.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        namespace: str,
+        max_bytes: int,
+        table: str = "entries",
+    ) -> None:
+        self.path = Path(path).expanduser().resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.table = table
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                " key TEXT PRIMARY KEY,"
+                " namespace TEXT NOT NULL,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used INTEGER NOT NULL)"
+            )
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_last_used ON {table} (last_used)"
+            )
+            self._connection.execute(f"DELETE FROM {table} WHERE namespace != ?", (namespace,))
+        row = self._connection.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(MAX(last_used), 0) FROM {table}"
+        ).fetchone()
+        self._entries, self._bytes, self._clock = int(row[0]), int(row[1]), int(row[2])
+
+    def __enter__(self) -> SqliteCache:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes held by the stored values."""
+
+        return self._bytes
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        """Return the stored values for ``keys`` (missing keys are omitted)."""
+
+        unique = list(dict.fromkeys(keys))
+        found: dict[str, bytes] = {}
+        with self._lock:
+            for start in range(0, len(unique), _SQLITE_MAX_VARIABLES):
+                chunk = unique[start : start + _SQLITE_MAX_VARIABLES]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})", chunk
+                )
+                found.update((key, bytes(value)) for key, value in rows)
+            if found:
+                self._clock += 1
+                with self._connection:
+                    self._connection.executemany(
+                        f"UPDATE {self.table} SET last_used = ? WHERE key = ?",
+                        [(self._clock, key) for key in found],
+                    )
+        return found
+
+    def put_many(self, items: Mapping[str, bytes]) -> None:
+        """Store ``items``, replacing existing keys, then evict down to the size cap."""
+
+        if not items:
+            return
+        with self._lock:
+            replaced = self._sizes(list(items))
+            self._clock += 1
+            with self._connection:
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO {self.table}"
+                    " (key, namespace, value, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (key, self.namespace, value, len(value), self._clock)
+                        for key, value in items.items()
+                    ],
+                )
+            self._entries += len(items) - len(replaced)
+            self._bytes += sum(len(value) for value in items.values()) - sum(replaced.values())
+            if self._bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * 0.9))
+
+    def clear(self) -> None:
+        """Delete every entry."""
+
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {self.table}")
+            self._entries = self._bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _sizes(self, keys: list[str]) -> dict[str, int]:
+        sizes: dict[str, int] = {}
+        for start in range(0, len(keys), _SQLITE_MAX_VARIABLES):
+            chunk = keys[start : start + _SQLITE_MAX_VARIABLES]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._connection.execute(
+                f"SELECT key, size FROM {self.table} WHERE key IN ({placeholders})", chunk
+            )
+            sizes.update((key, int(size)) for key, size in rows)
+        return sizes
+
+    def _evict(self, target_bytes: int) -> None:
+        cursor = self._connection.execute(
+            f"SELECT key, size FROM {self.table} ORDER BY last_used, key"
+        )
+        doomed: list[tuple[str]] = []
+        freed = 0
+        for key, size in cursor:
+            if self._bytes - freed <= target_bytes:
+                break
+            doomed.append((key,))
+            freed += size
+        cursor.close()
+        with self._connection:
+            self._connection.executemany(f"DELETE FROM {self.table} WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+        self._entries -= len(doomed)
+        self._bytes -= freed
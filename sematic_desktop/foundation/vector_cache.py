@@ -0,0 +1,156 @@
+"""Resident in-memory copy of a Lance vector table for repeated searches."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .lance import (
+    _read_columns,
+    cosine_distances,
+    inner_product_distances,
+    top_k_indices,
+    unit_vector,
+    vector_dimension,
+    vector_matrix,
+    vectors_are_normalized,
+)
+
+__all__ = ["ResidentVectorMatrix", "latest_version"]
+
+
+def latest_version(table) -> int:
+    """Return the newest committed version of ``table``, including other writers' commits."""
+
+    table.checkout_latest()
+    return int(table.version)
+
+
+class ResidentVectorMatrix:
+    """Keeps a table's vectors and key columns in memory, keyed on the Lance version.
+
+    Each search compares the table version with the cached one. When only appends
+    happened since the last load, just the new rows (``_rowid`` above the cached
+    maximum) are read; any delete, update, or compaction triggers a full reload.
+    Tables whose resident copy would exceed ``max_bytes`` are not cached and
+    ``search`` returns ``None`` so callers fall back to the on-disk scan.
+    """
+
+    def __init__(self, *, key_columns: Sequence[str], max_bytes: int) -> None:
+        self.key_columns = list(key_columns)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._max_row_id = -1
+        self._row_count = 0
+        self._dim = 0
+        self._normalized = False
+        self._matrix: np.ndarray | None = None
+        self._positions: np.ndarray | None = None
+        self._keys: pa.Table | None = None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the resident matrix and key columns."""
+
+        if self._matrix is None or self._keys is None or self._positions is None:
+            return 0
+        return self._matrix.nbytes + self._positions.nbytes + self._keys.nbytes
+
+    def evict(self) -> None:
+        """Drop the resident copy so its memory is released immediately."""
+
+        with self._lock:
+            self._clear()
+
+    def search(self, table, vector: Sequence[float], *, limit: int) -> list[dict[str, Any]] | None:
+        """Return the ``limit`` closest rows, or ``None`` when the table is not cacheable."""
+
+        query = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            if not self._refresh(table, query_dim=query.shape[0]):
+                return None
+            matrix, positions, keys = self._matrix, self._positions, self._keys
+            if matrix is None or positions is None or keys is None or not positions.size:
+                return []
+            if query.shape[0] != self._dim:
+                return []
+            if self._normalized:
+                distances = inner_product_distances(matrix, unit_vector(query))
+            else:
+                distances = cosine_distances(matrix, query)
+            winners = top_k_indices(distances, limit)
+            rows = keys.take(pa.array(positions[winners])).to_pylist()
+            for row, index in zip(rows, winners, strict=True):
+                row["vector"] = matrix[index].tolist()
+                row["_distance"] = float(distances[index])
+            return rows
+
+    def _refresh(self, table, *, query_dim: int) -> bool:
+        version = latest_version(table)
+        if version == self._version and self._matrix is not None:
+            return True
+        if self._matrix is not None and self._only_appended(table):
+            appended = _read_columns(
+                table,
+                [*self.key_columns, "vector"],
+                where=f"_rowid > {self._max_row_id}" if self._row_count else None,
+                row_ids=True,
+            )
+            if self._fits(self.nbytes + appended.nbytes):
+                self._append(appended)
+                self._normalized = vectors_are_normalized(table)
+                self._version = version
+                return True
+        self._clear()
+        self._dim = vector_dimension(table) or query_dim
+        if not self._fits(table.count_rows() * self._dim * 4):
+            return False
+        self._append(_read_columns(table, [*self.key_columns, "vector"], row_ids=True))
+        if not self._fits(self.nbytes):
+            self._clear()
+            return False
+        self._normalized = vectors_are_normalized(table)
+        self._version = version
+        return True
+
+    def _only_appended(self, table) -> bool:
+        if not self._row_count:
+            return True
+        return table.count_rows(f"_rowid <= {self._max_row_id}") == self._row_count
+
+    def _append(self, snapshot: pa.Table) -> None:
+        if not snapshot.num_rows:
+            if self._matrix is None:
+                self._matrix = np.empty((0, self._dim), dtype=np.float32)
+                self._positions = np.empty(0, dtype=np.int64)
+                self._keys = snapshot.select(self.key_columns)
+            return
+        matrix, positions = vector_matrix(snapshot.column("vector"), dim=self._dim)
+        matrix = np.array(matrix, dtype=np.float32, copy=True)
+        keys = snapshot.select(self.key_columns).combine_chunks()
+        if self._matrix is None or self._positions is None or self._keys is None:
+            self._matrix, self._positions, self._keys = matrix, positions, keys
+        else:
+            offset = self._keys.num_rows
+            self._matrix = np.concatenate([self._matrix, matrix])
+            self._positions = np.concatenate([self._positions, positions + offset])
+            self._keys = pa.concat_tables([self._keys, keys]).combine_chunks()
+        row_ids = snapshot.column("_rowid")
+        self._max_row_id = max(self._max_row_id, int(pc.max(row_ids).as_py()))
+        self._row_count += snapshot.num_rows
+
+    def _fits(self, size: int) -> bool:
+        return size <= self.max_bytes
+
+    def _clear(self) -> None:
+        self._matrix = None
+        self._positions = None
+        self._keys = None
+        self._version = None
+        self._max_row_id = -1
+        self._row_count = 0
@@ -1,18 +1,31 @@
 """Middleware clients that talk to external systems."""
 
-from .embeddings import EmbeddingGemmaClient, EmbeddingGemmaError
+from .caching import CacheStats, TieredCache
+from .chunking import MarkdownChunk, MarkdownChunker
+from .embeddings import (
+    CachedEmbeddingClient,
+    EmbeddingBatcher,
+    EmbeddingGemmaClient,
+    EmbeddingGemmaError,
+)
 from .ollama import OllamaClient, OllamaError
 from .routing import ConversionRouter, FileSignals, gather_file_signals
 from .summarizer import MarkdownSummarizer, MarkdownSummary
 
 __all__ = [
+    "CacheStats",
+    "CachedEmbeddingClient",
     "ConversionRouter",
+    "EmbeddingBatcher",
     "EmbeddingGemmaClient",
     "EmbeddingGemmaError",
     "FileSignals",
+    "MarkdownChunk",
+    "MarkdownChunker",
     "MarkdownSummarizer",
     "MarkdownSummary",
     "OllamaClient",
     "OllamaError",
+    "TieredCache",
     "gather_file_signals",
 ]
@@ -0,0 +1,128 @@
+"""Two-tier (memory LRU + SQLite) caches for expensive Ollama results."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping, Sequence
+
+from sematic_desktop.foundation.sqlite_cache import SqliteCache
+
+__all__ = ["CacheStats", "TieredCache", "content_key"]
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Counters for one cache since it was opened."""
+
+    hits: int
+    memory_hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def content_key(*parts: str) -> str:
+    """Return a stable SHA-256 key for ``parts``."""
+
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class TieredCache:
+    """``SqliteCache`` fronted by an in-process LRU of ``memory_entries`` values.
+
+    Lookups try memory first, then the SQLite file; SQLite hits are promoted into
+    memory. ``namespace`` and ``max_bytes`` are passed through to ``SqliteCache``,
+    so changing the namespace drops the file's older entries.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        namespace: str,
+        max_bytes: int,
+        memory_entries: int = 4_096,
+    ) -> None:
+        self.store = SqliteCache(path, namespace=namespace, max_bytes=max_bytes)
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._memory_hits = 0
+        self._misses = 0
+
+    def __enter__(self) -> TieredCache:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        """Return cached values for ``keys``; every key is counted as a hit or miss."""
+
+        found: dict[str, bytes] = {}
+        with self._lock:
+            for key in keys:
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = value
+            self._memory_hits += len(found)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            stored = self.store.get_many(missing)
+            found.update(stored)
+            self._remember(stored)
+        with self._lock:
+            hits = sum(1 for key in keys if key in found)
+            self._hits += hits
+            self._misses += len(keys) - hits
+        return found
+
+    def put_many(self, items: Mapping[str, bytes]) -> None:
+        """Store ``items`` in both tiers."""
+
+        if not items:
+            return
+        self.store.put_many(items)
+        self._remember(items)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                memory_hits=self._memory_hits,
+                misses=self._misses,
+                evictions=self.store.evictions,
+                entries=len(self.store),
+                bytes=self.store.total_bytes,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        self.store.close()
+
+    def _remember(self, items: Mapping[str, bytes]) -> None:
+        if self.memory_entries <= 0:
+            return
+        with self._lock:
+            for key, value in items.items():
+                self._memory[key] = value
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
@@ -0,0 +1,206 @@
+"""Split converted markdown into overlapping, heading-aware chunks."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+__all__ = ["MarkdownChunk", "MarkdownChunker"]
+
+_HEADING = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+_FENCE = re.compile(r"^[ \t]{0,3}(```|~~~)")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass(frozen=True, slots=True)
+class MarkdownChunk:
+    """One chunk of a markdown document.
+
+    ``start``/``end`` are byte offsets into the UTF-8 encoded markdown, so a reader can
+    seek to the chunk without decoding the text before it. ``heading`` is the trail of
+    headings the chunk sits under (e.g. "Setup > Linux").
+    """
+
+    index: int
+    start: int
+    end: int
+    heading: str
+    text: str
+
+    @property
+    def embedding_text(self) -> str:
+        """The chunk text, prefixed with its heading trail unless it opens with it."""
+
+        if not self.heading or self.text.lstrip().startswith("#"):
+            return self.text
+        return f"{self.heading}\n\n{self.text}"
+
+
+@dataclass(frozen=True, slots=True)
+class _Piece:
+    start: int
+    end: int
+    heading: bool
+
+
+class MarkdownChunker:
+    """Split markdown along headings and paragraphs into chunks of ``max_chars``.
+
+    Paragraphs (blank-line separated blocks, never split inside fenced code) are packed
+    greedily; a heading starts a new chunk once the current one holds ``min_chars``.
+    Paragraphs longer than ``max_chars`` are split at sentence ends, then at
+    whitespace. Consecutive chunks in a section share up to ``overlap`` characters of
+    whole paragraphs or sentences, so text near a boundary is found from either side.
+    """
+
+    def __init__(self, *, max_chars: int = 1_200, overlap: int = 200, min_chars: int = 300) -> None:
+        if max_chars <= 0:
+            raise ValueError("max_chars must be positive.")
+        self.max_chars = max_chars
+        self.overlap = max(0, min(overlap, max_chars // 2))
+        self.min_chars = min(min_chars, max_chars)
+
+    def split(self, text: str) -> list[MarkdownChunk]:
+        """Return the chunks of ``text`` in document order."""
+
+        pieces = self._pieces(text)
+        if not pieces:
+            return []
+        spans: list[tuple[int, int]] = []
+        position = 0
+        while position < len(pieces):
+            first = position
+            start, end = pieces[position].start, pieces[position].end
+            position += 1
+            while position < len(pieces):
+                piece = pieces[position]
+                if piece.end - start > self.max_chars:
+                    break
+                if piece.heading and end - start >= self.min_chars:
+                    break
+                end = piece.end
+                position += 1
+            spans.append((start, end))
+            if position < len(pieces) and not pieces[position].heading and self.overlap:
+                back = position
+                while back - 1 > first and end - pieces[back - 1].start <= self.overlap:
+                    back -= 1
+                position = back
+        headings = [
+            (piece.start, len(match.group(1)), match.group(2).strip())
+            for piece in pieces
+            if piece.heading and (match := _HEADING.match(text[piece.start : piece.end]))
+        ]
+        offsets = _byte_offsets(text, {offset for span in spans for offset in span})
+        return [
+            MarkdownChunk(
+                index=index,
+                start=offsets[start],
+                end=offsets[end],
+                heading=_heading_trail(headings, start),
+                text=text[start:end],
+            )
+            for index, (start, end) in enumerate(spans)
+        ]
+
+    def _pieces(self, text: str) -> list[_Piece]:
+        pieces: list[_Piece] = []
+        for start, end in _blocks(text):
+            heading = _HEADING.match(text[start:end]) is not None
+            if end - start <= self.max_chars:
+                pieces.append(_Piece(start, end, heading))
+                continue
+            for offset, (piece_start, piece_end) in enumerate(self._split_long(text, start, end)):
+                pieces.append(_Piece(piece_start, piece_end, heading and offset == 0))
+        return pieces
+
+    def _split_long(self, text: str, start: int, end: int) -> list[tuple[int, int]]:
+        sentences: list[tuple[int, int]] = []
+        cursor = start
+        for match in _SENTENCE_END.finditer(text, start, end):
+            sentences.append((cursor, match.start()))
+            cursor = match.end()
+        sentences.append((cursor, end))
+        spans: list[tuple[int, int]] = []
+        for sentence_start, sentence_end in sentences:
+            while sentence_end - sentence_start > self.max_chars:
+                cut = text.rfind(" ", sentence_start + 1, sentence_start + self.max_chars)
+                if cut == -1:
+                    cut = sentence_start + self.max_chars
+                spans.append((sentence_start, cut))
+                sentence_start = cut
+                while sentence_start < sentence_end and text[sentence_start].isspace():
+                    sentence_start += 1
+            if sentence_end > sentence_start:
+                spans.append((sentence_start, sentence_end))
+        return spans
+
+
+def _blocks(text: str) -> list[tuple[int, int]]:
+    """Return (start, end) of each paragraph, heading, or fenced code block."""
+
+    blocks: list[tuple[int, int]] = []
+    block_start: int | None = None
+    fence: str | None = None
+    position = 0
+    for line in text.splitlines(keepends=True):
+        line_start, position = position, position + len(line)
+        stripped = line.strip()
+        fence_match = _FENCE.match(line)
+        if fence is not None:
+            if fence_match and fence_match.group(1) == fence:
+                fence = None
+            continue
+        if fence_match:
+            fence = fence_match.group(1)
+            if block_start is None:
+                block_start = line_start
+            continue
+        if not stripped:
+            if block_start is not None:
+                blocks.append((block_start, line_start))
+                block_start = None
+            continue
+        if _HEADING.match(stripped):
+            if block_start is not None:
+                blocks.append((block_start, line_start))
+            blocks.append((line_start, position))
+            block_start = None
+            continue
+        if block_start is None:
+            block_start = line_start
+    if block_start is not None:
+        blocks.append((block_start, position))
+    return [span for span in (_strip(text, *block) for block in blocks) if span[1] > span[0]]
+
+
+def _strip(text: str, start: int, end: int) -> tuple[int, int]:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _heading_trail(headings: list[tuple[int, int, str]], offset: int) -> str:
+    trail: list[tuple[int, str]] = []
+    for position, level, title in headings:
+        if position > offset:
+            break
+        while trail and trail[-1][0] >= level:
+            trail.pop()
+        trail.append((level, title))
+    return " > ".join(title for _, title in trail)
+
+
+def _byte_offsets(text: str, positions: set[int]) -> dict[int, int]:
+    """Map character ``positions`` to UTF-8 byte offsets, encoding each span once."""
+
+    offsets: dict[int, int] = {}
+    previous = 0
+    total = 0
+    for position in sorted(positions):
+        total += len(text[previous:position].encode("utf-8"))
+        offsets[position] = total
+        previous = position
+    return offsets
@@ -2,11 +2,28 @@
 
 from __future__ import annotations
 
-from typing import Callable
+import logging
+import threading
+import time
+from array import array
+from concurrent.futures import Future
+from typing import Any, Callable, Sequence
 
-from sematic_desktop.foundation.remote_embeddings import request_embedding_vector
+from sematic_desktop.foundation.http_pool import HttpConnectionPool
+from sematic_desktop.foundation.remote_embeddings import (
+    request_embedding_vector,
+    request_embedding_vectors,
+)
+from sematic_desktop.middleware.caching import CacheStats, TieredCache, content_key
 
-__all__ = ["EmbeddingGemmaClient", "EmbeddingGemmaError"]
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "CachedEmbeddingClient",
+    "EmbeddingBatcher",
+    "EmbeddingGemmaClient",
+    "EmbeddingGemmaError",
+]
 
 
 class EmbeddingGemmaError(RuntimeError):
@@ -14,30 +31,38 @@ class EmbeddingGemmaError(RuntimeError):
 
 
 class EmbeddingGemmaClient:
-    """Calls Ollama's local HTTP API to generate embeddings via embeddinggemma."""
+    """Calls Ollama's local HTTP API to generate embeddings via embeddinggemma.
+
+    Requests go through ``http_pool`` (the process-wide keep-alive pool by default)
+    unless a ``transport`` callable is injected.
+    """
 
     def __init__(
         self,
         *,
         model: str = "embeddinggemma:latest",
         endpoint: str = "http://127.0.0.1:11434/api/embeddings",
+        batch_endpoint: str = "http://127.0.0.1:11434/api/embed",
         max_chars: int = 4_000,
+        max_batch_size: int = 64,
         timeout: float = 120.0,
         transport: Callable[[bytes], bytes] | None = None,
+        http_pool: HttpConnectionPool | None = None,
     ) -> None:
         self.model = model
         self.endpoint = endpoint
+        self.batch_endpoint = batch_endpoint
         self.max_chars = max_chars
+        self.max_batch_size = max(1, max_batch_size)
         self.timeout = timeout
         self.transport = transport
+        self.http_pool = http_pool
 
     def embed(self, text: str) -> list[float]:
         """Return the embedding vector for ``text``."""
-        prompt = text.strip()
+        prompt = self._prepare(text)
         if not prompt:
             raise ValueError("Cannot embed empty text.")
-        if len(prompt) > self.max_chars:
-            prompt = prompt[: self.max_chars]
 
         payload = {"model": self.model, "prompt": prompt}
         try:
@@ -46,6 +71,251 @@ class EmbeddingGemmaClient:
                 endpoint=self.endpoint,
                 timeout=self.timeout,
                 transport=self.transport,
+                pool=self.http_pool,
             )
         except Exception as exc:  # pragma: no cover - best effort.
             raise EmbeddingGemmaError(str(exc)) from exc
+
+    def embed_many(self, texts: Sequence[str]) -> list[list[float] | None]:
+        """Return one vector per text, sending up to ``max_batch_size`` texts per request.
+
+        Empty texts map to ``None``. When a batch request fails, its texts are retried
+        one at a time so a single bad input only yields ``None`` for itself.
+        """
+        prompts = [self._prepare(text) for text in texts]
+        results: list[list[float] | None] = [None] * len(prompts)
+        positions = [index for index, prompt in enumerate(prompts) if prompt]
+        for start in range(0, len(positions), self.max_batch_size):
+            chunk = positions[start : start + self.max_batch_size]
+            payload = {"model": self.model, "input": [prompts[index] for index in chunk]}
+            try:
+                vectors = request_embedding_vectors(
+                    payload,
+                    endpoint=self.batch_endpoint,
+                    timeout=self.timeout,
+                    transport=self.transport,
+                    pool=self.http_pool,
+                )
+            except Exception as exc:  # pragma: no cover - best effort.
+                logger.warning("Batch embedding failed, retrying items one by one: %s", exc)
+                vectors = [self._embed_or_none(prompts[index]) for index in chunk]
+            for index, vector in zip(chunk, vectors, strict=True):
+                results[index] = vector
+        return results
+
+    def _embed_or_none(self, prompt: str) -> list[float] | None:
+        try:
+            return self.embed(prompt)
+        except (EmbeddingGemmaError, ValueError) as exc:
+            logger.warning("Unable to embed text: %s", exc)
+            return None
+
+    def _prepare(self, text: str) -> str:
+        return text.strip()[: self.max_chars]
+
+
+class EmbeddingBatcher:
+    """Coalesce embedding requests from many callers into ``embed_many`` batches.
+
+    Texts submitted from any thread are queued and sent together once
+    ``max_batch_size`` are waiting or ``max_delay`` seconds have passed since the
+    oldest one arrived. ``embed``/``embed_many`` mirror ``EmbeddingGemmaClient`` so the
+    batcher can stand in for it; call ``close()`` (or use it as a context manager) to
+    flush the remaining texts and stop the worker thread.
+    """
+
+    def __init__(
+        self,
+        client: EmbeddingGemmaClient,
+        *,
+        max_batch_size: int = 32,
+        max_delay: float = 0.02,
+    ) -> None:
+        self.client = client
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_delay = max_delay
+        self._pending: list[tuple[str, Future[list[float] | None]]] = []
+        self._oldest: float | None = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def __enter__(self) -> EmbeddingBatcher:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def submit(self, text: str) -> Future[list[float] | None]:
+        """Queue ``text`` and return a future for its vector (``None`` if it failed)."""
+        future: Future[list[float] | None] = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("EmbeddingBatcher is closed.")
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((text, future))
+            self._condition.notify()
+        return future
+
+    def embed(self, text: str) -> list[float]:
+        if not text.strip():
+            raise ValueError("Cannot embed empty text.")
+        vector = self.submit(text).result()
+        if vector is None:
+            raise EmbeddingGemmaError("Embedding request failed.")
+        return vector
+
+    def embed_many(self, texts: Sequence[str]) -> list[list[float] | None]:
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._worker.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                deadline = (self._oldest or time.monotonic()) + self.max_delay
+                while len(self._pending) < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._pending[: self.max_batch_size]
+                self._pending = self._pending[self.max_batch_size :]
+                self._oldest = time.monotonic() if self._pending else None
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list[tuple[str, Future[list[float] | None]]]) -> None:
+        try:
+            vectors = self.client.embed_many([text for text, _ in batch])
+        except Exception as exc:  # pragma: no cover - embed_many already isolates items.
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for (_, future), vector in zip(batch, vectors, strict=True):
+            future.set_result(vector)
+
+
+class CachedEmbeddingClient:
+    """Serve repeated texts from a ``TieredCache`` and embed only the misses.
+
+    Entries are keyed by the SHA-256 of ``model`` plus the text as the model sees it
+    (stripped and cut to ``max_chars``), so a tag shared by thousands of documents is
+    embedded once, and concurrent callers asking for a text that is already being
+    embedded wait for that request instead of sending their own. Open the cache with
+    ``namespace=model`` so switching models drops the old vectors. ``client`` may be
+    an ``EmbeddingGemmaClient`` or an ``EmbeddingBatcher``; clients without
+    ``embed_many`` are called per text.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        cache: TieredCache,
+        *,
+        model: str,
+        max_chars: int = 4_000,
+    ) -> None:
+        self.client = client
+        self.cache = cache
+        self.model = model
+        self.max_chars = max_chars
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future[list[float] | None]] = {}
+
+    def embed(self, text: str) -> list[float]:
+        if not text.strip():
+            raise ValueError("Cannot embed empty text.")
+        vector = self.embed_many([text])[0]
+        if vector is None:
+            raise EmbeddingGemmaError("Embedding request failed.")
+        return vector
+
+    def embed_many(self, texts: Sequence[str]) -> list[list[float] | None]:
+        keys = [self._key(text) for text in texts]
+        cached = self.cache.get_many([key for key in keys if key is not None])
+        owned: dict[str, str] = {}
+        waiting: dict[str, Future[list[float] | None]] = {}
+        with self._lock:
+            for text, key in zip(texts, keys, strict=True):
+                if key is None or key in cached or key in owned or key in waiting:
+                    continue
+                if key in self._in_flight:
+                    waiting[key] = self._in_flight[key]
+                else:
+                    owned[key] = text
+                    self._in_flight[key] = Future()
+        fetched = self._fetch_owned(owned)
+        for key, future in waiting.items():
+            fetched[key] = future.result()
+        results: list[list[float] | None] = []
+        for key in keys:
+            if key is None:
+                results.append(None)
+            elif key in cached:
+                results.append(_decode(cached[key]))
+            else:
+                results.append(fetched.get(key))
+        return results
+
+    def stats(self) -> CacheStats:
+        return self.cache.stats()
+
+    def _fetch_owned(self, owned: dict[str, str]) -> dict[str, list[float] | None]:
+        # Other threads asking for the same texts meanwhile wait on these futures.
+        if not owned:
+            return {}
+        try:
+            vectors = self._fetch(list(owned.values()))
+        except BaseException as exc:
+            with self._lock:
+                for key in owned:
+                    self._in_flight.pop(key).set_exception(exc)
+            raise
+        fetched = dict(zip(owned, vectors, strict=True))
+        self.cache.put_many(
+            {key: _encode(vector) for key, vector in fetched.items() if vector is not None}
+        )
+        with self._lock:
+            for key, vector in fetched.items():
+                self._in_flight.pop(key).set_result(vector)
+        return fetched
+
+    def _fetch(self, texts: list[str]) -> list[list[float] | None]:
+        embed_many = getattr(self.client, "embed_many", None)
+        if callable(embed_many):
+            return embed_many(texts)
+        vectors: list[list[float] | None] = []
+        for text in texts:
+            try:
+                vectors.append(self.client.embed(text))
+            except Exception as exc:  # pragma: no cover - best effort.
+                logger.warning("Unable to embed text: %s", exc)
+                vectors.append(None)
+        return vectors
+
+    def _key(self, text: str) -> str | None:
+        prompt = text.strip()[: self.max_chars]
+        if not prompt:
+            return None
+        return content_key(self.model, prompt)
+
+
+def _encode(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _decode(blob: bytes) -> list[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
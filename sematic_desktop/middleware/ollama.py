@@ -1,20 +1,41 @@
-"""Thin wrapper utilities for interacting with the Ollama CLI."""
+"""Thin wrapper utilities for interacting with Ollama over HTTP or its CLI."""
 
 from __future__ import annotations
 
-from typing import Sequence
+import errno
+import http.client
+import logging
+from typing import Any, Sequence
 
-from sematic_desktop.foundation.ollama import run_ollama_prompt
+from sematic_desktop.foundation.http_pool import HttpConnectionPool
+from sematic_desktop.foundation.ollama import (
+    chat_ollama_http,
+    generate_ollama_http,
+    run_ollama_prompt,
+)
+
+logger = logging.getLogger(__name__)
 
 __all__ = ["OllamaClient", "OllamaError"]
 
 
 class OllamaError(RuntimeError):
-    """Raised when the Ollama CLI fails to generate a response."""
+    """Raised when Ollama fails to generate a response."""
 
 
 class OllamaClient:
-    """Minimal client for issuing prompts to Ollama."""
+    """Minimal client for issuing prompts to Ollama.
+
+    ``backend="http"`` talks to the server's ``/api/generate`` and ``/api/chat``
+    endpoints over the shared keep-alive pool, ``backend="cli"`` shells out to
+    ``ollama run``, and the default ``"auto"`` uses HTTP and falls back to the CLI
+    only when the server is not listening; timeouts and dropped connections are
+    reported as :class:`OllamaError` rather than retried through the CLI. Extra CLI
+    ``options`` have no HTTP equivalent, so ``"auto"`` runs such requests through the
+    CLI and ``"http"`` rejects them. ``keep_alive`` controls how long the model
+    stays loaded after a request and ``num_ctx`` sets its context window (both are
+    HTTP-only; the CLI receives ``--keepalive`` but ignores ``num_ctx``).
+    """
 
     def __init__(
         self,
@@ -22,10 +43,22 @@ class OllamaClient:
         binary: str = "ollama",
         timeout: float = 120.0,
         env: dict[str, str] | None = None,
+        backend: str = "auto",
+        host: str = "http://127.0.0.1:11434",
+        keep_alive: str | float | None = None,
+        num_ctx: int | None = None,
+        http_pool: HttpConnectionPool | None = None,
     ) -> None:
+        if backend not in {"auto", "http", "cli"}:
+            raise ValueError(f"Unknown Ollama backend: {backend!r}")
         self.binary = binary
         self.timeout = timeout
         self.env = env
+        self.backend = backend
+        self.host = host
+        self.keep_alive = keep_alive
+        self.num_ctx = num_ctx
+        self.http_pool = http_pool
 
     def generate(
         self,
@@ -33,8 +66,97 @@ class OllamaClient:
         prompt: str,
         *,
         options: Sequence[str] | None = None,
+        format: str | dict[str, Any] | None = None,
+        system: str | None = None,
+    ) -> str:
+        """Send ``prompt`` to ``model`` and return the raw textual response.
+
+        ``options`` are extra CLI arguments; ``format`` is ``"json"`` or a JSON schema
+        that constrains the output.
+        """
+        if self._use_http(options):
+            try:
+                return generate_ollama_http(
+                    model,
+                    prompt,
+                    host=self.host,
+                    system=system,
+                    format=format,
+                    options=self._http_options(),
+                    keep_alive=self.keep_alive,
+                    timeout=self.timeout,
+                    pool=self.http_pool,
+                )
+            except (OSError, http.client.HTTPException) as exc:
+                if self.backend == "http" or not _server_unreachable(exc):
+                    raise OllamaError(str(exc)) from exc
+                logger.info("Ollama HTTP API unavailable (%s); using the CLI.", exc)
+            except Exception as exc:  # pragma: no cover - best effort.
+                raise OllamaError(str(exc)) from exc
+        if system:
+            prompt = f"{system}\n\n{prompt}"
+        return self._run_cli(model, prompt, options=options, format=format)
+
+    def chat(
+        self,
+        model: str,
+        messages: Sequence[dict[str, str]],
+        *,
+        options: Sequence[str] | None = None,
+        format: str | dict[str, Any] | None = None,
+    ) -> str:
+        """Send chat ``messages`` (``role``/``content`` dicts) and return the reply.
+
+        ``options`` are extra CLI arguments, as for :meth:`generate`.
+        """
+        if self._use_http(options):
+            try:
+                return chat_ollama_http(
+                    model,
+                    messages,
+                    host=self.host,
+                    format=format,
+                    options=self._http_options(),
+                    keep_alive=self.keep_alive,
+                    timeout=self.timeout,
+                    pool=self.http_pool,
+                )
+            except (OSError, http.client.HTTPException) as exc:
+                if self.backend == "http" or not _server_unreachable(exc):
+                    raise OllamaError(str(exc)) from exc
+                logger.info("Ollama HTTP API unavailable (%s); using the CLI.", exc)
+            except Exception as exc:  # pragma: no cover - best effort.
+                raise OllamaError(str(exc)) from exc
+        prompt = "\n\n".join(message["content"] for message in messages)
+        return self._run_cli(model, prompt, options=options, format=format)
+
+    def _use_http(self, options: Sequence[str] | None) -> bool:
+        if self.backend == "cli":
+            return False
+        if options:
+            if self.backend == "http":
+                raise ValueError("CLI options are not supported by the HTTP backend.")
+            return False
+        return True
+
+    def _http_options(self) -> dict[str, Any] | None:
+        if self.num_ctx is None:
+            return None
+        return {"num_ctx": self.num_ctx}
+
+    def _run_cli(
+        self,
+        model: str,
+        prompt: str,
+        *,
+        options: Sequence[str] | None,
+        format: str | dict[str, Any] | None,
     ) -> str:
-        """Send ``prompt`` to ``model`` and return the raw textual response."""
+        arguments = list(options or [])
+        if format is not None:
+            arguments.extend(["--format", "json"])
+        if self.keep_alive is not None:
+            arguments.extend(["--keepalive", str(self.keep_alive)])
         try:
             return run_ollama_prompt(
                 model,
@@ -42,7 +164,14 @@ class OllamaClient:
                 binary=self.binary,
                 timeout=self.timeout,
                 env=self.env,
-                options=options,
+                options=arguments,
             )
         except Exception as exc:  # pragma: no cover - best effort.
             raise OllamaError(str(exc)) from exc
+
+
+def _server_unreachable(exc: BaseException) -> bool:
+    """Return whether ``exc`` means nothing is listening, as opposed to a failed request."""
+    if isinstance(exc, (ConnectionRefusedError, FileNotFoundError)):
+        return True
+    return isinstance(exc, OSError) and exc.errno in {errno.ECONNREFUSED, errno.ENOENT}
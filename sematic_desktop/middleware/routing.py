@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import mimetypes
+import os
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -70,11 +71,12 @@ class FileSignals:
 def gather_file_signals(
     path: Path,
     *,
+    stat: os.stat_result | None = None,
     historical_success: dict[str, float] | None = None,
 ) -> FileSignals:
     """Collects statistics that influence converter selection."""
 
-    stat = path.stat()
+    stat = stat or path.stat()
     return FileSignals(
         path=path,
         suffix=path.suffix.lower(),
@@ -104,6 +106,16 @@ class ConversionRouter:
         self.telemetry: list[dict[str, Any]] = []
         self._default_order = ["markitdown", "docling"]
 
+    def clone(self) -> ConversionRouter:
+        """Return a router with the same settings and history but no telemetry."""
+
+        return ConversionRouter(
+            large_file_threshold_mb=self.large_file_threshold_mb,
+            expected_char_ratio=self.expected_char_ratio,
+            history_weight=self.history_weight,
+            historical_stats=self._historical_stats,
+        )
+
     def historical_success_for(self, suffix: str) -> dict[str, float]:
         return dict(self._historical_stats.get(suffix, {}))
 
@@ -191,7 +203,7 @@ class ConversionRouter:
     ) -> None:
         """Track routing telemetry for future tuning."""
 
-        self.telemetry.append(
+        self._apply_outcome(
             {
                 "path": str(signals.path),
                 "suffix": signals.suffix,
@@ -202,7 +214,15 @@ class ConversionRouter:
             }
         )
 
-        suffix_stats = self._historical_stats.setdefault(signals.suffix, {})
-        observed = 1.0 if success and error is None else 0.0
-        previous = suffix_stats.get(converter_name, 0.5)
-        suffix_stats[converter_name] = round((previous * 0.7) + (observed * 0.3), 3)
+    def merge_telemetry(self, entries: list[dict[str, Any]]) -> None:
+        """Replay outcomes recorded by another router (e.g. in a worker process)."""
+
+        for entry in entries:
+            self._apply_outcome(dict(entry))
+
+    def _apply_outcome(self, entry: dict[str, Any]) -> None:
+        self.telemetry.append(entry)
+        suffix_stats = self._historical_stats.setdefault(entry["suffix"], {})
+        observed = 1.0 if entry["success"] and entry["error"] is None else 0.0
+        previous = suffix_stats.get(entry["converter"], 0.5)
+        suffix_stats[entry["converter"]] = round((previous * 0.7) + (observed * 0.3), 3)
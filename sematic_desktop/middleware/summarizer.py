@@ -8,11 +8,41 @@ import re
 from dataclasses import dataclass
 from typing import Any, Sequence
 
+from .caching import CacheStats, TieredCache, content_key
 from .ollama import OllamaClient
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["MarkdownSummary", "MarkdownSummarizer"]
+__all__ = [
+    "SUMMARY_PROMPT_VERSION",
+    "SUMMARY_SCHEMA",
+    "MarkdownSummary",
+    "MarkdownSummarizer",
+]
+
+SUMMARY_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "description": {"type": "string"},
+        "tags": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["description", "tags"],
+}
+
+
+def _summary_prompt(content: str) -> str:
+    instructions = (
+        "You are an assistant that distills markdown documents. "
+        "Read the content and respond with compact JSON that matches:\n"
+        '{\n  "description": "2-3 sentence summary",\n'
+        '  "tags": ["noun phrase 1", "noun phrase 2"]\n}\n'
+        "Prefer 3-8 lower-case noun tags without punctuation. Do not explain the JSON."
+    )
+    return f"{instructions}\n\n<<<CONTENT START>>>\n{content}\n<<<CONTENT END>>>"
+
+
+# Derived from the prompt and schema so any edit to either invalidates cached summaries.
+SUMMARY_PROMPT_VERSION = content_key(_summary_prompt(""), json.dumps(SUMMARY_SCHEMA))[:12]
 
 
 @dataclass(slots=True)
@@ -24,7 +54,15 @@ class MarkdownSummary:
 
 
 class MarkdownSummarizer:
-    """Use ``gemma3:4b-it-qat`` to summarize markdown and generate tags."""
+    """Use ``gemma3:4b-it-qat`` to summarize markdown and generate tags.
+
+    Requests pass ``SUMMARY_SCHEMA`` as the output format, so the HTTP backend returns
+    plain JSON; the brace extraction only matters for free-form CLI output.
+
+    With a ``cache`` (opened with ``namespace=summarizer.cache_namespace``), results
+    are stored under the hash of the markdown plus the model, prompt version, and
+    ``max_chars``, so identical documents are summarized once.
+    """
 
     def __init__(
         self,
@@ -32,37 +70,50 @@ class MarkdownSummarizer:
         client: OllamaClient | None = None,
         model: str = "gemma3:4b-it-qat",
         max_chars: int = 12_000,
+        cache: TieredCache | None = None,
     ) -> None:
         self.client = client or OllamaClient()
         self.model = model
         self.max_chars = max_chars
+        self.cache = cache
+
+    @property
+    def cache_namespace(self) -> str:
+        """Namespace covering every setting that changes the summary of a text."""
+
+        return f"{self.model}|{SUMMARY_PROMPT_VERSION}|{self.max_chars}"
+
+    def cache_stats(self) -> CacheStats | None:
+        return self.cache.stats() if self.cache is not None else None
 
     def summarize(self, markdown_text: str) -> MarkdownSummary:
         """Return a concise description and tags for the document."""
         text = markdown_text.strip()
         if not text:
             raise ValueError("Markdown content is empty.")
+        key = content_key(self.cache_namespace, text)
+        if self.cache is not None:
+            cached = self.cache.get_many([key]).get(key)
+            if cached is not None:
+                payload = json.loads(cached)
+                return MarkdownSummary(description=payload["description"], tags=payload["tags"])
         prompt = self._build_prompt(text)
-        response = self.client.generate(self.model, prompt)
+        response = self.client.generate(self.model, prompt, format=SUMMARY_SCHEMA)
         payload = self._parse_response(response)
         description = (payload.get("description") or payload.get("summary") or "").strip()
         if not description:
             raise ValueError("Ollama response did not include a description.")
         tags = self._normalize_tags(payload.get("tags", []))
+        if self.cache is not None:
+            record = {"description": description, "tags": tags}
+            self.cache.put_many({key: json.dumps(record).encode("utf-8")})
         return MarkdownSummary(description=description, tags=tags)
 
     def _build_prompt(self, markdown_text: str) -> str:
         content = markdown_text
         if len(content) > self.max_chars:
             content = content[: self.max_chars]
-        instructions = (
-            "You are an assistant that distills markdown documents. "
-            "Read the content and respond with compact JSON that matches:\n"
-            '{\n  "description": "2-3 sentence summary",\n'
-            '  "tags": ["noun phrase 1", "noun phrase 2"]\n}\n'
-            "Prefer 3-8 lower-case noun tags without punctuation. Do not explain the JSON."
-        )
-        return f"{instructions}\n\n<<<CONTENT START>>>\n{content}\n<<<CONTENT END>>>"
+        return _summary_prompt(content)
 
     def _parse_response(self, response: str) -> dict[str, Any]:
         raw = response.strip()
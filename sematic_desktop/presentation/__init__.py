@@ -1,6 +1,14 @@
 """Presentation helpers for CLI + future GUI surfaces."""
 
-from .index_cli import run_indexing_cli
+from .index_cli import run_indexing_cli, run_watch_cli
+from .maintenance_cli import (
+    print_maintenance_results,
+    print_normalize_results,
+    print_prune_result,
+    run_maintenance_cli,
+    run_normalize_cli,
+    run_prune_cli,
+)
 from .search_cli import (
     build_search_engine,
     print_property_examples,
@@ -12,10 +20,17 @@ from .search_cli import (
 
 __all__ = [
     "build_search_engine",
+    "print_maintenance_results",
+    "print_normalize_results",
     "print_property_examples",
+    "print_prune_result",
     "print_rag_answer",
     "print_tag_search",
     "query_properties",
     "resolve_metadata_folder",
     "run_indexing_cli",
+    "run_maintenance_cli",
+    "run_normalize_cli",
+    "run_prune_cli",
+    "run_watch_cli",
 ]
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import threading
 from pathlib import Path
 from typing import Iterable
 
 from sematic_desktop.services.indexing import build_markdown_index
+from sematic_desktop.services.watch import FolderWatcher
 
-__all__ = ["run_indexing_cli", "print_index_results"]
+__all__ = ["run_indexing_cli", "run_watch_cli", "print_index_results"]
 
 
 def run_indexing_cli(folder: Path | str = "./my_folder", **kwargs) -> list[Path]:
@@ -15,6 +17,20 @@ def run_indexing_cli(folder: Path | str = "./my_folder", **kwargs) -> list[Path]
     return build_markdown_index(folder, **kwargs)
 
 
+def run_watch_cli(
+    folder: Path | str = "./my_folder",
+    *,
+    stop_event: threading.Event | None = None,
+    **kwargs,
+) -> None:
+    """Index ``folder`` and keep reindexing changed files until interrupted."""
+    watcher = FolderWatcher(folder, **kwargs)
+    try:
+        watcher.run(stop_event)
+    except KeyboardInterrupt:
+        watcher.close()
+
+
 def print_index_results(paths: Iterable[Path]) -> None:
     """Render CLI-friendly output for indexed files."""
     paths = list(paths)
@@ -0,0 +1,101 @@
+"""CLI helpers for migrating and maintaining existing Lance indexes."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+
+from sematic_desktop.services.indexing import prune_index
+from sematic_desktop.services.maintenance import (
+    PruneResult,
+    TableMaintenance,
+    backfill_markdown_content,
+    maintain_index_tables,
+    normalize_embedding_tables,
+)
+
+__all__ = [
+    "print_content_backfill_result",
+    "print_maintenance_results",
+    "print_normalize_results",
+    "print_prune_result",
+    "run_content_backfill_cli",
+    "run_maintenance_cli",
+    "run_normalize_cli",
+    "run_prune_cli",
+]
+
+
+def run_normalize_cli(metadata_folder: Path, *, batch_size: int = 10_000) -> dict[str, int]:
+    """Backfill unit-length vectors for the embedding tables under ``metadata_folder``."""
+    return normalize_embedding_tables(metadata_folder, batch_size=batch_size)
+
+
+def print_normalize_results(results: dict[str, int]) -> None:
+    """Render CLI-friendly output for the normalization backfill."""
+    if not any(results.values()):
+        print("Embedding tables already store unit-length vectors.")
+        return
+    print("Normalized embedding tables:")
+    for table_name, count in results.items():
+        print(f"- {table_name}: {count} rows rewritten")
+
+
+def run_content_backfill_cli(metadata_folder: Path, *, batch_size: int = 10_000) -> int:
+    """Store the markdown content of records indexed before it was kept in Lance."""
+    return backfill_markdown_content(metadata_folder, batch_size=batch_size)
+
+
+def print_content_backfill_result(count: int) -> None:
+    """Render how many metadata records received their markdown content."""
+    if not count:
+        print("Metadata records already store their markdown content.")
+        return
+    print(f"Backfilled markdown content: {count} records")
+
+
+def run_maintenance_cli(
+    metadata_folder: Path, *, retention_days: float = 7
+) -> list[TableMaintenance]:
+    """Compact and prune the Lance tables under ``metadata_folder``."""
+    return maintain_index_tables(metadata_folder, retention=timedelta(days=retention_days))
+
+
+def print_maintenance_results(results: list[TableMaintenance]) -> None:
+    """Render per-table stats before and after compaction."""
+    print(f"{'table':<12} {'rows':>9} {'fragments':>15} {'versions':>13} {'size':>21}")
+    for result in results:
+        before, after = result.before, result.after
+        print(
+            f"{result.table_name:<12} {after.rows:>9} "
+            f"{before.fragments:>6} -> {after.fragments:<6} "
+            f"{before.versions:>5} -> {after.versions:<5} "
+            f"{_format_bytes(before.bytes):>9} -> {_format_bytes(after.bytes):<9}"
+        )
+
+
+def run_prune_cli(
+    folder: Path, *, output_root: Path | None = None, metadata_root: Path | None = None
+) -> PruneResult:
+    """Remove index rows and markdown whose source file under ``folder`` is gone."""
+    return prune_index(folder, output_root=output_root, metadata_root=metadata_root)
+
+
+def print_prune_result(result: PruneResult) -> None:
+    """Render how many orphans were removed from each table and the markdown tree."""
+    if not result.total:
+        print("No orphaned entries found.")
+        return
+    print("Pruned orphaned entries:")
+    for table_name, count in result.removed_rows.items():
+        print(f"- {table_name}: {count} sources")
+    print(f"- markdown: {len(result.removed_markdown)} files")
+
+
+def _format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
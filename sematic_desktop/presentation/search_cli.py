@@ -10,6 +10,8 @@ from sematic_desktop.services.search import SemanticSearchEngine
 
 __all__ = [
     "build_search_engine",
+    "print_chunk_search",
+    "print_hybrid_search",
     "print_property_examples",
     "print_rag_answer",
     "print_tag_search",
@@ -95,12 +97,54 @@ def print_tag_search(engine: SemanticSearchEngine, *, query: str, top_k: int) ->
         print(f"- {hit.source_path} | tag={tag} | score={hit.score:.3f}")
 
 
-def print_rag_answer(engine: SemanticSearchEngine, *, question: str, top_k: int) -> None:
+def print_chunk_search(engine: SemanticSearchEngine, *, query: str, top_k: int) -> None:
+    query = query.strip()
+    if not query:
+        print("Passage search skipped: empty query.")
+        return
+    hits = engine.search_chunks(query, top_k=top_k)
+    if not hits:
+        print(f"No matching passages found for '{query}'.")
+        return
+    print(f"Passage matches for '{query}':")
+    for hit in hits:
+        print(f"- {hit.source_path} | score={hit.score:.3f}")
+        for chunk in hit.chunks:
+            heading = chunk.heading or "-"
+            print(
+                f"    chunk {chunk.chunk_index} (bytes {chunk.start}-{chunk.end}) | "
+                f"section={heading} | score={chunk.score:.3f}"
+            )
+
+
+def print_hybrid_search(
+    engine: SemanticSearchEngine, *, query: str, top_k: int, lexical_only: bool = False
+) -> None:
+    query = query.strip()
+    if not query:
+        print("Keyword search skipped: empty query.")
+        return
+    if lexical_only:
+        hits = engine.search_lexical(query, top_k=top_k)
+    else:
+        hits = engine.search_hybrid(query, top_k=top_k)
+    label = "Lexical" if lexical_only else "Hybrid"
+    if not hits:
+        print(f"No {label.lower()} matches found for '{query}'.")
+        return
+    print(f"{label} matches for '{query}':")
+    for hit in hits:
+        print(f"- {hit.source_path} | score={hit.score:.4f}")
+
+
+def print_rag_answer(
+    engine: SemanticSearchEngine, *, question: str, top_k: int, token_budget: int | None = None
+) -> None:
     question = question.strip()
     if not question:
         print("RAG example skipped: empty question.")
         return
-    payload = engine.answer_question(question, top_k=top_k)
+    payload = engine.answer_question(question, top_k=top_k, token_budget=token_budget)
     answer = payload.get("answer", "")
     hits = payload.get("hits", [])
     print(f"RAG answer for '{question}':\n{answer}\n")
@@ -110,11 +154,20 @@ def print_rag_answer(engine: SemanticSearchEngine, *, question: str, top_k: int)
     print("Supporting documents:")
     for hit in hits:
         print(f"- {hit.source_path} | score={hit.score:.3f}")
+    contexts = payload.get("contexts", [])
+    if contexts:
+        size = sum(len(context.get("content", "")) for context in contexts)
+        print(f"Prompt context: {size} characters from {len(contexts)} document(s).")
 
 
-def build_search_engine(metadata_folder: Path) -> SemanticSearchEngine:
+def build_search_engine(
+    metadata_folder: Path, *, resident_cache_max_bytes: int | None = None
+) -> SemanticSearchEngine:
     metadata_store = LanceMetadataStore(metadata_folder, "properties")
     embedding_store = LanceEmbeddingStore(
-        metadata_folder, doc_table_name="emb_doc", tag_table_name="emb_tags"
+        metadata_folder,
+        doc_table_name="emb_doc",
+        tag_table_name="emb_tags",
+        resident_cache_max_bytes=resident_cache_max_bytes,
     )
     return SemanticSearchEngine(metadata_store, embedding_store)
@@ -7,17 +7,43 @@ from .indexing import (
     MarkdownIndexService,
     build_markdown_index,
     list_files,
+    prune_index,
+    scan_files,
 )
-from .search import ContextAnswerer, SearchHit, SemanticSearchEngine
+from .maintenance import (
+    PruneResult,
+    TableMaintenance,
+    compact_stores,
+    maintain_index_tables,
+    normalize_embedding_tables,
+    prune_orphans,
+)
+from .manifest import ManifestDiff, ManifestEntry, diff_manifest, hash_file
+from .search import ChunkMatch, ContextAnswerer, SearchHit, SemanticSearchEngine
+from .watch import FolderWatcher
 
 __all__ = [
+    "ChunkMatch",
     "ContextAnswerer",
     "DEFAULT_EXTENSIONS",
     "DEFAULT_MARKDOWN_ROOT",
     "DEFAULT_METADATA_ROOT",
+    "FolderWatcher",
+    "ManifestDiff",
+    "ManifestEntry",
     "MarkdownIndexService",
+    "PruneResult",
     "SearchHit",
     "SemanticSearchEngine",
+    "TableMaintenance",
     "build_markdown_index",
+    "compact_stores",
+    "diff_manifest",
+    "hash_file",
     "list_files",
+    "maintain_index_tables",
+    "normalize_embedding_tables",
+    "prune_index",
+    "prune_orphans",
+    "scan_files",
 ]
@@ -4,24 +4,48 @@ from __future__ import annotations
 
 import logging
 import mimetypes
-from dataclasses import dataclass
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from glob import glob
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from typing import Any, Callable, Iterable, Protocol, Sequence
+from typing import Any, Callable, Iterable, Iterator, Mapping, Protocol, Sequence
 
-from sematic_desktop.data import LanceEmbeddingStore, LanceMetadataStore
+from sematic_desktop.data import LanceEmbeddingStore, LanceManifestStore, LanceMetadataStore
 from sematic_desktop.foundation.conversion import (
     build_conversion_plan,
     convert_with_docling,
     convert_with_markitdown,
 )
+from sematic_desktop.foundation.file_scan import DEFAULT_EXCLUDED_DIRS, FileScanner, ScannedFile
 from sematic_desktop.middleware import (
+    CachedEmbeddingClient,
+    CacheStats,
     ConversionRouter,
+    EmbeddingBatcher,
     EmbeddingGemmaClient,
+    MarkdownChunker,
     MarkdownSummarizer,
+    MarkdownSummary,
+    TieredCache,
     gather_file_signals,
 )
+from sematic_desktop.services.maintenance import PruneResult, compact_stores, prune_orphans
+from sematic_desktop.services.manifest import ManifestDiff, ManifestEntry, diff_manifest
 
 try:  # pragma: no cover - tqdm is optional during tests.
     from tqdm import tqdm
@@ -60,18 +84,26 @@ DEFAULT_EXTENSIONS: tuple[str, ...] = (
 
 DEFAULT_MARKDOWN_ROOT = ".semantic_index/markdown"
 DEFAULT_METADATA_ROOT = ".semantic_index/metadata"
+EMBEDDING_CACHE_FILE = "embedding_cache.sqlite3"
+SUMMARY_CACHE_FILE = "summary_cache.sqlite3"
 
 __all__ = [
     "DEFAULT_EXTENSIONS",
     "DEFAULT_MARKDOWN_ROOT",
     "DEFAULT_METADATA_ROOT",
+    "BufferedPersistenceService",
+    "ConversionStage",
+    "EnrichmentStage",
     "EmbeddingPersistenceService",
     "IndexingPipeline",
     "IndexingTask",
     "MarkdownIndexService",
     "MetadataPersistenceService",
+    "QueueStats",
     "build_markdown_index",
     "list_files",
+    "prune_index",
+    "scan_files",
 ]
 
 
@@ -85,36 +117,53 @@ def list_files(
     folder: Path | str, *, allowed_extensions: Iterable[str] | None = None
 ) -> list[Path]:
     """Return indexed files contained within ``folder``."""
+    return [scanned.path for scanned in scan_files(folder, allowed_extensions=allowed_extensions)]
+
+
+def scan_files(
+    folder: Path | str,
+    *,
+    allowed_extensions: Iterable[str] | None = None,
+    excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS,
+    workers: int | None = None,
+) -> list[ScannedFile]:
+    """Return indexed files within ``folder`` with the stat taken while listing them.
+
+    Files are discovered by ``FileScanner``: ``excluded_dirs``, hidden entries, and
+    paths matched by ``.gitignore``/``.semanticignore`` files are skipped, and only
+    files with an allowed extension are stat'ed.
+    """
     base_path = Path(folder).expanduser().resolve()
     if not base_path.exists():
         raise ValueError(f"Folder {base_path} does not exist.")
     if not base_path.is_dir():
         raise ValueError(f"Path {base_path} is not a directory.")
 
-    allowed = (
-        _normalized_extensions(tuple(allowed_extensions))
-        if allowed_extensions is not None
-        else set(DEFAULT_EXTENSIONS)
+    scanner = FileScanner(
+        extensions=_allowed_extensions(allowed_extensions),
+        excluded_dirs=excluded_dirs,
+        workers=workers,
     )
+    return scanner.scan(base_path)
 
-    pattern = str(base_path / "**" / "*")
-    files = []
-    for entry in glob(pattern, recursive=True):
-        path = Path(entry)
-        if path.is_file():
-            if not allowed or path.suffix.lower() in allowed:
-                files.append(path)
 
-    files.sort()
-    return files
+def _allowed_extensions(allowed_extensions: Iterable[str] | None) -> set[str]:
+    if allowed_extensions is None:
+        return set(DEFAULT_EXTENSIONS)
+    return _normalized_extensions(tuple(allowed_extensions))
 
 
 @dataclass(slots=True)
 class IndexingTask:
-    """Simple data structure describing a file slated for indexing."""
+    """Simple data structure describing a file slated for indexing.
+
+    ``stat`` is the result taken when the file was discovered, reused for routing and
+    metadata so each file is stat'ed once per run.
+    """
 
     source_path: Path
     destination_path: Path
+    stat: os.stat_result | None = None
 
 
 @dataclass(slots=True)
@@ -148,6 +197,7 @@ class IndexingContext:
     router: ConversionRouter
     markitdown_converter: Any | None
     docling_converter: Any | None
+    chunker: MarkdownChunker | None = None
 
 
 class PipelineStage(Protocol):
@@ -156,28 +206,195 @@ class PipelineStage(Protocol):
     def run(self, items: Iterable[Any], context: IndexingContext) -> Iterable[Any]: ...
 
 
+@dataclass(slots=True)
+class QueueStats:
+    """Fill levels observed on one bounded queue of a pipelined run.
+
+    A queue that stays near ``capacity`` means the stage reading from it is the
+    bottleneck; one that stays near empty means the stage feeding it is.
+    """
+
+    name: str
+    capacity: int
+    samples: int = 0
+    total_fill: int = 0
+    peak: int = 0
+
+    @property
+    def mean_fill(self) -> float:
+        return self.total_fill / self.samples if self.samples else 0.0
+
+    def observe(self, size: int) -> None:
+        self.samples += 1
+        self.total_fill += size
+        self.peak = max(self.peak, size)
+
+
+class _PipelineAborted(Exception):
+    """Raised inside pipeline threads once another stage has failed."""
+
+
+_END_OF_STREAM = object()
+
+
+class _StageQueue:
+    """Bounded hand-off between two pipeline threads that can be aborted."""
+
+    def __init__(self, name: str, capacity: int) -> None:
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=capacity)
+        self._aborted = threading.Event()
+        self.stats = QueueStats(name=name, capacity=capacity)
+
+    def abort(self) -> None:
+        self._aborted.set()
+
+    def put(self, item: Any) -> None:
+        while True:
+            if self._aborted.is_set():
+                raise _PipelineAborted
+            try:
+                self._queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            self.stats.observe(self._queue.qsize())
+            return
+
+    def close(self) -> None:
+        self.put(_END_OF_STREAM)
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            if self._aborted.is_set():
+                raise _PipelineAborted
+            try:
+                item = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _END_OF_STREAM:
+                return
+            yield item
+
+
 class IndexingPipeline:
-    """Composable pipeline that chains together small indexing stages."""
+    """Composable pipeline that chains together small indexing stages.
 
-    def __init__(self, stages: Sequence[PipelineStage]) -> None:
+    By default stages are chained generators, so only one runs at a time. With
+    ``pipelined=True`` each stage runs in its own thread, connected by queues of
+    ``queue_size`` items that block fast producers. When a stage fails, the stages
+    upstream of it are aborted while the ones downstream finish the items they
+    already received (so the persistence flush still runs), and the first error is
+    re-raised from ``run``. Queue fill levels for the last run are kept in
+    ``queue_stats``.
+    """
+
+    def __init__(
+        self, stages: Sequence[PipelineStage], *, pipelined: bool = False, queue_size: int = 8
+    ) -> None:
         self.stages = list(stages)
+        self.pipelined = pipelined
+        self.queue_size = max(1, queue_size)
+        self.queue_stats: list[QueueStats] = []
 
     def run(self, items: Iterable[Any], context: IndexingContext) -> list[Any]:
+        if self.pipelined:
+            return self._run_pipelined(items, context)
         data: Iterable[Any] = items
         for stage in self.stages:
             data = stage.run(data, context)
         return list(data)
 
+    def _run_pipelined(self, items: Iterable[Any], context: IndexingContext) -> list[Any]:
+        errors: list[BaseException] = []
+        names = [type(stage).__name__ for stage in self.stages]
+        queues = [_StageQueue(f"{name} input", self.queue_size) for name in names]
+        queues.append(_StageQueue("output", self.queue_size))
+
+        def produce(source: Iterable[Any], position: int) -> None:
+            # Items from ``source`` go into ``queues[position]``.
+            outbox = queues[position]
+            try:
+                for item in source:
+                    outbox.put(item)
+            except _PipelineAborted:
+                return
+            except BaseException as exc:  # re-raised by ``run`` below.
+                errors.append(exc)
+                for upstream in queues[:position]:
+                    upstream.abort()
+            try:
+                outbox.close()
+            except _PipelineAborted:
+                pass
+
+        threads = [
+            threading.Thread(target=produce, args=(items, 0), name="pipeline-feed", daemon=True)
+        ]
+        for index, stage in enumerate(self.stages):
+            threads.append(
+                threading.Thread(
+                    target=produce,
+                    args=(stage.run(queues[index], context), index + 1),
+                    name=f"pipeline-{names[index]}",
+                    daemon=True,
+                )
+            )
+        for thread in threads:
+            thread.start()
+        results: list[Any] = []
+        try:
+            results.extend(queues[-1])
+        except BaseException:
+            for stage_queue in queues:
+                stage_queue.abort()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+            self.queue_stats = [stage_queue.stats for stage_queue in queues]
+        for stats in self.queue_stats:
+            logger.info(
+                "Queue %s: mean fill %.1f/%d, peak %d",
+                stats.name,
+                stats.mean_fill,
+                stats.capacity,
+                stats.peak,
+            )
+        if errors:
+            raise errors[0]
+        return results
+
 
 class ConversionStage:
-    """Turn ``IndexingTask`` instances into ``ConvertedDocument`` objects."""
+    """Turn ``IndexingTask`` instances into ``ConvertedDocument`` objects.
+
+    With ``workers > 1`` files are converted in a process pool whose workers each keep
+    their own MarkItDown/Docling instances warm. At most ``max_in_flight`` files
+    (default: twice the worker count) are submitted at once, documents are yielded in
+    completion order, and the routing outcomes each worker records are merged back
+    into ``context.router``.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 1,
+        max_in_flight: int | None = None,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_in_flight = max(1, max_in_flight or self.workers * 2)
+        self.mp_context = mp_context
 
     def run(
         self, items: Iterable[IndexingTask], context: IndexingContext
     ) -> Iterable[ConvertedDocument]:
+        if self.workers > 1:
+            yield from self._run_parallel(items, context)
+            return
         for task in items:
             markdown_text, converter_name = convert_to_markdown(
                 task.source_path,
+                stat=task.stat,
                 router=context.router,
                 markitdown_converter=context.markitdown_converter,
                 docling_converter=context.docling_converter,
@@ -186,52 +403,311 @@ class ConversionStage:
                 task=task, markdown_text=markdown_text, converter_name=converter_name
             )
 
+    def _run_parallel(
+        self, items: Iterable[IndexingTask], context: IndexingContext
+    ) -> Iterable[ConvertedDocument]:
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self.mp_context or multiprocessing.get_context("spawn"),
+            initializer=_init_conversion_worker,
+            initargs=(
+                context.router.clone(),
+                context.markitdown_converter,
+                context.docling_converter,
+            ),
+        )
+        pending: dict[Future[_WorkerConversion], IndexingTask] = {}
+        remaining = iter(items)
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_in_flight:
+                    task = next(remaining, None)
+                    if task is None:
+                        exhausted = True
+                        break
+                    future = executor.submit(_convert_in_worker, task.source_path, task.stat)
+                    pending[future] = task
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                finished = [(pending.pop(future), future.result()) for future in done]
+                for _, result in finished:
+                    context.router.merge_telemetry(result.telemetry)
+                for task, result in finished:
+                    if result.error is not None:
+                        raise RuntimeError(result.error)
+                    yield ConvertedDocument(
+                        task=task,
+                        markdown_text=result.markdown_text,
+                        converter_name=result.converter_name,
+                    )
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+@dataclass(slots=True)
+class _WorkerConversion:
+    """Outcome of converting one file inside a worker process."""
+
+    markdown_text: str = ""
+    converter_name: str = ""
+    telemetry: list[dict[str, Any]] = field(default_factory=list)
+    error: str | None = None
+
+
+_worker_router: ConversionRouter | None = None
+_worker_converters: tuple[Any | None, Any | None] = (None, None)
+
+
+def _init_conversion_worker(
+    router: ConversionRouter, markitdown_converter: Any | None, docling_converter: Any | None
+) -> None:
+    """Build the converters once per worker process so every file reuses them."""
+
+    global _worker_router, _worker_converters
+    if markitdown_converter is None and _MarkItDownClass is not None:
+        markitdown_converter = _MarkItDownClass()
+    if docling_converter is None and _DoclingConverterClass is not None:
+        docling_converter = _DoclingConverterClass()
+    _worker_router = router
+    _worker_converters = (markitdown_converter, docling_converter)
+
+
+def _convert_in_worker(source_path: Path, stat: os.stat_result | None = None) -> _WorkerConversion:
+    router = _worker_router if _worker_router is not None else ConversionRouter()
+    router.telemetry.clear()
+    markitdown_converter, docling_converter = _worker_converters
+    try:
+        markdown_text, converter_name = convert_to_markdown(
+            source_path,
+            stat=stat,
+            router=router,
+            markitdown_converter=markitdown_converter,
+            docling_converter=docling_converter,
+        )
+    except Exception as exc:
+        return _WorkerConversion(telemetry=list(router.telemetry), error=str(exc))
+    return _WorkerConversion(markdown_text, converter_name, list(router.telemetry))
+
 
 class EnrichmentStage:
-    """Attach metadata + embeddings to converted documents."""
+    """Attach metadata + embeddings to converted documents.
+
+    With ``generation_concurrency``/``embedding_concurrency`` above one, documents are
+    enriched on a thread pool so several Ollama requests stay in flight. The limits
+    cap concurrent summarization and embedding calls separately, and each document is
+    still summarized before it is embedded. Documents are yielded in input order, and
+    a failure in one document's summary or embeddings only affects that document. A
+    document whose enrichment raises is logged and skipped, so it is neither persisted
+    nor recorded in the manifest and the next run retries it.
+    """
+
+    def __init__(self, *, generation_concurrency: int = 1, embedding_concurrency: int = 1) -> None:
+        self.generation_concurrency = max(1, generation_concurrency)
+        self.embedding_concurrency = max(1, embedding_concurrency)
 
     def run(
         self, items: Iterable[ConvertedDocument], context: IndexingContext
     ) -> Iterable[EnrichedDocument]:
-        for converted in items:
-            metadata = build_metadata_record(
-                source_file=converted.task.source_path,
-                destination=converted.task.destination_path,
-                converter_name=converted.converter_name,
-            )
-            embeddings = enrich_document(
-                metadata=metadata,
-                markdown_text=converted.markdown_text,
-                summarizer=context.summarizer,
-                embedding_client=context.embedding_client,
-                source_file=converted.task.source_path,
-            )
-            yield EnrichedDocument(converted=converted, metadata=metadata, embeddings=embeddings)
+        if self.generation_concurrency == 1 and self.embedding_concurrency == 1:
+            for converted in items:
+                enriched = self._try_enrich(converted, context)
+                if enriched is not None:
+                    yield enriched
+            return
+        yield from self._run_concurrent(items, context)
+
+    def _run_concurrent(
+        self, items: Iterable[ConvertedDocument], context: IndexingContext
+    ) -> Iterable[EnrichedDocument]:
+        generation_slots = threading.BoundedSemaphore(self.generation_concurrency)
+        embedding_slots = threading.BoundedSemaphore(self.embedding_concurrency)
+        max_in_flight = self.generation_concurrency + self.embedding_concurrency
+        pending: deque[Future[EnrichedDocument | None]] = deque()
+        with ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="enrichment"
+        ) as executor:
+            try:
+                for converted in items:
+                    pending.append(
+                        executor.submit(
+                            self._try_enrich,
+                            converted,
+                            context,
+                            generation_slots=generation_slots,
+                            embedding_slots=embedding_slots,
+                        )
+                    )
+                    if len(pending) >= max_in_flight:
+                        enriched = pending.popleft().result()
+                        if enriched is not None:
+                            yield enriched
+                while pending:
+                    enriched = pending.popleft().result()
+                    if enriched is not None:
+                        yield enriched
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @classmethod
+    def _try_enrich(
+        cls,
+        converted: ConvertedDocument,
+        context: IndexingContext,
+        **slots: threading.BoundedSemaphore,
+    ) -> EnrichedDocument | None:
+        try:
+            return cls._enrich(converted, context, **slots)
+        except Exception:
+            logger.exception("Enriching %s failed; skipping it", converted.task.source_path)
+            return None
+
+    @staticmethod
+    def _enrich(
+        converted: ConvertedDocument,
+        context: IndexingContext,
+        *,
+        generation_slots: threading.BoundedSemaphore | None = None,
+        embedding_slots: threading.BoundedSemaphore | None = None,
+    ) -> EnrichedDocument:
+        source_file = converted.task.source_path
+        metadata = build_metadata_record(
+            source_file=source_file,
+            destination=converted.task.destination_path,
+            converter_name=converted.converter_name,
+            stat=converted.task.stat,
+        )
+        embeddings = enrich_document(
+            metadata,
+            converted.markdown_text,
+            summarizer=context.summarizer,
+            embedding_client=context.embedding_client,
+            source_file=source_file,
+            chunker=context.chunker,
+            generation_slots=generation_slots,
+            embedding_slots=embedding_slots,
+        )
+        return EnrichedDocument(converted=converted, metadata=metadata, embeddings=embeddings)
 
 
-class MetadataPersistenceService:
-    """Wrap Lance metadata writes so they can be swapped or reused."""
+class BufferedPersistenceService(ABC):
+    """Collect writes in memory and persist them as one batch.
 
-    def __init__(self, store: LanceMetadataStore) -> None:
+    A flush happens once ``batch_size`` writes are buffered, when a write arrives more
+    than ``flush_interval`` seconds after the oldest buffered one, on ``flush()``, and
+    when the service is used as a context manager and the block exits (including
+    on exceptions), so nothing buffered is lost.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int,
+        flush_interval: float | None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._pending: list[dict[str, Any]] = []
+        self._pending_writes = 0
+        self._oldest_write: float | None = None
+
+    def __enter__(self) -> BufferedPersistenceService:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.flush()
+
+    def flush(self) -> None:
+        """Persist everything buffered so far."""
+
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self._pending_writes = 0
+        self._oldest_write = None
+        self._persist(pending)
+
+    def _buffer(self, records: Iterable[dict[str, Any]]) -> None:
+        now = self._clock()
+        if self._oldest_write is None:
+            self._oldest_write = now
+        self._pending.extend(records)
+        self._pending_writes += 1
+        if self._pending_writes >= self.batch_size or self._interval_elapsed(now):
+            self.flush()
+
+    def _interval_elapsed(self, now: float) -> bool:
+        if self.flush_interval is None or self._oldest_write is None:
+            return False
+        return now - self._oldest_write >= self.flush_interval
+
+    @abstractmethod
+    def _persist(self, records: list[dict[str, Any]]) -> None:
+        """Write one flushed batch of ``records`` to the backing store."""
+
+
+class MetadataPersistenceService(BufferedPersistenceService):
+    """Wrap Lance metadata writes so they can be swapped or reused.
+
+    Records are buffered and written as a single merge-insert, so a flush of
+    ``batch_size`` documents creates one table version instead of two per file.
+    """
+
+    def __init__(
+        self,
+        store: LanceMetadataStore,
+        *,
+        batch_size: int = 500,
+        flush_interval: float | None = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval, clock=clock)
         self.store = store
 
     def write(self, metadata: dict[str, Any]) -> None:
-        self.store.upsert(metadata)
+        self._buffer([metadata])
+
+    def _persist(self, records: list[dict[str, Any]]) -> None:
+        self.store.upsert_many(records)
+
 
+class EmbeddingPersistenceService(BufferedPersistenceService):
+    """Wrap Lance embedding writes to isolate storage concerns.
 
-class EmbeddingPersistenceService:
-    """Wrap Lance embedding writes to isolate storage concerns."""
+    Embeddings are buffered per document so each batch lands in the doc and tag
+    tables as a single merge-insert commit.
+    """
 
-    def __init__(self, store: LanceEmbeddingStore) -> None:
+    def __init__(
+        self,
+        store: LanceEmbeddingStore,
+        *,
+        batch_size: int = 64,
+        flush_interval: float | None = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval, clock=clock)
         self.store = store
 
     def write_many(self, embeddings: list[dict[str, Any]]) -> None:
         if embeddings:
-            self.store.upsert_many(embeddings)
+            self._buffer(embeddings)
+
+    def _persist(self, records: list[dict[str, Any]]) -> None:
+        self.store.upsert_many(records)
 
 
 class PersistenceStage:
-    """Write markdown artifacts + Lance records to disk."""
+    """Write markdown artifacts + Lance records to disk.
+
+    A document whose embedding failed is skipped: whatever an earlier run stored for
+    it (markdown, metadata, vectors) stays searchable and consistent, and since it is
+    not reported as written its manifest entry is not updated, so the next run retries.
+    """
 
     def __init__(
         self,
@@ -241,33 +717,122 @@ class PersistenceStage:
         self.metadata_service = metadata_service
         self.embedding_service = embedding_service
 
-    def run(self, items: Iterable[EnrichedDocument], _: IndexingContext) -> Iterable[Path]:
-        for document in items:
-            task = document.converted.task
-            task.destination_path.parent.mkdir(parents=True, exist_ok=True)
-            task.destination_path.write_text(document.converted.markdown_text, encoding="utf-8")
-            self.metadata_service.write(document.metadata)
-            self.embedding_service.write_many(document.embeddings)
-            yield task.destination_path
+    def run(self, items: Iterable[EnrichedDocument], context: IndexingContext) -> Iterable[Path]:
+        try:
+            for document in items:
+                task = document.converted.task
+                if context.embedding_client is not None and not any(
+                    record["variant"] == "document" for record in document.embeddings
+                ):
+                    logger.warning(
+                        "Embedding %s failed; keeping its previous index", task.source_path
+                    )
+                    continue
+                task.destination_path.parent.mkdir(parents=True, exist_ok=True)
+                # Chunk offsets index these exact bytes, so newlines are written untranslated.
+                task.destination_path.write_text(
+                    document.converted.markdown_text, encoding="utf-8", newline=""
+                )
+                self.metadata_service.write(document.metadata)
+                self.embedding_service.write_many(document.embeddings)
+                yield task.destination_path
+        finally:
+            self.metadata_service.flush()
+            self.embedding_service.flush()
 
 
 class MarkdownIndexService:
-    """Coordinates conversion, enrichment, and Lance persistence."""
+    """Coordinates conversion, enrichment, and Lance persistence.
+
+    Runs that write at least ``maintenance_min_files`` documents finish by compacting
+    the folder's tables (see ``compact_stores``); pass ``None`` to skip that step.
+    ``conversion_workers > 1`` converts files in that many worker processes, each with
+    its own converters, instead of the parent's instances. ``generation_concurrency``
+    and ``embedding_concurrency`` bound the Ollama requests kept in flight during
+    enrichment; with ``embedding_concurrency > 1`` embedding texts from different
+    documents are coalesced into batches of up to ``embedding_batch_size`` (waiting at
+    most ``embedding_batch_delay`` seconds). ``pipelined=True`` overlaps the stages
+    (see ``IndexingPipeline``) and leaves the queue fill levels of the last run in
+    ``last_queue_stats``.
+
+    Each run diffs the folder against a manifest of (size, mtime, content hash) per
+    file: only new and changed files are converted and embedded again, and files that
+    disappeared have their rows and markdown deleted in bulk. ``last_manifest_diff``
+    holds the comparison of the last run. With ``prune=True`` every run ends by
+    removing rows and markdown left behind by files that no longer exist (see
+    ``prune_orphans``); the outcome is kept in ``last_prune_result``. Files that still
+    exist but the scan no longer lists (a narrower ``allowed_extensions``, a new
+    ignore rule or excluded directory) keep their rows unless ``prune_unlisted=True``.
+
+    Embeddings from ``EmbeddingGemmaClient`` are cached per (model, text) in
+    ``<metadata_root>/embedding_cache.sqlite3``, shared by every indexed folder and
+    capped at ``embedding_cache_bytes`` (``None`` disables the cache); the counters
+    of the last run are left in ``last_embedding_cache_stats``. Summaries from a
+    ``MarkdownSummarizer`` without its own cache are cached the same way in
+    ``summary_cache.sqlite3`` (``summary_cache_bytes``, ``last_summary_cache_stats``).
+
+    Files are discovered with ``scan_files``: directories in ``excluded_dirs`` and
+    paths matched by ignore files are never entered, and top-level subtrees are walked
+    on ``scan_workers`` threads.
+
+    Besides the document and tag vectors, each markdown file is split by ``chunker``
+    (a default ``MarkdownChunker`` unless one is given) and every chunk is embedded
+    with its byte offsets, so searches can point at passages; ``chunk_embeddings=False``
+    turns that off.
+    """
 
     def __init__(
         self,
         *,
         metadata_store_factory: Callable[[Path], LanceMetadataStore] | None = None,
         embedding_store_factory: Callable[[Path], LanceEmbeddingStore] | None = None,
+        manifest_store_factory: Callable[[Path], LanceManifestStore] | None = None,
         router: ConversionRouter | None = None,
         summarizer_factory: Callable[[], MarkdownSummarizer] | None = None,
         embedding_client_factory: Callable[[], EmbeddingGemmaClient] | None = None,
+        maintenance_min_files: int | None = 500,
+        conversion_workers: int = 1,
+        generation_concurrency: int = 1,
+        embedding_concurrency: int = 1,
+        pipelined: bool = False,
+        pipeline_queue_size: int = 8,
+        embedding_batch_size: int = 32,
+        embedding_batch_delay: float = 0.02,
+        embedding_cache_bytes: int | None = 256 * 1024 * 1024,
+        summary_cache_bytes: int | None = 64 * 1024 * 1024,
+        prune: bool = True,
+        prune_unlisted: bool = False,
+        excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS,
+        scan_workers: int | None = None,
+        chunker: MarkdownChunker | None = None,
+        chunk_embeddings: bool = True,
     ) -> None:
         self.metadata_store_factory = metadata_store_factory or _default_metadata_store
         self.embedding_store_factory = embedding_store_factory or _default_embedding_store
+        self.manifest_store_factory = manifest_store_factory or _default_manifest_store
         self.router = router or ConversionRouter()
         self._summarizer_factory = summarizer_factory
         self._embedding_factory = embedding_client_factory
+        self.maintenance_min_files = maintenance_min_files
+        self.conversion_workers = conversion_workers
+        self.generation_concurrency = generation_concurrency
+        self.embedding_concurrency = embedding_concurrency
+        self.pipelined = pipelined
+        self.pipeline_queue_size = pipeline_queue_size
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_batch_delay = embedding_batch_delay
+        self.embedding_cache_bytes = embedding_cache_bytes
+        self.last_embedding_cache_stats: CacheStats | None = None
+        self.summary_cache_bytes = summary_cache_bytes
+        self.last_summary_cache_stats: CacheStats | None = None
+        self.prune = prune
+        self.prune_unlisted = prune_unlisted
+        self.excluded_dirs = frozenset(excluded_dirs)
+        self.scan_workers = scan_workers
+        self.chunker = (chunker or MarkdownChunker()) if chunk_embeddings else None
+        self.last_prune_result: PruneResult | None = None
+        self.last_queue_stats: list[QueueStats] = []
+        self.last_manifest_diff: ManifestDiff | None = None
         self._summarizer: MarkdownSummarizer | None = None
         self._embedding_client: EmbeddingGemmaClient | None = None
         self._markitdown_instance: Any | None = None
@@ -288,37 +853,56 @@ class MarkdownIndexService:
         enable_markdown_summaries: bool = True,
         embedding_client: EmbeddingGemmaClient | None = None,
         enable_embeddings: bool = True,
+        paths: Iterable[Path | str] | None = None,
     ) -> list[Path]:
+        """Index ``folder`` and return the markdown files written by this run.
+
+        ``paths`` restricts the run to those files and directories (e.g. from a file
+        watcher): only they are listed and diffed against the manifest, paths that no
+        longer exist are removed from the index, and the orphan prune is skipped.
+        """
         base_path = Path(folder).expanduser().resolve()
         if not base_path.exists():
             raise ValueError(f"Folder {base_path} does not exist.")
         if not base_path.is_dir():
             raise ValueError(f"Path {base_path} is not a directory.")
 
-        output_root_path = (
-            Path(output_root).expanduser().resolve()
-            if output_root is not None
-            else (base_path.parent / DEFAULT_MARKDOWN_ROOT)
+        target_root, metadata_root_path, metadata_folder = _index_locations(
+            base_path, output_root, metadata_root
         )
-        target_root = output_root_path / base_path.name
         target_root.mkdir(parents=True, exist_ok=True)
-
-        metadata_root_path = (
-            Path(metadata_root).expanduser().resolve()
-            if metadata_root is not None
-            else (base_path.parent / DEFAULT_METADATA_ROOT)
-        )
-        metadata_root_path.mkdir(parents=True, exist_ok=True)
-        metadata_folder = metadata_root_path / base_path.name
         metadata_folder.mkdir(parents=True, exist_ok=True)
         metadata_store = self.metadata_store_factory(metadata_folder)
         embedding_store = self.embedding_store_factory(metadata_folder)
+        manifest_store = self.manifest_store_factory(metadata_folder)
         metadata_service = MetadataPersistenceService(metadata_store)
         embedding_service = EmbeddingPersistenceService(embedding_store)
 
-        files_to_index = list_files(
-            base_path,
-            allowed_extensions=(allowed_extensions if allowed_extensions is not None else []),
+        scanner = FileScanner(
+            extensions=_normalized_extensions(tuple(_build_extensions(allowed_extensions))),
+            excluded_dirs=self.excluded_dirs,
+            workers=self.scan_workers,
+        )
+        if paths is None:
+            scanned = scanner.scan(base_path)
+            files_to_index = [item.path for item in scanned]
+            stats = {item.path: item.stat for item in scanned}
+            diff = diff_manifest(files_to_index, manifest_store.load(), stats=stats)
+        else:
+            files_to_index, stats, diff = self._scoped_diff(
+                base_path, paths, scanner, manifest_store
+            )
+        if not self.prune_unlisted:
+            # Unlisted is not deleted: the file may only have been filtered out.
+            diff.removed = [source for source in diff.removed if not os.path.lexists(source)]
+        self.last_manifest_diff = diff
+        self._remove_sources(
+            diff.removed,
+            base_path=base_path,
+            target_root=target_root,
+            metadata_store=metadata_store,
+            embedding_store=embedding_store,
+            manifest_store=manifest_store,
         )
         summarizer = (
             markdown_summarizer
@@ -339,59 +923,144 @@ class MarkdownIndexService:
             summarizer=summarizer,
             embedding_client=embedding_helper,
             router=router,
-            markitdown_converter=markitdown_converter or self._get_markitdown_converter(),
-            docling_converter=docling_converter or self._get_docling_converter(),
+            markitdown_converter=self._get_markitdown_converter(markitdown_converter),
+            docling_converter=self._get_docling_converter(docling_converter),
+            chunker=self.chunker,
         )
 
-        tasks = self._prepare_tasks(
-            base_path=base_path,
-            files_to_index=files_to_index,
-            target_root=target_root,
-            metadata_service=metadata_service,
-            embedding_service=embedding_service,
-            summarizer=summarizer,
-            embedding_helper=embedding_helper,
-        )
+        embedding_cache = self._get_embedding_cache(metadata_root_path, embedding_helper)
+        if embedding_cache is not None:
+            embedding_helper = self._with_embedding_cache(embedding_helper, embedding_cache)
+            converter_context.embedding_client = embedding_helper
+        summary_cache = self._get_summary_cache(metadata_root_path, summarizer)
+        if summary_cache is not None and isinstance(summarizer, MarkdownSummarizer):
+            summarizer.cache = summary_cache
+        try:
+            with metadata_service, embedding_service:
+                tasks, settled = self._prepare_tasks(
+                    base_path=base_path,
+                    files_to_index=files_to_index,
+                    stats=stats,
+                    target_root=target_root,
+                    diff=diff,
+                    metadata_service=metadata_service,
+                    embedding_service=embedding_service,
+                    summarizer=summarizer,
+                    embedding_helper=embedding_helper,
+                )
 
-        if not tasks:
-            return []
+            if not tasks:
+                manifest_store.upsert_many([entry.as_record() for entry in settled])
+                self._prune_orphans(
+                    files_to_index,
+                    base_path=base_path,
+                    target_root=target_root,
+                    metadata_store=metadata_store,
+                    embedding_store=embedding_store,
+                    manifest_store=manifest_store,
+                    scoped=paths is not None,
+                )
+                _refresh_indexes(metadata_store, embedding_store)
+                return []
 
-        iterable: Iterable[IndexingTask]
-        if show_progress:
-            iterable = tqdm(tasks, desc=f"Indexing {base_path.name}", unit="file", leave=False)
-        else:
-            iterable = tasks
-
-        pipeline = IndexingPipeline(
-            [
-                ConversionStage(),
-                EnrichmentStage(),
-                PersistenceStage(metadata_service, embedding_service),
-            ],
-        )
-        written_files = pipeline.run(iterable, converter_context)
-        written_files.sort()
-        return written_files
+            iterable: Iterable[IndexingTask]
+            if show_progress:
+                iterable = tqdm(tasks, desc=f"Indexing {base_path.name}", unit="file", leave=False)
+            else:
+                iterable = tasks
+
+            pipeline = IndexingPipeline(
+                [
+                    ConversionStage(workers=self.conversion_workers),
+                    EnrichmentStage(
+                        generation_concurrency=self.generation_concurrency,
+                        embedding_concurrency=self.embedding_concurrency,
+                    ),
+                    PersistenceStage(metadata_service, embedding_service),
+                ],
+                pipelined=self.pipelined,
+                queue_size=self.pipeline_queue_size,
+            )
+            batcher = self._get_embedding_batcher(converter_context.embedding_client)
+            if batcher is not None:
+                converter_context.embedding_client = (
+                    batcher
+                    if embedding_cache is None
+                    else self._with_embedding_cache(batcher, embedding_cache)
+                )
+            try:
+                written_files = pipeline.run(iterable, converter_context)
+            finally:
+                self.last_queue_stats = pipeline.queue_stats
+                if batcher is not None:
+                    batcher.close()
+            written = set(written_files)
+            settled.extend(
+                diff.entries[str(task.source_path)]
+                for task in tasks
+                if task.destination_path in written
+            )
+            manifest_store.upsert_many([entry.as_record() for entry in settled])
+            self._prune_orphans(
+                files_to_index,
+                base_path=base_path,
+                target_root=target_root,
+                metadata_store=metadata_store,
+                embedding_store=embedding_store,
+                manifest_store=manifest_store,
+                scoped=paths is not None,
+            )
+            _refresh_indexes(metadata_store, embedding_store)
+            if (
+                self.maintenance_min_files is not None
+                and len(written_files) >= self.maintenance_min_files
+            ):
+                compact_stores(metadata_store, embedding_store)
+            written_files.sort()
+            return written_files
+        finally:
+            if embedding_cache is not None:
+                self.last_embedding_cache_stats = embedding_cache.stats()
+                embedding_cache.close()
+            if summary_cache is not None and isinstance(summarizer, MarkdownSummarizer):
+                self.last_summary_cache_stats = summary_cache.stats()
+                summarizer.cache = None
+                summary_cache.close()
 
     def _prepare_tasks(
         self,
         *,
         base_path: Path,
         files_to_index: list[Path],
+        stats: Mapping[Path, os.stat_result],
         target_root: Path,
+        diff: ManifestDiff,
         metadata_service: MetadataPersistenceService,
         embedding_service: EmbeddingPersistenceService,
         summarizer: MarkdownSummarizer | None,
         embedding_helper: EmbeddingGemmaClient | None,
-    ) -> list[IndexingTask]:
+    ) -> tuple[list[IndexingTask], list[ManifestEntry]]:
+        """Queue new and changed files; backfill or skip the rest.
+
+        Returns the tasks plus the manifest entries that are already settled (files
+        that need no conversion); task entries are recorded once the run succeeds.
+        """
+
         tasks: list[IndexingTask] = []
+        settled = list(diff.refreshed)
+        changed = set(diff.changed)
+        new = set(diff.new)
         skipped = 0
         for source_file in files_to_index:
-            relative_path = source_file.relative_to(base_path)
-            destination = (target_root / relative_path).with_name(relative_path.name + ".md")
-            if destination.exists():
+            destination = _markdown_destination(source_file, base_path, target_root)
+            entry = diff.entries[str(source_file)]
+            if source_file not in changed and _markdown_is_current(destination, entry, new):
+                if source_file in new:
+                    # Indexed before the manifest existed; adopt the existing markdown.
+                    settled.append(entry)
                 if self._backfill_existing(
                     source_file=source_file,
+                    stat=stats.get(source_file),
                     destination=destination,
                     metadata_service=metadata_service,
                     embedding_service=embedding_service,
@@ -400,16 +1069,76 @@ class MarkdownIndexService:
                 ):
                     skipped += 1
                 continue
-            tasks.append(IndexingTask(source_path=source_file, destination_path=destination))
+            tasks.append(
+                IndexingTask(
+                    source_path=source_file,
+                    destination_path=destination,
+                    stat=stats.get(source_file),
+                )
+            )
 
         if skipped:
             logger.info("Skipped %d previously indexed files in %s", skipped, base_path)
-        return tasks
+        if changed:
+            logger.info("Reindexing %d changed files in %s", len(changed), base_path)
+        return tasks, settled
+
+    def _scoped_diff(
+        self,
+        base_path: Path,
+        paths: Iterable[Path | str],
+        scanner: FileScanner,
+        manifest_store: LanceManifestStore,
+    ) -> tuple[list[Path], dict[Path, os.stat_result], ManifestDiff]:
+        inside: list[Path] = []
+        for path in paths:
+            resolved = Path(path).expanduser().resolve()
+            if resolved == base_path or base_path in resolved.parents:
+                inside.append(resolved)
+        scanned, missing = scanner.scan_paths(base_path, inside)
+        files_to_index = [item.path for item in scanned]
+        stats = {item.path: item.stat for item in scanned}
+        previous = manifest_store.fetch([str(path) for path in files_to_index])
+        diff = diff_manifest(files_to_index, previous, stats=stats)
+        if missing:
+            # A vanished path may be a directory, so match everything recorded below it.
+            gone = {str(path) for path in missing}
+            prefixes = tuple(f"{path}{os.sep}" for path in gone)
+            diff.removed = sorted(
+                source
+                for source in manifest_store.sources()
+                if source in gone or source.startswith(prefixes)
+            )
+        return files_to_index, stats, diff
+
+    def _remove_sources(
+        self,
+        removed: list[str],
+        *,
+        base_path: Path,
+        target_root: Path,
+        metadata_store: LanceMetadataStore,
+        embedding_store: LanceEmbeddingStore,
+        manifest_store: LanceManifestStore,
+    ) -> None:
+        if not removed:
+            return
+        metadata_store.delete_sources(removed)
+        embedding_store.delete_sources(removed)
+        for source in removed:
+            try:
+                destination = _markdown_destination(Path(source), base_path, target_root)
+            except ValueError:
+                continue
+            destination.unlink(missing_ok=True)
+        manifest_store.delete_sources(removed)
+        logger.info("Removed %d deleted files from the index of %s", len(removed), base_path)
 
     def _backfill_existing(
         self,
         *,
         source_file: Path,
+        stat: os.stat_result | None,
         destination: Path,
         metadata_service: MetadataPersistenceService,
         embedding_service: EmbeddingPersistenceService,
@@ -420,13 +1149,18 @@ class MarkdownIndexService:
         doc_embedding_exists = embedding_helper is None or embedding_service.store.has_variant(
             source_file, "document"
         )
-        if metadata_exists and doc_embedding_exists:
+        chunks_exist = (
+            embedding_helper is None
+            or self.chunker is None
+            or embedding_service.store.has_variant(source_file, "chunks")
+        )
+        if metadata_exists and doc_embedding_exists and chunks_exist:
             logger.info("Skipping %s (already indexed)", source_file.name)
             return True
 
         logger.info("Backfilling Lance artifacts for %s", source_file.name)
         try:
-            markdown_text = destination.read_text(encoding="utf-8")
+            markdown_text = destination.read_text(encoding="utf-8", newline="")
         except OSError as exc:  # pragma: no cover - best effort.
             logger.warning("Unable to read existing markdown for %s: %s", source_file, exc)
             return True
@@ -435,32 +1169,114 @@ class MarkdownIndexService:
             source_file=source_file,
             destination=destination,
             converter_name="unknown",
+            stat=stat,
         )
+        if metadata_exists and doc_embedding_exists:
+            # Indexed by an older version: add the missing chunks only. Missing markdown
+            # ``content`` is backfilled once by migrate_main.py, not on every run.
+            embedding_service.write_many(
+                generate_chunk_records(
+                    metadata=metadata,
+                    markdown_text=markdown_text,
+                    embedding_client=embedding_helper,
+                    source_file=source_file,
+                    chunker=self.chunker,
+                )
+            )
+            return True
         embeddings = enrich_document(
             metadata,
             markdown_text,
             summarizer=summarizer,
             embedding_client=embedding_helper,
             source_file=source_file,
+            chunker=self.chunker,
         )
         metadata_service.write(metadata)
         embedding_service.write_many(embeddings)
         return True
 
+    def _prune_orphans(
+        self,
+        files: list[Path],
+        *,
+        base_path: Path,
+        target_root: Path,
+        metadata_store: LanceMetadataStore,
+        embedding_store: LanceEmbeddingStore,
+        manifest_store: LanceManifestStore,
+        scoped: bool,
+    ) -> None:
+        # A scoped run only saw some paths, so everything else would look orphaned.
+        if not self.prune or scoped:
+            return
+        self.last_prune_result = prune_orphans(
+            files,
+            base_path=base_path,
+            markdown_root=target_root,
+            metadata_store=metadata_store,
+            embedding_store=embedding_store,
+            manifest_store=manifest_store,
+            prune_unlisted=self.prune_unlisted,
+        )
+
     def _get_markitdown_converter(self, markitdown_converter: Any | None = None) -> Any | None:
-        if markitdown_converter is not None:
+        if markitdown_converter is not None or self.conversion_workers > 1:
             return markitdown_converter
         if self._markitdown_instance is None and _MarkItDownClass is not None:
             self._markitdown_instance = _MarkItDownClass()
         return self._markitdown_instance
 
     def _get_docling_converter(self, docling_converter: Any | None = None) -> Any | None:
-        if docling_converter is not None:
+        if docling_converter is not None or self.conversion_workers > 1:
             return docling_converter
         if self._docling_instance is None and _DoclingConverterClass is not None:
             self._docling_instance = _DoclingConverterClass()
         return self._docling_instance
 
+    def _get_embedding_batcher(self, client: Any | None) -> EmbeddingBatcher | None:
+        # Only concurrent enrichment has texts from several documents to coalesce.
+        if isinstance(client, CachedEmbeddingClient):
+            client = client.client
+        if self.embedding_concurrency <= 1 or not isinstance(client, EmbeddingGemmaClient):
+            return None
+        return EmbeddingBatcher(
+            client,
+            max_batch_size=self.embedding_batch_size,
+            max_delay=self.embedding_batch_delay,
+        )
+
+    def _get_embedding_cache(self, metadata_root: Path, client: Any | None) -> TieredCache | None:
+        if self.embedding_cache_bytes is None or not isinstance(client, EmbeddingGemmaClient):
+            return None
+        return TieredCache(
+            metadata_root / EMBEDDING_CACHE_FILE,
+            namespace=client.model,
+            max_bytes=self.embedding_cache_bytes,
+        )
+
+    def _get_summary_cache(self, metadata_root: Path, summarizer: Any | None) -> TieredCache | None:
+        # A summarizer that brings its own cache keeps it.
+        if (
+            self.summary_cache_bytes is None
+            or not isinstance(summarizer, MarkdownSummarizer)
+            or summarizer.cache is not None
+        ):
+            return None
+        return TieredCache(
+            metadata_root / SUMMARY_CACHE_FILE,
+            namespace=summarizer.cache_namespace,
+            max_bytes=self.summary_cache_bytes,
+            memory_entries=256,
+        )
+
+    @staticmethod
+    def _with_embedding_cache(client: Any, cache: TieredCache) -> CachedEmbeddingClient:
+        model_client = client.client if isinstance(client, EmbeddingBatcher) else client
+        return CachedEmbeddingClient(
+            client, cache, model=model_client.model, max_chars=model_client.max_chars
+        )
+
     def _get_markdown_summarizer(self) -> MarkdownSummarizer | None:
         if self._summarizer is not None:
             return self._summarizer
@@ -504,10 +1320,19 @@ def build_markdown_index(
     enable_markdown_summaries: bool = True,
     embedding_client: EmbeddingGemmaClient | None = None,
     enable_embeddings: bool = True,
+    conversion_workers: int = 1,
+    generation_concurrency: int = 1,
+    embedding_concurrency: int = 1,
+    pipelined: bool = False,
 ) -> list[Path]:
     """Convenience wrapper that instantiates ``MarkdownIndexService``."""
 
-    service = MarkdownIndexService()
+    service = MarkdownIndexService(
+        conversion_workers=conversion_workers,
+        generation_concurrency=generation_concurrency,
+        embedding_concurrency=embedding_concurrency,
+        pipelined=pipelined,
+    )
     return service.build_index(
         folder,
         output_root=output_root,
@@ -524,6 +1349,71 @@ def build_markdown_index(
     )
 
 
+def prune_index(
+    folder: Path | str,
+    *,
+    output_root: Path | str | None = None,
+    metadata_root: Path | str | None = None,
+    allowed_extensions: Iterable[str] | None = None,
+    prune_unlisted: bool = False,
+) -> PruneResult:
+    """Remove index rows and markdown for files no longer under ``folder``.
+
+    Uses the same locations and extension filter as ``build_markdown_index`` so it
+    can run on its own (e.g. after deleting files) without re-indexing. Files that
+    exist but fall outside the filter are only removed with ``prune_unlisted=True``.
+    """
+
+    base_path = Path(folder).expanduser().resolve()
+    target_root, _, metadata_folder = _index_locations(base_path, output_root, metadata_root)
+    files = list_files(base_path, allowed_extensions=_build_extensions(allowed_extensions))
+    return prune_orphans(
+        files,
+        base_path=base_path,
+        markdown_root=target_root,
+        metadata_store=_default_metadata_store(metadata_folder),
+        embedding_store=_default_embedding_store(metadata_folder),
+        manifest_store=_default_manifest_store(metadata_folder),
+        prune_unlisted=prune_unlisted,
+    )
+
+
+def _refresh_indexes(
+    metadata_store: LanceMetadataStore, embedding_store: LanceEmbeddingStore
+) -> None:
+    # Readers open the stores without writing, so indexes are created here on the write side.
+    metadata_store.ensure_scalar_indexes()
+    embedding_store.ensure_scalar_indexes()
+    embedding_store.ensure_vector_indexes()
+
+
+def _index_locations(
+    base_path: Path, output_root: Path | str | None, metadata_root: Path | str | None
+) -> tuple[Path, Path, Path]:
+    """Return the markdown folder, metadata root, and metadata folder for ``base_path``."""
+
+    output_root_path = (
+        Path(output_root).expanduser().resolve()
+        if output_root is not None
+        else (base_path.parent / DEFAULT_MARKDOWN_ROOT)
+    )
+    metadata_root_path = (
+        Path(metadata_root).expanduser().resolve()
+        if metadata_root is not None
+        else (base_path.parent / DEFAULT_METADATA_ROOT)
+    )
+    return (
+        output_root_path / base_path.name,
+        metadata_root_path,
+        metadata_root_path / base_path.name,
+    )
+
+
+def _build_extensions(allowed_extensions: Iterable[str] | None) -> Iterable[str]:
+    # ``build_index`` treats a missing filter as "every file", unlike ``list_files``.
+    return allowed_extensions if allowed_extensions is not None else []
+
+
 def _default_metadata_store(folder: Path) -> LanceMetadataStore:
     return LanceMetadataStore(folder, "properties")
 
@@ -532,9 +1422,32 @@ def _default_embedding_store(folder: Path) -> LanceEmbeddingStore:
     return LanceEmbeddingStore(folder, doc_table_name="emb_doc", tag_table_name="emb_tags")
 
 
+def _default_manifest_store(folder: Path) -> LanceManifestStore:
+    return LanceManifestStore(folder, "manifest")
+
+
+def _markdown_destination(source_file: Path, base_path: Path, target_root: Path) -> Path:
+    relative_path = source_file.relative_to(base_path)
+    return (target_root / relative_path).with_name(relative_path.name + ".md")
+
+
+def _markdown_is_current(destination: Path, entry: ManifestEntry, new: set[Path]) -> bool:
+    """Return whether ``destination`` can stand in for converting its source again.
+
+    Files missing from the manifest only reuse markdown written after their last edit.
+    """
+
+    if not destination.exists():
+        return False
+    if Path(entry.source_path) not in new:
+        return True
+    return destination.stat().st_mtime_ns >= entry.mtime_ns
+
+
 def convert_to_markdown(
     source_path: Path,
     *,
+    stat: os.stat_result | None = None,
     router: ConversionRouter,
     markitdown_converter: Any | None,
     docling_converter: Any | None,
@@ -544,6 +1457,7 @@ def convert_to_markdown(
     errors: list[str] = []
     signals = gather_file_signals(
         source_path,
+        stat=stat,
         historical_success=router.historical_success_for(source_path.suffix.lower()),
     )
 
@@ -609,10 +1523,11 @@ def build_metadata_record(
     source_file: Path,
     destination: Path,
     converter_name: str,
+    stat: os.stat_result | None = None,
 ) -> dict[str, Any]:
     """Create the Lance metadata payload for ``source_file``."""
 
-    file_stat = source_file.stat()
+    file_stat = stat or source_file.stat()
     file_extension = source_file.suffix.lower() or None
     mime_type, _ = mimetypes.guess_type(source_file.name)
     file_type = mime_type or "application/octet-stream"
@@ -638,20 +1553,37 @@ def enrich_document(
     summarizer: MarkdownSummarizer | None,
     embedding_client: EmbeddingGemmaClient | None,
     source_file: Path,
+    chunker: MarkdownChunker | None = None,
+    generation_slots: threading.BoundedSemaphore | None = None,
+    embedding_slots: threading.BoundedSemaphore | None = None,
 ) -> list[dict[str, Any]]:
-    """Populate metadata with summaries/tags and return embedding records."""
+    """Populate metadata with content/summaries/tags and return embedding records.
+
+    The summary is generated while holding ``generation_slots`` and the embeddings
+    while holding ``embedding_slots``, when given, so each model's concurrency is
+    bounded separately.
+    """
+
+    metadata["content"] = markdown_text
+    with generation_slots or nullcontext():
+        summary = summarize_markdown(markdown_text, summarizer=summarizer, source_file=source_file)
+    apply_summary(metadata, summary)
+    with embedding_slots or nullcontext():
+        return generate_embedding_records(
+            metadata=metadata,
+            markdown_text=markdown_text,
+            embedding_client=embedding_client,
+            source_file=source_file,
+            chunker=chunker,
+        )
+
+
+def apply_summary(metadata: dict[str, Any], summary: MarkdownSummary | None) -> None:
+    """Copy the summary description/tags onto ``metadata`` when one was produced."""
 
-    summary = summarize_markdown(markdown_text, summarizer=summarizer, source_file=source_file)
     if summary is not None:
         metadata["description"] = summary.description
         metadata["tags"] = summary.tags
-    embeddings = generate_embedding_records(
-        metadata=metadata,
-        markdown_text=markdown_text,
-        embedding_client=embedding_client,
-        source_file=source_file,
-    )
-    return embeddings
 
 
 def summarize_markdown(
@@ -677,39 +1609,129 @@ def generate_embedding_records(
     markdown_text: str,
     embedding_client: EmbeddingGemmaClient | None,
     source_file: Path,
+    chunker: MarkdownChunker | None = None,
 ) -> list[dict[str, Any]]:
-    """Return embedding rows for the document + tag variants."""
+    """Return embedding rows for the document, tag, and chunk variants.
+
+    The document, its tags, and the chunks from ``chunker`` are embedded in one
+    ``embed_many`` call when the client supports it. Without a document vector nothing
+    is returned; a tag or chunk that fails to embed is skipped on its own.
+    """
 
     if embedding_client is None:
         return []
 
-    records: list[dict[str, Any]] = []
-    try:
-        document_embedding = embedding_client.embed(markdown_text)
+    tags: list[str] = []
+    for tag in metadata.get("tags") or []:
+        tag_text = str(tag).strip()
+        if tag_text:
+            tags.append(tag_text)
+    chunks = _split_chunks(chunker, markdown_text, source_file)
+    vectors = _embed_texts(
+        embedding_client,
+        [markdown_text, *tags, *(chunk.embedding_text for chunk in chunks)],
+        source_file=source_file,
+    )
+    if vectors is None:
+        return []
+    document_embedding = vectors[0]
+    tag_embeddings = vectors[1 : 1 + len(tags)]
+    chunk_embeddings = vectors[1 + len(tags) :]
+    if document_embedding is None:
+        logger.warning("Unable to embed %s", source_file)
+        return []
+
+    records: list[dict[str, Any]] = [
+        {
+            "source_path": metadata["source_path"],
+            "markdown_path": metadata["markdown_path"],
+            "variant": "document",
+            "variant_label": None,
+            "vector": document_embedding,
+        },
+    ]
+    for tag_text, tag_embedding in zip(tags, tag_embeddings, strict=True):
+        if tag_embedding is None:
+            logger.warning("Unable to embed tag %r for %s", tag_text, source_file)
+            continue
         records.append(
             {
                 "source_path": metadata["source_path"],
                 "markdown_path": metadata["markdown_path"],
-                "variant": "document",
-                "variant_label": None,
-                "vector": document_embedding,
+                "variant": "tags",
+                "variant_label": tag_text,
+                "vector": tag_embedding,
             },
         )
-        if metadata.get("tags"):
-            for tag in metadata["tags"]:
-                tag_text = str(tag).strip()
-                if not tag_text:
-                    continue
-                tag_embedding = embedding_client.embed(tag_text)
-                records.append(
-                    {
-                        "source_path": metadata["source_path"],
-                        "markdown_path": metadata["markdown_path"],
-                        "variant": "tags",
-                        "variant_label": tag_text,
-                        "vector": tag_embedding,
-                    },
-                )
+    records.extend(_chunk_records(metadata, chunks, chunk_embeddings, source_file))
+    return records
+
+
+def generate_chunk_records(
+    *,
+    metadata: dict[str, Any],
+    markdown_text: str,
+    embedding_client: EmbeddingGemmaClient | None,
+    source_file: Path,
+    chunker: MarkdownChunker | None,
+) -> list[dict[str, Any]]:
+    """Return only the chunk embedding rows of ``markdown_text``."""
+
+    if embedding_client is None:
+        return []
+    chunks = _split_chunks(chunker, markdown_text, source_file)
+    if not chunks:
+        return []
+    vectors = _embed_texts(
+        embedding_client, [chunk.embedding_text for chunk in chunks], source_file=source_file
+    )
+    if vectors is None:
+        return []
+    return _chunk_records(metadata, chunks, vectors, source_file)
+
+
+def _split_chunks(chunker: MarkdownChunker | None, markdown_text: str, source_file: Path):
+    if chunker is None:
+        return []
+    try:
+        return chunker.split(markdown_text)
+    except Exception as exc:  # pragma: no cover - best effort integration.
+        logger.warning("Unable to chunk %s: %s", source_file, exc)
+        return []
+
+
+def _embed_texts(
+    embedding_client: EmbeddingGemmaClient, texts: list[str], *, source_file: Path
+) -> list[Any] | None:
+    try:
+        embed_many = getattr(embedding_client, "embed_many", None)
+        if embed_many is not None:
+            return list(embed_many(texts))
+        return [embedding_client.embed(text) for text in texts]
     except Exception as exc:  # pragma: no cover - best effort integration.
         logger.warning("Unable to embed %s: %s", source_file, exc)
+        return None
+
+
+def _chunk_records(
+    metadata: dict[str, Any], chunks, vectors: Sequence[Any], source_file: Path
+) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
+    for chunk, vector in zip(chunks, vectors, strict=True):
+        if vector is None:
+            logger.warning("Unable to embed chunk %d of %s", chunk.index, source_file)
+            continue
+        records.append(
+            {
+                "source_path": metadata["source_path"],
+                "markdown_path": metadata["markdown_path"],
+                "variant": "chunks",
+                "variant_label": chunk.heading or None,
+                "chunk_index": chunk.index,
+                "start": chunk.start,
+                "end": chunk.end,
+                "heading": chunk.heading,
+                "vector": vector,
+            },
+        )
     return records
@@ -0,0 +1,220 @@
+"""Business logic for one-off migrations and upkeep of existing Lance indexes."""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Iterable
+
+from sematic_desktop.data import LanceEmbeddingStore, LanceManifestStore, LanceMetadataStore
+from sematic_desktop.foundation import TableStats
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "DEFAULT_RETENTION",
+    "PruneResult",
+    "TableMaintenance",
+    "backfill_markdown_content",
+    "compact_stores",
+    "maintain_index_tables",
+    "normalize_embedding_tables",
+    "prune_orphans",
+]
+
+DEFAULT_RETENTION = timedelta(days=7)
+
+
+@dataclass(frozen=True)
+class TableMaintenance:
+    """Storage stats for one table before and after compaction."""
+
+    table_name: str
+    before: TableStats
+    after: TableStats
+
+
+@dataclass
+class PruneResult:
+    """Orphaned source paths removed per table, plus the markdown files deleted."""
+
+    removed_rows: dict[str, int] = field(default_factory=dict)
+    removed_markdown: list[Path] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(self.removed_rows.values()) + len(self.removed_markdown)
+
+
+def normalize_embedding_tables(
+    metadata_folder: Path | str,
+    *,
+    batch_size: int = 10_000,
+) -> dict[str, int]:
+    """Rewrite legacy embedding tables with unit-length vectors.
+
+    Returns the rows rewritten per table. Running it again is a no-op because the
+    tables are flagged as normalized once the backfill completes.
+    """
+
+    store = LanceEmbeddingStore(
+        metadata_folder, doc_table_name="emb_doc", tag_table_name="emb_tags"
+    )
+    rewritten = store.normalize_existing(batch_size=batch_size)
+    for table_name, count in rewritten.items():
+        logger.info("Normalized %d vectors in %s", count, table_name)
+    return rewritten
+
+
+def backfill_markdown_content(
+    metadata_folder: Path | str,
+    *,
+    batch_size: int = 10_000,
+) -> int:
+    """Store the markdown ``content`` of records indexed before that column existed.
+
+    Affected records are found with one filtered scan, their markdown is read from
+    ``markdown_path``, and they are written back in ``batch_size`` merge-inserts.
+    Returns the number of records filled; running it again is a no-op.
+    """
+
+    store = LanceMetadataStore(metadata_folder, "properties")
+    filled: list[dict[str, Any]] = []
+    for record in store.missing_content():
+        try:
+            with open(record["markdown_path"], encoding="utf-8", newline="") as handle:
+                record["content"] = handle.read()
+        except (OSError, TypeError) as exc:
+            logger.warning("Unable to read markdown for %s: %s", record["source_path"], exc)
+            continue
+        filled.append(record)
+    for start in range(0, len(filled), batch_size):
+        store.upsert_many(filled[start : start + batch_size])
+    if filled:
+        store.ensure_scalar_indexes()
+        logger.info("Backfilled markdown content for %d records", len(filled))
+    return len(filled)
+
+
+def compact_stores(
+    metadata_store: LanceMetadataStore,
+    embedding_store: LanceEmbeddingStore,
+    *,
+    retention: timedelta = DEFAULT_RETENTION,
+) -> list[TableMaintenance]:
+    """Compact every table behind the stores and report their stats before and after.
+
+    Missing scalar and full-text indexes are created first so compaction folds every
+    row into them.
+    """
+
+    results: list[TableMaintenance] = []
+    for store in (metadata_store, embedding_store):
+        before = store.stats()
+        store.ensure_scalar_indexes()
+        store.compact(retention=retention)
+        after = store.stats()
+        for table_name, stats in before.items():
+            results.append(TableMaintenance(table_name, stats, after[table_name]))
+            logger.info(
+                "Compacted %s: %d -> %d fragments, %d -> %d versions",
+                table_name,
+                stats.fragments,
+                after[table_name].fragments,
+                stats.versions,
+                after[table_name].versions,
+            )
+    return results
+
+
+def maintain_index_tables(
+    metadata_folder: Path | str,
+    *,
+    retention: timedelta = DEFAULT_RETENTION,
+) -> list[TableMaintenance]:
+    """Compact fragments, optimize indexes, and prune old versions for one indexed folder."""
+
+    metadata_store = LanceMetadataStore(metadata_folder, "properties")
+    embedding_store = LanceEmbeddingStore(
+        metadata_folder, doc_table_name="emb_doc", tag_table_name="emb_tags"
+    )
+    return compact_stores(metadata_store, embedding_store, retention=retention)
+
+
+def prune_orphans(
+    sources: Iterable[Path | str],
+    *,
+    base_path: Path,
+    markdown_root: Path,
+    metadata_store: LanceMetadataStore,
+    embedding_store: LanceEmbeddingStore,
+    manifest_store: LanceManifestStore | None = None,
+    prune_unlisted: bool = False,
+) -> PruneResult:
+    """Delete rows and markdown whose source is not in ``sources`` and no longer exists.
+
+    ``sources`` are the resolved paths that currently exist (``list_files`` output).
+    Each table's ``source_path`` column is diffed against them and every orphan is
+    removed with one batched delete per table; markdown files under
+    ``markdown_root`` whose source under ``base_path`` is gone are unlinked and
+    emptied directories removed. Sources still on disk but missing from ``sources``
+    (e.g. after narrowing the extension filter or adding an ignore rule) are kept
+    unless ``prune_unlisted`` is set.
+    """
+
+    current = {str(source) for source in sources}
+    result = PruneResult()
+    orphans = _orphans(metadata_store.sources(), current, prune_unlisted)
+    metadata_store.delete_sources(orphans)
+    result.removed_rows[metadata_store.table_name] = len(orphans)
+    for variant, table_name in (
+        ("document", embedding_store.doc_table_name),
+        ("tags", embedding_store.tag_table_name),
+        ("chunks", embedding_store.chunk_table_name),
+    ):
+        orphans = _orphans(embedding_store.sources(variant), current, prune_unlisted)
+        embedding_store.delete_sources(orphans, variant=variant)
+        result.removed_rows[table_name] = len(orphans)
+    if manifest_store is not None:
+        orphans = _orphans(manifest_store.sources(), current, prune_unlisted)
+        manifest_store.delete_sources(orphans)
+        result.removed_rows[manifest_store.table_name] = len(orphans)
+    result.removed_markdown = _prune_markdown_tree(
+        markdown_root, base_path, current, prune_unlisted
+    )
+    if result.total:
+        logger.info(
+            "Pruned orphans of %s: %s rows, %d markdown files",
+            base_path,
+            result.removed_rows,
+            len(result.removed_markdown),
+        )
+    return result
+
+
+def _orphans(stored: set[str], current: set[str], prune_unlisted: bool) -> list[str]:
+    return sorted(
+        source for source in stored - current if prune_unlisted or not os.path.lexists(source)
+    )
+
+
+def _prune_markdown_tree(
+    markdown_root: Path, base_path: Path, current: set[str], prune_unlisted: bool
+) -> list[Path]:
+    if not markdown_root.is_dir():
+        return []
+    removed: list[Path] = []
+    for markdown in sorted(markdown_root.rglob("*.md")):
+        relative = markdown.relative_to(markdown_root)
+        source = base_path / relative.with_name(relative.name.removesuffix(".md"))
+        if str(source) not in current and (prune_unlisted or not os.path.lexists(source)):
+            markdown.unlink(missing_ok=True)
+            removed.append(markdown)
+    for directory in sorted({path.parent for path in removed}, key=lambda path: -len(path.parts)):
+        while directory != markdown_root and directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+            directory = directory.parent
+    return removed
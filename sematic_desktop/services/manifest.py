@@ -0,0 +1,93 @@
+"""Change detection for incremental indexing runs."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+__all__ = ["ManifestDiff", "ManifestEntry", "diff_manifest", "hash_file"]
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestEntry:
+    """Fingerprint of one source file as of its last successful indexing."""
+
+    source_path: str
+    size_bytes: int
+    mtime_ns: int
+    content_hash: str
+
+    def as_record(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class ManifestDiff:
+    """Files grouped by how they differ from the stored manifest.
+
+    ``entries`` holds the current fingerprint of every listed file; ``refreshed`` lists
+    unchanged files whose size or mtime moved (e.g. after a ``touch``) so their entry
+    can be rewritten and the next run skips hashing them again.
+    """
+
+    new: list[Path] = field(default_factory=list)
+    changed: list[Path] = field(default_factory=list)
+    unchanged: list[Path] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    refreshed: list[ManifestEntry] = field(default_factory=list)
+    entries: dict[str, ManifestEntry] = field(default_factory=dict)
+
+
+def hash_file(path: Path | str) -> str:
+    """Return the SHA-256 hex digest of the file at ``path``."""
+
+    with open(path, "rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def diff_manifest(
+    files: Sequence[Path],
+    previous: Mapping[str, Mapping[str, Any]],
+    *,
+    stats: Mapping[Path, os.stat_result] | None = None,
+) -> ManifestDiff:
+    """Compare ``files`` with the ``previous`` manifest rows keyed by source path.
+
+    Files whose size and mtime match their entry are unchanged without being read;
+    only the others are hashed, and a matching hash still counts as unchanged.
+    Entries whose file is no longer listed are reported in ``removed``. ``stats``
+    supplies stat results already taken while listing, so files are not stat'ed again.
+    """
+
+    diff = ManifestDiff()
+    for path in files:
+        key = str(path)
+        stat = stats.get(path) if stats is not None else None
+        if stat is None:
+            stat = path.stat()
+        recorded = previous.get(key)
+        if (
+            recorded is not None
+            and recorded["size_bytes"] == stat.st_size
+            and recorded["mtime_ns"] == stat.st_mtime_ns
+        ):
+            diff.entries[key] = ManifestEntry(
+                key, stat.st_size, stat.st_mtime_ns, recorded["content_hash"]
+            )
+            diff.unchanged.append(path)
+            continue
+        entry = ManifestEntry(key, stat.st_size, stat.st_mtime_ns, hash_file(path))
+        diff.entries[key] = entry
+        if recorded is None:
+            diff.new.append(path)
+        elif recorded["content_hash"] == entry.content_hash:
+            diff.unchanged.append(path)
+            diff.refreshed.append(entry)
+        else:
+            diff.changed.append(path)
+    listed = set(diff.entries)
+    diff.removed = sorted(path for path in previous if path not in listed)
+    return diff
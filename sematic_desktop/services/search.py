@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any, Sequence
 
@@ -10,7 +10,23 @@ from sematic_desktop.data import LanceEmbeddingStore, LanceMetadataStore
 from sematic_desktop.middleware import EmbeddingGemmaClient
 from sematic_desktop.middleware.ollama import OllamaClient
 
-__all__ = ["ContextAnswerer", "SearchHit", "SemanticSearchEngine"]
+__all__ = ["ChunkMatch", "ContextAnswerer", "SearchHit", "SemanticSearchEngine"]
+
+# Rough size of one prompt token, used to turn token budgets into character budgets.
+CHARS_PER_TOKEN = 4
+# Joins non-adjacent passages of one document inside its context.
+PASSAGE_SEPARATOR = "\n\n[...]\n\n"
+
+
+@dataclass(slots=True)
+class ChunkMatch:
+    """A matching markdown chunk; ``start``/``end`` are byte offsets into the markdown."""
+
+    chunk_index: int
+    start: int
+    end: int
+    heading: str
+    score: float
 
 
 @dataclass(slots=True)
@@ -24,18 +40,24 @@ class SearchHit:
     score: float
     variant: str
     matched_tag: str | None = None
+    chunks: list[ChunkMatch] = field(default_factory=list)
 
 
 class ContextAnswerer:
-    """Turns ranked contexts into grounded answers via Ollama."""
+    """Turns ranked contexts into grounded answers via Ollama.
+
+    Contexts are sent as given; ``max_documents`` and ``max_chars_per_doc`` only cap
+    them when set. ``SemanticSearchEngine.answer_question`` budgets its contexts
+    itself, so it needs neither.
+    """
 
     def __init__(
         self,
         *,
         client: OllamaClient | None = None,
         model: str = "gemma3:4b-it-qat",
-        max_documents: int = 3,
-        max_chars_per_doc: int = 2_000,
+        max_documents: int | None = None,
+        max_chars_per_doc: int | None = None,
     ) -> None:
         self.client = client or OllamaClient()
         self.model = model
@@ -49,26 +71,44 @@ class ContextAnswerer:
             raise ValueError("Question must contain text.")
         if not contexts:
             raise ValueError("At least one context snippet is required.")
-        prompt = self._build_prompt(question, contexts[: self.max_documents])
-        return self.client.generate(self.model, prompt)
+        return self.client.chat(self.model, self._build_messages(question, contexts))
 
-    def _build_prompt(self, question: str, contexts: Sequence[dict[str, str]]) -> str:
+    def _build_messages(
+        self, question: str, contexts: Sequence[dict[str, str]]
+    ) -> list[dict[str, str]]:
         blocks: list[str] = []
-        for idx, context in enumerate(contexts, start=1):
-            content = context.get("content", "")[: self.max_chars_per_doc]
+        for idx, context in enumerate(contexts[: self.max_documents], start=1):
+            content = context.get("content", "")
+            if self.max_chars_per_doc is not None:
+                content = content[: self.max_chars_per_doc]
             source = context.get("source_path", "unknown")
-            blocks.append(f"Document {idx} (source: {source}):\n{content}")
+            section = context.get("section")
+            label = f"source: {source}, section: {section}" if section else f"source: {source}"
+            blocks.append(f"Document {idx} ({label}):\n{content}")
         context_text = "\n\n".join(blocks)
         instructions = (
             "You are a helpful assistant with access to document snippets.\n"
             "Use ONLY the provided documents to answer the question.\n"
             "Cite the most relevant document when responding.\n"
         )
-        return f"{instructions}\n{context_text}\n\nQuestion: {question}\nAnswer:"
+        return [
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": f"{context_text}\n\nQuestion: {question}"},
+        ]
 
 
 class SemanticSearchEngine:
-    """Search facade that supports context, tag, and QA workflows."""
+    """Search facade that supports context, tag, and QA workflows.
+
+    ``answer_question`` grounds answers in the passages (stored chunks) that best match
+    the question, reading only their byte ranges from the markdown, until
+    ``context_token_budget`` tokens (estimated at ``CHARS_PER_TOKEN``) are used; no
+    document contributes more than ``context_chars_per_document`` characters.
+
+    ``search_lexical`` ranks documents with BM25 over their markdown and description
+    without embedding the query; ``search_hybrid`` fuses that ranking with the vector
+    one by reciprocal rank fusion.
+    """
 
     def __init__(
         self,
@@ -77,17 +117,45 @@ class SemanticSearchEngine:
         *,
         embedding_client: EmbeddingGemmaClient | None = None,
         answerer: ContextAnswerer | None = None,
+        nprobes: int | None = None,
+        refine_factor: int | None = None,
+        context_token_budget: int = 1_000,
+        context_chars_per_document: int = 2_000,
     ) -> None:
         self.metadata_store = metadata_store
         self.embedding_store = embedding_store
         self.embedding_client = embedding_client or EmbeddingGemmaClient()
         self.answerer = answerer or ContextAnswerer()
+        self.nprobes = nprobes
+        self.refine_factor = refine_factor
+        self.context_token_budget = context_token_budget
+        self.context_chars_per_document = context_chars_per_document
 
-    def search_context(self, query: str, *, top_k: int = 5) -> list[SearchHit]:
+    def search_context(
+        self,
+        query: str,
+        *,
+        top_k: int = 5,
+        nprobes: int | None = None,
+        refine_factor: int | None = None,
+    ) -> list[SearchHit]:
         """Return documents ranked by markdown similarity."""
-        return self._search(query, variant="document", top_k=top_k)
+        return self._search(
+            query,
+            variant="document",
+            top_k=top_k,
+            nprobes=nprobes,
+            refine_factor=refine_factor,
+        )
 
-    def search_tags(self, query: str, *, top_k: int = 5) -> list[SearchHit]:
+    def search_tags(
+        self,
+        query: str,
+        *,
+        top_k: int = 5,
+        nprobes: int | None = None,
+        refine_factor: int | None = None,
+    ) -> list[SearchHit]:
         """Return documents ranked by semantic tag similarity."""
         return self._search(
             query,
@@ -95,24 +163,181 @@ class SemanticSearchEngine:
             top_k=top_k,
             boost_exact_tags=True,
             oversample_factor=5,
+            nprobes=nprobes,
+            refine_factor=refine_factor,
+        )
+
+    def search_chunks(
+        self,
+        query: str,
+        *,
+        top_k: int = 5,
+        chunks_per_document: int = 3,
+        oversample_factor: int = 8,
+        nprobes: int | None = None,
+        refine_factor: int | None = None,
+    ) -> list[SearchHit]:
+        """Return documents ranked by their best matching chunk.
+
+        ``top_k * oversample_factor`` chunks are retrieved so several documents survive
+        the grouping; each hit keeps up to ``chunks_per_document`` of its chunks, best
+        first, in ``chunks``.
+        """
+        return self._search(
+            query,
+            variant="chunks",
+            top_k=top_k,
+            oversample_factor=oversample_factor,
+            chunks_per_document=chunks_per_document,
+            nprobes=nprobes,
+            refine_factor=refine_factor,
+        )
+
+    def search_lexical(self, query: str, *, top_k: int = 5) -> list[SearchHit]:
+        """Return documents ranked by BM25 over markdown and description; no Ollama call."""
+        query = query.strip()
+        if not query:
+            raise ValueError("Query must contain text.")
+        rows = self.metadata_store.search_text(query, limit=top_k)
+        return [
+            SearchHit(
+                source_path=row["source_path"],
+                markdown_path=str(row.get("markdown_path") or ""),
+                description=str(row.get("description") or ""),
+                tags=list(row.get("tags") or []),
+                score=float(row["_score"]),
+                variant="lexical",
+            )
+            for row in rows
+        ]
+
+    def search_hybrid(
+        self,
+        query: str,
+        *,
+        top_k: int = 5,
+        rrf_k: int = 60,
+        oversample_factor: int = 4,
+        chunks_per_document: int = 3,
+    ) -> list[SearchHit]:
+        """Return documents ranked by fusing the lexical and vector rankings.
+
+        Both rankings fetch ``top_k * oversample_factor`` candidates; a document scores
+        ``sum(1 / (rrf_k + rank))`` over the rankings it appears in, so exact terms
+        such as contract numbers and paraphrases both surface. The vector side uses
+        chunk embeddings when the index has them (their matches end up in ``chunks``)
+        and document embeddings otherwise.
+        """
+        candidates = top_k * max(1, oversample_factor)
+        lexical = self.search_lexical(query, top_k=candidates)
+        semantic = self._vector_hits(
+            query, top_k=candidates, chunks_per_document=chunks_per_document
         )
+        return _fuse_rankings([lexical, semantic], rrf_k=rrf_k)[:top_k]
 
-    def answer_question(self, question: str, *, top_k: int = 3) -> dict[str, Any]:
-        """Answer ``question`` by grounding it in the most relevant documents."""
-        hits = self.search_context(question, top_k=top_k)
+    def answer_question(
+        self, question: str, *, top_k: int = 3, token_budget: int | None = None
+    ) -> dict[str, Any]:
+        """Answer ``question`` from the best passages of the most relevant documents.
+
+        Passages are taken in score order across the ``top_k`` documents until
+        ``token_budget`` (default ``context_token_budget``) is filled, measured on the
+        decoded text including the separators between passages. Indexes without chunk
+        embeddings fall back to the start of each matching markdown file.
+        """
+        budget = max(1, token_budget if token_budget is not None else self.context_token_budget)
+        budget_chars = budget * CHARS_PER_TOKEN
+        hits = self._vector_hits(question, top_k=top_k, chunks_per_document=8)
         if not hits:
-            return {"answer": "No matching documents were found.", "hits": []}
-        contexts = []
-        for hit in hits[:top_k]:
-            snippet = self._read_markdown_snippet(hit.markdown_path)
+            return {"answer": "No matching documents were found.", "hits": [], "contexts": []}
+        if hits[0].variant == "chunks":
+            contexts = self._passage_contexts(hits, budget_chars)
+        else:
+            contexts = []
+            for hit in hits:
+                snippet = self._read_markdown_snippet(
+                    hit.markdown_path,
+                    max_chars=min(budget_chars // len(hits), self.context_chars_per_document),
+                )
+                contexts.append(
+                    {
+                        "source_path": hit.source_path,
+                        "content": snippet if snippet else hit.description,
+                    },
+                )
+        answer = self.answerer.answer(question, contexts)
+        return {"answer": answer, "hits": hits, "contexts": contexts}
+
+    def _vector_hits(self, query: str, *, top_k: int, chunks_per_document: int) -> list[SearchHit]:
+        """Rank documents by their best chunk, or by document vectors without chunks."""
+
+        vector = self._embed_query(query)
+        hits = self._search(
+            query,
+            vector=vector,
+            variant="chunks",
+            top_k=top_k,
+            oversample_factor=8,
+            chunks_per_document=chunks_per_document,
+        )
+        if hits:
+            return hits
+        return self._search(query, vector=vector, variant="document", top_k=top_k)
+
+    def _passage_contexts(self, hits: list[SearchHit], budget_chars: int) -> list[dict[str, str]]:
+        """Pick passages by score within ``budget_chars`` and read just their bytes."""
+
+        per_document = self.context_chars_per_document
+        texts = {
+            hit.source_path: self._read_chunk_bytes(hit.markdown_path, hit.chunks) for hit in hits
+        }
+        ranked = sorted(
+            ((chunk, hit) for hit in hits for chunk in hit.chunks),
+            key=lambda item: item[0].score,
+            reverse=True,
+        )
+        selected: dict[str, list[ChunkMatch]] = {}
+        used: dict[str, int] = {}
+        total = 0
+        for chunk, hit in ranked:
+            data = texts[hit.source_path].get(chunk.chunk_index)
+            if data is None:
+                continue
+            # Overlapping chunks merge into less text than this, so the sum is an upper bound.
+            size = len(data.decode("utf-8", errors="replace"))
+            if hit.source_path in selected:
+                size += len(PASSAGE_SEPARATOR)
+            document_total = used.get(hit.source_path, 0)
+            if total + size > budget_chars or document_total + size > per_document:
+                continue
+            selected.setdefault(hit.source_path, []).append(chunk)
+            used[hit.source_path] = document_total + size
+            total += size
+        if not selected and hits[0].chunks:
+            # Not even the best passage fits; keep it and cut it to the budget below.
+            selected[hits[0].source_path] = hits[0].chunks[:1]
+        contexts: list[dict[str, str]] = []
+        for hit in hits:
+            chunks = selected.get(hit.source_path)
+            if not chunks:
+                continue
+            passages = _merge_passages(
+                [
+                    (chunk.start, chunk.end, texts[hit.source_path].get(chunk.chunk_index, b""))
+                    for chunk in chunks
+                ]
+            )
+            content = PASSAGE_SEPARATOR.join(passages)
+            if not total:
+                content = content[: min(budget_chars, per_document)]
             contexts.append(
                 {
                     "source_path": hit.source_path,
-                    "content": snippet if snippet else hit.description,
+                    "section": chunks[0].heading,
+                    "content": content if content else hit.description,
                 },
             )
-        answer = self.answerer.answer(question, contexts)
-        return {"answer": answer, "hits": hits}
+        return contexts
 
     def _search(
         self,
@@ -122,17 +347,28 @@ class SemanticSearchEngine:
         top_k: int,
         boost_exact_tags: bool = False,
         oversample_factor: int = 1,
+        chunks_per_document: int = 0,
+        vector: Sequence[float] | None = None,
+        nprobes: int | None = None,
+        refine_factor: int | None = None,
     ) -> list[SearchHit]:
-        query = query.strip()
-        if not query:
-            raise ValueError("Query must contain text.")
-        vector = self.embedding_client.embed(query)
+        if vector is None:
+            vector = self._embed_query(query)
         limit = max(top_k, top_k * max(1, oversample_factor))
-        rows = self.embedding_store.search(vector, variant=variant, limit=limit)
+        rows = self.embedding_store.search(
+            vector,
+            variant=variant,
+            limit=limit,
+            nprobes=nprobes if nprobes is not None else self.nprobes,
+            refine_factor=refine_factor if refine_factor is not None else self.refine_factor,
+        )
         source_paths = [row["source_path"] for row in rows]
-        metadata_map = self.metadata_store.fetch_by_paths(source_paths)
+        metadata_map = self.metadata_store.fetch_by_paths(
+            source_paths, columns=("description", "tags")
+        )
         hits_by_source: dict[str, SearchHit] = {}
-        normalized_query = query.lower()
+        chunks_by_source: dict[str, list[ChunkMatch]] = {}
+        normalized_query = query.strip().lower()
         for row in rows:
             metadata = metadata_map.get(row["source_path"], {})
             distance = float(row.get("_distance", 1.0))
@@ -150,12 +386,46 @@ class SemanticSearchEngine:
                 variant=row["variant"],
                 matched_tag=row.get("variant_label"),
             )
+            if chunks_per_document and row.get("chunk_index") is not None:
+                chunks_by_source.setdefault(hit.source_path, []).append(
+                    ChunkMatch(
+                        chunk_index=int(row["chunk_index"]),
+                        start=int(row["start"]),
+                        end=int(row["end"]),
+                        heading=str(row.get("heading") or ""),
+                        score=similarity,
+                    )
+                )
             existing = hits_by_source.get(hit.source_path)
             if existing is None or hit.score > existing.score:
                 hits_by_source[hit.source_path] = hit
         hits = sorted(hits_by_source.values(), key=lambda item: item.score, reverse=True)
+        for hit in hits[:top_k]:
+            matches = chunks_by_source.get(hit.source_path, [])
+            matches.sort(key=lambda match: match.score, reverse=True)
+            hit.chunks = matches[:chunks_per_document]
         return hits[:top_k]
 
+    def _embed_query(self, query: str) -> Sequence[float]:
+        query = query.strip()
+        if not query:
+            raise ValueError("Query must contain text.")
+        return self.embedding_client.embed(query)
+
+    @staticmethod
+    def _read_chunk_bytes(markdown_path: str, chunks: Sequence[ChunkMatch]) -> dict[int, bytes]:
+        """Read the byte range of every chunk from one open markdown file."""
+
+        data: dict[int, bytes] = {}
+        try:
+            with open(markdown_path, "rb") as handle:
+                for chunk in chunks:
+                    handle.seek(chunk.start)
+                    data[chunk.chunk_index] = handle.read(chunk.end - chunk.start)
+        except OSError:
+            return {}
+        return data
+
     @staticmethod
     def _read_markdown_snippet(markdown_path: str, *, max_chars: int = 2_500) -> str:
         path = Path(markdown_path)
@@ -164,3 +434,38 @@ class SemanticSearchEngine:
         except OSError:
             return ""
         return text[:max_chars]
+
+
+def _merge_passages(ranges: list[tuple[int, int, bytes]]) -> list[str]:
+    """Join overlapping or adjacent ``(start, end, data)`` ranges and decode them in order."""
+
+    merged: list[tuple[int, int, bytes]] = []
+    for start, end, data in sorted(ranges, key=lambda item: item[:2]):
+        if merged and start <= merged[-1][1]:
+            first, last, joined = merged[-1]
+            if end > last:
+                joined += data[last - start :]
+            merged[-1] = (first, max(last, end), joined)
+        else:
+            merged.append((start, end, data))
+    passages = [data.decode("utf-8", errors="replace") for _, _, data in merged]
+    return [passage for passage in passages if passage.strip()]
+
+
+def _fuse_rankings(rankings: Sequence[list[SearchHit]], *, rrf_k: int) -> list[SearchHit]:
+    """Merge ``rankings`` with reciprocal rank fusion into ``hybrid`` hits."""
+
+    scores: dict[str, float] = {}
+    hits: dict[str, SearchHit] = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, start=1):
+            scores[hit.source_path] = scores.get(hit.source_path, 0.0) + 1.0 / (rrf_k + rank)
+            existing = hits.get(hit.source_path)
+            if existing is None or (hit.chunks and not existing.chunks):
+                hits[hit.source_path] = hit
+    fused = [
+        replace(hit, score=scores[source], variant="hybrid", chunks=list(hit.chunks))
+        for source, hit in hits.items()
+    ]
+    fused.sort(key=lambda item: item.score, reverse=True)
+    return fused
@@ -0,0 +1,171 @@
+"""Keep an index current by reindexing the paths a file watcher reports."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from sematic_desktop.foundation.file_watch import FileEvent, FileWatcher, open_file_watcher
+
+from .indexing import MarkdownIndexService
+
+__all__ = ["FolderWatcher"]
+
+logger = logging.getLogger(__name__)
+
+
+class FolderWatcher:
+    """Watch ``folder`` and push changed paths through ``MarkdownIndexService``.
+
+    Events are collected until the folder has been quiet for ``debounce`` seconds
+    (or the oldest pending event is ``max_delay`` seconds old, so a steady stream of
+    writes cannot postpone indexing forever). Repeated events for one path coalesce
+    into a single entry, and each flush runs ``build_index`` scoped to the pending
+    paths. A "rescan" event from the watcher falls back to a full run. When a flush
+    fails its paths stay pending and are retried after the next quiet period.
+    ``index_options`` are forwarded to every ``build_index`` call.
+    """
+
+    def __init__(
+        self,
+        folder: Path | str,
+        *,
+        service: MarkdownIndexService | None = None,
+        debounce: float = 1.0,
+        max_delay: float = 10.0,
+        backend: str = "auto",
+        poll_interval: float = 2.0,
+        watcher: FileWatcher | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        **index_options: Any,
+    ) -> None:
+        self.folder = Path(folder).expanduser().resolve()
+        self.service = service or MarkdownIndexService()
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.index_options = {"show_progress": False, **index_options}
+        self.clock = clock
+        self._watcher = watcher
+        self._pending: dict[Path, str] = {}
+        self._first_event_at: float | None = None
+        self._last_event_at: float | None = None
+        self._rescan = False
+
+    def start(self) -> list[Path]:
+        """Open the watcher, then run a full index so nothing written meanwhile is lost."""
+
+        if self._watcher is None:
+            self._watcher = open_file_watcher(
+                self.folder, backend=self.backend, poll_interval=self.poll_interval
+            )
+        return self.service.build_index(self.folder, **self.index_options)
+
+    def run(self, stop_event: threading.Event | None = None) -> None:
+        """Index the folder, then keep reindexing changes until ``stop_event`` is set.
+
+        A failing flush is logged and retried later instead of ending the loop.
+        """
+
+        stop_event = stop_event or threading.Event()
+        self.start()
+        try:
+            while not stop_event.is_set():
+                try:
+                    self.poll_once(self.debounce)
+                except Exception:
+                    logger.exception("Reindexing %s failed; will retry", self.folder)
+        finally:
+            self.close()
+
+    def poll_once(self, timeout: float) -> list[Path]:
+        """Read events for up to ``timeout`` seconds and flush them once they settle.
+
+        Returns the markdown files written by the flush, if one happened.
+        """
+
+        if self._watcher is None:
+            raise RuntimeError("FolderWatcher.start() must be called before polling.")
+        wait = timeout
+        deadline = self._flush_deadline()
+        if deadline is not None:
+            wait = min(wait, max(deadline - self.clock(), 0.0))
+        self._record(self._watcher.read(wait))
+        if not self._flush_due():
+            return []
+        return self.flush()
+
+    def flush(self) -> list[Path]:
+        """Reindex the pending paths now and return the markdown files written.
+
+        If ``build_index`` raises, the paths are queued again before the error
+        propagates, so the next flush retries them.
+        """
+
+        pending, rescan = dict(self._pending), self._rescan
+        self._pending.clear()
+        self._first_event_at = self._last_event_at = None
+        self._rescan = False
+        try:
+            if rescan:
+                logger.info("Watcher lost events; rescanning %s", self.folder)
+                return self.service.build_index(self.folder, **self.index_options)
+            if not pending:
+                return []
+            logger.info("Reindexing %d changed path(s) under %s", len(pending), self.folder)
+            return self.service.build_index(
+                self.folder, paths=sorted(pending), **self.index_options
+            )
+        except BaseException:
+            self._requeue(pending, rescan)
+            raise
+
+    @property
+    def pending(self) -> dict[Path, str]:
+        """Paths waiting for the next flush, mapped to their latest event kind."""
+
+        return dict(self._pending)
+
+    def close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+    def _record(self, events: list[FileEvent]) -> None:
+        if not events:
+            return
+        now = self.clock()
+        for event in events:
+            if event.kind == "rescan" or event.path == self.folder:
+                self._rescan = True
+                continue
+            # The latest event wins: a file saved three times or re-created after a
+            # delete is indexed once in its final state.
+            self._pending.pop(event.path, None)
+            self._pending[event.path] = event.kind
+        if self._first_event_at is None:
+            self._first_event_at = now
+        self._last_event_at = now
+
+    def _requeue(self, pending: dict[Path, str], rescan: bool) -> None:
+        # Events recorded since the failed flush are newer, so they keep their kind.
+        for path, kind in pending.items():
+            self._pending.setdefault(path, kind)
+        self._rescan = self._rescan or rescan
+        if (self._pending or self._rescan) and self._last_event_at is None:
+            self._first_event_at = self._last_event_at = self.clock()
+
+    def _flush_deadline(self) -> float | None:
+        if self._first_event_at is None or self._last_event_at is None:
+            return None
+        return min(self._last_event_at + self.debounce, self._first_event_at + self.max_delay)
+
+    def _flush_due(self) -> bool:
+        deadline = self._flush_deadline()
+        if deadline is None:
+            return False
+        return self.clock() >= deadline
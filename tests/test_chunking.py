@@ -0,0 +1,59 @@
+"""Tests for heading-aware markdown chunking."""
+
+from __future__ import annotations
+
+from sematic_desktop.middleware.chunking import MarkdownChunker
+
+DOCUMENT = """# Guide
+
+Intro paragraph about the guide. It mentions café prices.
+
+## Setup
+
+First setup paragraph with enough words to matter here.
+
+Second setup paragraph that continues the instructions.
+
+```bash
+echo one
+
+echo two
+```
+
+### Linux
+
+Linux specific notes live in this short paragraph.
+
+## Usage
+
+Usage paragraph describing the daily workflow in detail.
+"""
+
+
+def test_chunk_offsets_are_utf8_bytes_of_the_chunk_text() -> None:
+    chunks = MarkdownChunker(max_chars=120, overlap=0, min_chars=40).split(DOCUMENT)
+    encoded = DOCUMENT.encode("utf-8")
+
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    for chunk in chunks:
+        assert encoded[chunk.start : chunk.end].decode("utf-8") == chunk.text
+    assert any("```bash\necho one\n\necho two\n```" in chunk.text for chunk in chunks)
+    headings = {chunk.heading for chunk in chunks}
+    assert "Guide > Setup > Linux" in headings
+    assert "Guide > Usage" in headings
+
+
+def test_long_paragraphs_split_at_sentences_and_overlap() -> None:
+    sentences = [f"Sentence number {index} says something." for index in range(12)]
+    text = "## Notes\n\n" + " ".join(sentences)
+
+    chunks = MarkdownChunker(max_chars=120, overlap=60, min_chars=40).split(text)
+
+    assert len(chunks) > 2
+    assert all(len(chunk.text) <= 120 for chunk in chunks)
+    for previous, current in zip(chunks, chunks[1:], strict=False):
+        assert current.start < previous.end
+        assert current.heading == "Notes"
+    assert chunks[1].embedding_text.startswith("Notes\n\n")
+    assert chunks[0].embedding_text == chunks[0].text
+    assert MarkdownChunker().split("  \n\n ") == []
@@ -3,10 +3,16 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
-from sematic_desktop.middleware.embeddings import EmbeddingGemmaClient
+from sematic_desktop.middleware.caching import TieredCache
+from sematic_desktop.middleware.embeddings import (
+    CachedEmbeddingClient,
+    EmbeddingBatcher,
+    EmbeddingGemmaClient,
+)
 
 
 def test_embedding_client_parses_vector_from_response() -> None:
@@ -29,3 +35,110 @@ def test_embedding_client_rejects_empty_text() -> None:
     client = EmbeddingGemmaClient(transport=lambda _: b"{}")
     with pytest.raises(ValueError):
         client.embed("   ")
+
+
+def test_embed_many_batches_texts_and_skips_empty_items() -> None:
+    payloads: list[dict] = []
+
+    def transport(body: bytes) -> bytes:
+        payload = json.loads(body)
+        payloads.append(payload)
+        return json.dumps(
+            {"embeddings": [[float(len(text))] for text in payload["input"]]}
+        ).encode()
+
+    client = EmbeddingGemmaClient(transport=transport, max_batch_size=2)
+    vectors = client.embed_many(["a", "  ", "bbb", "cc"])
+
+    assert vectors == [[1.0], None, [3.0], [2.0]]
+    assert [payload["input"] for payload in payloads] == [["a", "bbb"], ["cc"]]
+
+
+def test_embed_many_isolates_a_failing_item() -> None:
+    def transport(body: bytes) -> bytes:
+        payload = json.loads(body)
+        if "input" in payload:
+            raise OSError("batch rejected")
+        if payload["prompt"] == "bad":
+            raise OSError("bad input")
+        return b'{"embedding": [1.0]}'
+
+    client = EmbeddingGemmaClient(transport=transport)
+
+    assert client.embed_many(["good", "bad", "fine"]) == [[1.0], None, [1.0]]
+
+
+def test_embedding_batcher_coalesces_concurrent_callers() -> None:
+    batches: list[list[str]] = []
+
+    def transport(body: bytes) -> bytes:
+        payload = json.loads(body)
+        batches.append(payload["input"])
+        return json.dumps({"embeddings": [[1.0] for _ in payload["input"]]}).encode()
+
+    client = EmbeddingGemmaClient(transport=transport)
+    with EmbeddingBatcher(client, max_batch_size=8, max_delay=0.5) as batcher:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(batcher.embed_many, [["a", "b"], ["c"], ["d", "e"], ["f"]]))
+
+    assert results == [[[1.0], [1.0]], [[1.0]], [[1.0], [1.0]], [[1.0]]]
+    assert sum(len(batch) for batch in batches) == 6
+    assert len(batches) < 4
+
+
+def _counting_client(inputs: list[str], *, model: str = "embeddinggemma:latest"):
+    def transport(body: bytes) -> bytes:
+        payload = json.loads(body)
+        inputs.extend(payload["input"])
+        return json.dumps(
+            {"embeddings": [[float(len(text)), 0.5] for text in payload["input"]]}
+        ).encode()
+
+    return EmbeddingGemmaClient(model=model, transport=transport)
+
+
+def test_cached_embedding_client_embeds_repeated_texts_once(tmp_path) -> None:
+    inputs: list[str] = []
+    cache_path = tmp_path / "embeddings.sqlite3"
+
+    with TieredCache(cache_path, namespace="embeddinggemma:latest", max_bytes=1 << 20) as cache:
+        client = CachedEmbeddingClient(
+            _counting_client(inputs), cache, model="embeddinggemma:latest"
+        )
+        first = client.embed_many(["invoice", "lease", " invoice ", ""])
+        second = client.embed_many(["lease", "invoice", "memo"])
+        stats = client.stats()
+
+    assert first == [[7.0, 0.5], [5.0, 0.5], [7.0, 0.5], None]
+    assert second == [[5.0, 0.5], [7.0, 0.5], [4.0, 0.5]]
+    assert inputs == ["invoice", "lease", "memo"]
+    assert (stats.hits, stats.misses, stats.entries) == (2, 4, 3)
+
+    with TieredCache(cache_path, namespace="embeddinggemma:latest", max_bytes=1 << 20) as cache:
+        client = CachedEmbeddingClient(
+            _counting_client(inputs), cache, model="embeddinggemma:latest"
+        )
+        assert client.embed("memo") == [4.0, 0.5]
+    assert inputs == ["invoice", "lease", "memo"]
+
+    with TieredCache(cache_path, namespace="other-model", max_bytes=1 << 20) as cache:
+        assert cache.stats().entries == 0
+        client = CachedEmbeddingClient(
+            _counting_client(inputs, model="other-model"), cache, model="other-model"
+        )
+        client.embed("memo")
+    assert inputs == ["invoice", "lease", "memo", "memo"]
+
+
+def test_tiered_cache_evicts_least_recently_used_entries(tmp_path) -> None:
+    with TieredCache(
+        tmp_path / "cache.sqlite3", namespace="m", max_bytes=350, memory_entries=0
+    ) as cache:
+        cache.put_many({"a": b"x" * 100, "b": b"x" * 100})
+        cache.get_many(["a"])
+        cache.put_many({"c": b"x" * 100, "d": b"x" * 100})
+
+        assert sorted(cache.get_many(["a", "b", "c", "d"])) == ["a", "c", "d"]
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.bytes == 300
@@ -0,0 +1,107 @@
+"""Tests for scandir-based file discovery and ignore rules."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from sematic_desktop.foundation.file_scan import FileScanner, IgnoreRules
+from sematic_desktop.services.indexing import scan_files
+
+
+def make_tree(root: Path, paths: list[str]) -> None:
+    for relative in paths:
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(relative, encoding="utf-8")
+
+
+def relative_paths(root: Path, files) -> list[str]:
+    return [scanned.path.relative_to(root).as_posix() for scanned in files]
+
+
+def test_ignore_rules_follow_gitignore_semantics() -> None:
+    rules = IgnoreRules(
+        ["# comment", "*.log", "!keep.log", "build/", "/top.txt", "docs/**/draft-*", ""],
+        base="sub",
+    )
+
+    assert rules.match("sub/a/debug.log", is_dir=False) is True
+    assert rules.match("sub/keep.log", is_dir=False) is False
+    assert rules.match("sub/a/build", is_dir=True) is True
+    assert rules.match("sub/a/build", is_dir=False) is None
+    assert rules.match("sub/top.txt", is_dir=False) is True
+    assert rules.match("sub/a/top.txt", is_dir=False) is None
+    assert rules.match("sub/docs/draft-1.md", is_dir=False) is True
+    assert rules.match("sub/docs/x/y/draft-2.md", is_dir=False) is True
+    assert rules.match("sub/notes.md", is_dir=False) is None
+
+
+def test_scan_files_prunes_excluded_and_ignored_paths(tmp_path) -> None:
+    make_tree(
+        tmp_path,
+        [
+            "a.txt",
+            "image.png",
+            "node_modules/pkg/readme.md",
+            ".semantic_index/markdown/a.txt.md",
+            ".hidden/secret.txt",
+            "notes/keep.md",
+            "notes/tmp/scratch.md",
+            "notes/private.txt",
+            "notes/deep/private.txt",
+            "other/private.txt",
+            "other/data.json",
+        ],
+    )
+    (tmp_path / ".gitignore").write_text("tmp/\n", encoding="utf-8")
+    (tmp_path / "notes" / ".semanticignore").write_text("private.txt\n", encoding="utf-8")
+
+    scanned = scan_files(tmp_path, workers=4)
+
+    assert relative_paths(tmp_path, scanned) == [
+        "a.txt",
+        "notes/keep.md",
+        "other/data.json",
+        "other/private.txt",
+    ]
+    assert all(item.stat.st_size == item.path.stat().st_size for item in scanned)
+    assert scan_files(tmp_path, workers=1) == scanned
+
+
+def test_scan_paths_applies_ignore_files_above_each_path(tmp_path) -> None:
+    make_tree(tmp_path, ["docs/a.md", "docs/skip.md", "docs/tmp/b.md", "node_modules/c.md"])
+    (tmp_path / ".gitignore").write_text("skip.md\ntmp/\n", encoding="utf-8")
+    scanner = FileScanner(extensions={".md"})
+
+    found, missing = scanner.scan_paths(
+        tmp_path,
+        [
+            tmp_path / "docs",
+            tmp_path / "docs" / "skip.md",
+            tmp_path / "docs" / "tmp" / "b.md",
+            tmp_path / "node_modules" / "c.md",
+            tmp_path / "docs" / "gone.md",
+        ],
+    )
+
+    assert relative_paths(tmp_path, found) == ["docs/a.md"]
+    assert missing == [tmp_path / "docs" / "gone.md"]
+
+
+def test_scan_follows_symlinked_directories_once(tmp_path) -> None:
+    root, outside = tmp_path / "root", tmp_path / "outside"
+    make_tree(root, ["notes/a.md"])
+    make_tree(outside, ["shared/b.md"])
+    (root / "linked").symlink_to(outside / "shared", target_is_directory=True)
+    (root / "again").symlink_to(outside / "shared", target_is_directory=True)
+    (root / "notes" / "loop").symlink_to(root, target_is_directory=True)
+    (outside / "shared" / "back").symlink_to(outside, target_is_directory=True)
+
+    found = FileScanner(extensions={".md"}, workers=1).scan(root)
+    unfollowed = FileScanner(extensions={".md"}, follow_symlinks=False).scan(root)
+
+    assert relative_paths(root, found) in (
+        ["again/b.md", "notes/a.md"],
+        ["linked/b.md", "notes/a.md"],
+    )
+    assert relative_paths(root, unfollowed) == ["notes/a.md"]
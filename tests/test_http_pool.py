@@ -0,0 +1,70 @@
+"""Tests for the keep-alive HTTP connection pool."""
+
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sematic_desktop.foundation.http_pool import HttpConnectionPool
+from sematic_desktop.middleware.embeddings import EmbeddingGemmaClient
+
+
+class _EmbeddingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections: set[tuple[str, int]] = set()
+
+    def do_POST(self) -> None:
+        type(self).connections.add(self.client_address)
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if payload.get("prompt") == "fail":
+            body = b'{"error": "bad input"}'
+            self.send_response(500)
+        else:
+            body = json.dumps({"embedding": [1.0, 2.0]}).encode()
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def stub_server():
+    _EmbeddingHandler.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EmbeddingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_reuses_connections_across_requests(stub_server) -> None:
+    pool = HttpConnectionPool(max_connections=2)
+    client = EmbeddingGemmaClient(endpoint=f"{stub_server}/api/embeddings", http_pool=pool)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        vectors = list(executor.map(client.embed, [f"text {index}" for index in range(20)]))
+
+    assert vectors == [[1.0, 2.0]] * 20
+    assert len(_EmbeddingHandler.connections) <= 2
+    pool.close()
+
+
+def test_pool_surfaces_http_errors_and_keeps_working(stub_server) -> None:
+    pool = HttpConnectionPool(max_connections=1)
+    url = f"{stub_server}/api/embeddings"
+
+    with pytest.raises(RuntimeError, match="HTTP 500"):
+        pool.post(url, b'{"prompt": "fail"}')
+    assert json.loads(pool.post(url, b'{"prompt": "ok"}')) == {"embedding": [1.0, 2.0]}
+    assert len(_EmbeddingHandler.connections) == 1
+    pool.close()
@@ -2,11 +2,30 @@
 
 from __future__ import annotations
 
+import os
+import threading
+import time
+from pathlib import Path
+
 import lancedb
 import pytest
 
+from sematic_desktop.data.stores import LanceMetadataStore
+from sematic_desktop.middleware.routing import ConversionRouter
 from sematic_desktop.middleware.summarizer import MarkdownSummary
-from sematic_desktop.services.indexing import build_markdown_index
+from sematic_desktop.services.indexing import (
+    ConvertedDocument,
+    EnrichmentStage,
+    IndexingContext,
+    IndexingPipeline,
+    IndexingTask,
+    MarkdownIndexService,
+    MetadataPersistenceService,
+    build_markdown_index,
+)
+from sematic_desktop.services.maintenance import backfill_markdown_content
+
+UNIT_VECTOR = [value / (0.1**2 + 0.2**2 + 0.3**2) ** 0.5 for value in (0.1, 0.2, 0.3)]
 
 
 class DummyMarkItDown:
@@ -62,6 +81,7 @@ def test_build_markdown_index_writes_lance_metadata(tmp_path) -> None:
     row = rows[0]
     assert row["description"] == "desc"
     assert row["tags"] == ["tag"]
+    assert row["content"] == "# Title\n\nBody"
     assert summarizer.calls
     assert embedding_client.calls
 
@@ -69,10 +89,486 @@ def test_build_markdown_index_writes_lance_metadata(tmp_path) -> None:
     doc_table = embedding_db.open_table("emb_doc")
     doc_rows = doc_table.to_arrow().to_pylist()
     assert len(doc_rows) == 1
-    assert doc_rows[0]["vector"] == pytest.approx([0.1, 0.2, 0.3])
+    assert doc_rows[0]["vector"] == pytest.approx(UNIT_VECTOR)
 
     tag_table = embedding_db.open_table("emb_tags")
     tag_rows = tag_table.to_arrow().to_pylist()
     assert len(tag_rows) == 1
     assert tag_rows[0]["tag_text"] == "tag"
-    assert tag_rows[0]["vector"] == pytest.approx([0.1, 0.2, 0.3])
+    assert tag_rows[0]["vector"] == pytest.approx(UNIT_VECTOR)
+
+    chunk_rows = embedding_db.open_table("emb_chunks").to_arrow().to_pylist()
+    markdown = outputs[0].read_bytes()
+    assert [(row["chunk_index"], row["heading"]) for row in chunk_rows] == [(0, "Title")]
+    assert markdown[chunk_rows[0]["start"] : chunk_rows[0]["end"]] == b"# Title\n\nBody"
+
+
+def test_build_markdown_index_commits_metadata_once_per_batch(tmp_path) -> None:
+    source_dir = tmp_path / "docs"
+    source_dir.mkdir()
+    for index in range(20):
+        (source_dir / f"note-{index}.txt").write_text("hello world", encoding="utf-8")
+
+    store = LanceMetadataStore(tmp_path / "metadata" / "docs", "properties")
+    store.ensure_scalar_indexes()
+    table = store.table
+    version = table.version
+
+    outputs = build_markdown_index(
+        source_dir,
+        output_root=tmp_path / "markdown",
+        metadata_root=tmp_path / "metadata",
+        allowed_extensions=["txt"],
+        markitdown_converter=DummyMarkItDown(),
+        docling_converter=None,
+        show_progress=False,
+        enable_markdown_summaries=False,
+        enable_embeddings=False,
+    )
+
+    assert len(outputs) == 20
+    table.checkout_latest()
+    assert table.count_rows() == 20
+    assert table.version == version + 1
+
+
+class FileReadingMarkItDown:
+    def __init__(self) -> None:
+        self.converted: list[str] = []
+
+    def convert(self, path: str) -> object:
+        self.converted.append(Path(path).name)
+
+        class Result:
+            text_content = Path(path).read_text(encoding="utf-8")
+
+        return Result()
+
+
+def test_build_markdown_index_reindexes_only_changed_and_removes_deleted(tmp_path) -> None:
+    source_dir = tmp_path / "docs"
+    source_dir.mkdir()
+    for name in ("keep", "edit", "touch", "drop"):
+        (source_dir / f"{name}.txt").write_text(f"{name} v1", encoding="utf-8")
+    converter = FileReadingMarkItDown()
+    service = MarkdownIndexService()
+
+    def run() -> list[Path]:
+        return service.build_index(
+            source_dir,
+            output_root=tmp_path / "markdown",
+            metadata_root=tmp_path / "metadata",
+            allowed_extensions=["txt"],
+            markitdown_converter=converter,
+            show_progress=False,
+            markdown_summarizer=DummySummarizer(),
+            embedding_client=DummyEmbeddingClient(),
+        )
+
+    assert len(run()) == 4
+    (source_dir / "edit.txt").write_text("edit v2 with more text", encoding="utf-8")
+    os.utime(source_dir / "touch.txt", ns=(1, 1))
+    (source_dir / "drop.txt").unlink()
+    converter.converted.clear()
+
+    outputs = run()
+
+    assert converter.converted == ["edit.txt"]
+    assert [path.name for path in outputs] == ["edit.txt.md"]
+    assert outputs[0].read_text(encoding="utf-8") == "edit v2 with more text"
+    diff = service.last_manifest_diff
+    assert diff is not None
+    assert [path.name for path in diff.unchanged] == ["keep.txt", "touch.txt"]
+    assert [Path(path).name for path in diff.removed] == ["drop.txt"]
+    assert not (tmp_path / "markdown" / "docs" / "drop.txt.md").exists()
+    db = lancedb.connect(str(tmp_path / "metadata" / "docs"))
+    for table_name in ("properties", "emb_doc", "emb_tags", "manifest"):
+        sources = db.open_table(table_name).to_arrow().column("source_path").to_pylist()
+        assert sorted(Path(source).name for source in sources) == [
+            "edit.txt",
+            "keep.txt",
+            "touch.txt",
+        ]
+
+    converter.converted.clear()
+    assert run() == []
+    assert converter.converted == []
+    assert service.last_manifest_diff.refreshed == []
+
+
+def test_narrowing_extensions_keeps_rows_of_files_that_still_exist(tmp_path) -> None:
+    source_dir = tmp_path / "docs"
+    source_dir.mkdir()
+    (source_dir / "note.txt").write_text("plain text", encoding="utf-8")
+    (source_dir / "readme.md").write_text("# Readme", encoding="utf-8")
+
+    def run(service: MarkdownIndexService, extensions: list[str]) -> list[Path]:
+        return service.build_index(
+            source_dir,
+            output_root=tmp_path / "markdown",
+            metadata_root=tmp_path / "metadata",
+            allowed_extensions=extensions,
+            markitdown_converter=FileReadingMarkItDown(),
+            show_progress=False,
+            markdown_summarizer=DummySummarizer(),
+            embedding_client=DummyEmbeddingClient(),
+        )
+
+    def indexed() -> dict[str, list[str]]:
+        db = lancedb.connect(str(tmp_path / "metadata" / "docs"))
+        return {
+            table_name: sorted(
+                Path(source).name
+                for source in db.open_table(table_name).to_arrow().column("source_path").to_pylist()
+            )
+            for table_name in ("properties", "emb_doc", "manifest")
+        }
+
+    assert len(run(MarkdownIndexService(), ["txt", "md"])) == 2
+    before = indexed()
+
+    service = MarkdownIndexService()
+    assert run(service, ["txt"]) == []
+
+    assert service.last_manifest_diff.removed == []
+    assert service.last_prune_result.total == 0
+    assert indexed() == before
+    assert (tmp_path / "markdown" / "docs" / "readme.md.md").exists()
+
+    pruning = MarkdownIndexService(prune_unlisted=True)
+    run(pruning, ["txt"])
+
+    assert indexed() == {table: ["note.txt"] for table in before}
+    assert not (tmp_path / "markdown" / "docs" / "readme.md.md").exists()
+
+
+class TaggingSummarizer:
+    def __init__(self, tags: list[str]) -> None:
+        self.tags = tags
+
+    def summarize(self, markdown_text: str) -> MarkdownSummary:
+        return MarkdownSummary(description="desc", tags=self.tags)
+
+
+class BrokenEmbeddingClient:
+    def embed(self, markdown_text: str) -> list[float]:
+        raise ConnectionError("ollama is down")
+
+
+def test_changed_file_keeps_its_vectors_until_reembedded(tmp_path) -> None:
+    source_dir = tmp_path / "docs"
+    source_dir.mkdir()
+    note = source_dir / "note.txt"
+    note.write_text("first draft", encoding="utf-8")
+
+    def run(tags: list[str], embedding_client: object) -> list[Path]:
+        return build_markdown_index(
+            source_dir,
+            output_root=tmp_path / "markdown",
+            metadata_root=tmp_path / "metadata",
+            allowed_extensions=["txt"],
+            markitdown_converter=FileReadingMarkItDown(),
+            show_progress=False,
+            markdown_summarizer=TaggingSummarizer(tags),
+            embedding_client=embedding_client,
+        )
+
+    def stored() -> dict[str, list[str]]:
+        db = lancedb.connect(str(tmp_path / "metadata" / "docs"))
+        return {
+            "docs": db.open_table("emb_doc").to_arrow().column("source_path").to_pylist(),
+            "tags": sorted(db.open_table("emb_tags").to_arrow().column("tag_text").to_pylist()),
+            "chunks": db.open_table("emb_chunks").to_arrow().column("source_path").to_pylist(),
+        }
+
+    run(["old", "shared"], DummyEmbeddingClient())
+    before = stored()
+    note.write_text("second draft", encoding="utf-8")
+
+    assert run(["new", "shared"], BrokenEmbeddingClient()) == []
+
+    assert stored() == before
+    assert (tmp_path / "markdown" / "docs" / "note.txt.md").read_text() == "first draft"
+
+    assert len(run(["new", "shared"], DummyEmbeddingClient())) == 1
+    assert stored() == {**before, "tags": ["new", "shared"]}
+
+
+class RecordingMetadataStore:
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def upsert_many(self, records: list[dict]) -> None:
+        self.batches.append([record["source_path"] for record in records])
+
+
+def test_metadata_persistence_flushes_on_interval_and_exit() -> None:
+    store = RecordingMetadataStore()
+    now = [0.0]
+    service = MetadataPersistenceService(
+        store, batch_size=100, flush_interval=5.0, clock=lambda: now[0]
+    )
+
+    with pytest.raises(RuntimeError), service:
+        service.write({"source_path": "a"})
+        now[0] = 6.0
+        service.write({"source_path": "b"})
+        service.write({"source_path": "c"})
+        raise RuntimeError("boom")
+
+    assert store.batches == [["a", "b"], ["c"]]
+
+
+def test_build_markdown_index_converts_in_worker_processes(tmp_path) -> None:
+    source_dir = tmp_path / "docs"
+    source_dir.mkdir()
+    for index in range(4):
+        (source_dir / f"note-{index}.txt").write_text("hello world", encoding="utf-8")
+    router = ConversionRouter()
+
+    outputs = build_markdown_index(
+        source_dir,
+        output_root=tmp_path / "markdown",
+        metadata_root=tmp_path / "metadata",
+        allowed_extensions=["txt"],
+        markitdown_converter=DummyMarkItDown(),
+        docling_converter=None,
+        router=router,
+        show_progress=False,
+        enable_markdown_summaries=False,
+        enable_embeddings=False,
+        conversion_workers=2,
+    )
+
+    assert [path.name for path in outputs] == [f"note-{index}.txt.md" for index in range(4)]
+    assert all(path.read_text(encoding="utf-8") == "# Title\n\nBody" for path in outputs)
+    assert sorted(entry["path"] for entry in router.telemetry) == sorted(
+        str(path) for path in source_dir.iterdir()
+    )
+    assert router.historical_success_for(".txt")["markitdown"] > 0.5
+
+
+class ConcurrencyProbe:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self) -> None:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+
+
+class SlowSummarizer:
+    def __init__(self) -> None:
+        self.probe = ConcurrencyProbe()
+
+    def summarize(self, markdown_text: str) -> MarkdownSummary:
+        self.probe()
+        if markdown_text == "broken":
+            raise RuntimeError("model unavailable")
+        return MarkdownSummary(description=markdown_text, tags=[])
+
+
+class SlowEmbeddingClient:
+    def __init__(self) -> None:
+        self.probe = ConcurrencyProbe()
+
+    def embed(self, markdown_text: str) -> list[float]:
+        self.probe()
+        return [0.1, 0.2, 0.3]
+
+
+def test_enrichment_stage_limits_generation_and_embedding_separately(tmp_path) -> None:
+    summarizer = SlowSummarizer()
+    embedding_client = SlowEmbeddingClient()
+    context = IndexingContext(
+        base_path=tmp_path,
+        target_root=tmp_path / "markdown",
+        metadata_store=None,
+        embedding_store=None,
+        summarizer=summarizer,
+        embedding_client=embedding_client,
+        router=ConversionRouter(),
+        markitdown_converter=None,
+        docling_converter=None,
+    )
+    documents = []
+    for index in range(12):
+        source = tmp_path / f"note-{index}.txt"
+        source.write_text("x", encoding="utf-8")
+        text = "broken" if index == 5 else f"doc {index}"
+        task = IndexingTask(source_path=source, destination_path=tmp_path / f"{index}.md")
+        documents.append(ConvertedDocument(task=task, markdown_text=text, converter_name="test"))
+
+    stage = EnrichmentStage(generation_concurrency=3, embedding_concurrency=2)
+    enriched = list(stage.run(documents, context))
+
+    assert [item.converted for item in enriched] == documents
+    assert [item.metadata["description"] for item in enriched][4:7] == ["doc 4", "", "doc 6"]
+    assert all(len(item.embeddings) == 1 for item in enriched)
+    assert 1 < summarizer.probe.peak <= 3
+    assert 1 < embedding_client.probe.peak <= 2
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_enrichment_stage_skips_a_document_that_fails(tmp_path, concurrency) -> None:
+    context = IndexingContext(
+        base_path=tmp_path,
+        target_root=tmp_path / "markdown",
+        metadata_store=None,
+        embedding_store=None,
+        summarizer=DummySummarizer(),
+        embedding_client=DummyEmbeddingClient(),
+        router=ConversionRouter(),
+        markitdown_converter=None,
+        docling_converter=None,
+    )
+    documents = []
+    for index in range(6):
+        source = tmp_path / f"note-{index}.txt"
+        if index != 2:
+            source.write_text("x", encoding="utf-8")
+        task = IndexingTask(source_path=source, destination_path=tmp_path / f"{index}.md")
+        documents.append(ConvertedDocument(task=task, markdown_text="x", converter_name="test"))
+
+    stage = EnrichmentStage(generation_concurrency=concurrency, embedding_concurrency=concurrency)
+    enriched = list(stage.run(documents, context))
+
+    assert [item.converted for item in enriched] == documents[:2] + documents[3:]
+
+
+class DoublingStage:
+    def run(self, items, _):
+        for item in items:
+            yield item * 2
+
+
+class FailingStage:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def run(self, items, _):
+        try:
+            for item in items:
+                if item == 6:
+                    raise ValueError("bad item")
+                yield item
+        finally:
+            self.closed = True
+
+
+class RecordingStage:
+    def __init__(self) -> None:
+        self.seen: list[int] = []
+        self.flushed = False
+
+    def run(self, items, _):
+        try:
+            for item in items:
+                self.seen.append(item)
+                yield item
+        finally:
+            self.flushed = True
+
+
+def test_pipelined_run_overlaps_stages_and_reports_queue_fill() -> None:
+    pipeline = IndexingPipeline([DoublingStage(), DoublingStage()], pipelined=True, queue_size=2)
+
+    assert pipeline.run(range(50), None) == [item * 4 for item in range(50)]
+    assert [stats.name for stats in pipeline.queue_stats] == [
+        "DoublingStage input",
+        "DoublingStage input",
+        "output",
+    ]
+    assert all(stats.samples == 51 and stats.peak <= 2 for stats in pipeline.queue_stats)
+
+
+def test_pipelined_run_propagates_errors_and_closes_stages() -> None:
+    failing, recording = FailingStage(), RecordingStage()
+    pipeline = IndexingPipeline([DoublingStage(), failing, recording], pipelined=True)
+
+    with pytest.raises(ValueError, match="bad item"):
+        pipeline.run(range(10), None)
+
+    assert failing.closed
+    assert recording.flushed
+    assert recording.seen == [0, 2, 4]
+
+
+def test_migration_backfills_missing_markdown_content(tmp_path) -> None:
+    source_dir = tmp_path / "docs"
+    source_dir.mkdir()
+    (source_dir / "note.txt").write_text("hello world", encoding="utf-8")
+    options = dict(
+        output_root=tmp_path / "markdown",
+        metadata_root=tmp_path / "metadata",
+        allowed_extensions=["txt"],
+        markitdown_converter=DummyMarkItDown(),
+        docling_converter=None,
+        show_progress=False,
+        markdown_summarizer=DummySummarizer(),
+        enable_embeddings=False,
+    )
+    build_markdown_index(source_dir, **options)
+    table = LanceMetadataStore(tmp_path / "metadata" / "docs", "properties").table
+    table.update(values={"content": None})
+
+    version = table.version
+
+    assert build_markdown_index(source_dir, **options) == []
+    table.checkout_latest()
+    assert table.version == version
+
+    assert backfill_markdown_content(tmp_path / "metadata" / "docs") == 1
+    assert backfill_markdown_content(tmp_path / "metadata" / "docs") == 0
+    table.checkout_latest()
+    row = table.to_arrow().to_pylist()[0]
+    assert (row["content"], row["description"]) == ("# Title\n\nBody", "desc")
+
+
+class CrlfMarkItDown:
+    text = "# Título\r\n\r\nCafé crème brûlée.\r\n\r\n## Übersicht\r\n\r\nMehr Text – näher.\r\n"
+
+    def convert(self, _: str) -> object:
+        class Result:
+            text_content = self.text
+
+        return Result()
+
+
+def test_chunk_offsets_match_markdown_bytes_with_crlf_and_non_ascii(tmp_path) -> None:
+    source_dir = tmp_path / "docs"
+    source_dir.mkdir()
+    (source_dir / "note.txt").write_text("ignored", encoding="utf-8")
+    options = dict(
+        output_root=tmp_path / "markdown",
+        metadata_root=tmp_path / "metadata",
+        allowed_extensions=["txt"],
+        markitdown_converter=CrlfMarkItDown(),
+        docling_converter=None,
+        show_progress=False,
+        markdown_summarizer=DummySummarizer(),
+        embedding_client=DummyEmbeddingClient(),
+    )
+    [markdown] = build_markdown_index(source_dir, **options)
+    chunks = lancedb.connect(str(tmp_path / "metadata" / "docs")).open_table("emb_chunks")
+
+    def chunk_texts() -> list[str]:
+        chunks.checkout_latest()
+        rows = sorted(chunks.to_arrow().to_pylist(), key=lambda row: row["chunk_index"])
+        return [data[row["start"] : row["end"]].decode("utf-8") for row in rows]
+
+    data = markdown.read_bytes()
+    assert data == CrlfMarkItDown.text.encode("utf-8")
+    indexed = chunk_texts()
+    assert "Café crème brûlée." in indexed[0] and "Mehr Text – näher." in indexed[-1]
+
+    chunks.delete("true")
+    assert build_markdown_index(source_dir, **options) == []
+
+    assert chunk_texts() == indexed
@@ -0,0 +1,314 @@
+"""Tests for the low-level Lance helpers."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from sematic_desktop.data.stores import LanceEmbeddingStore, LanceMetadataStore
+from sematic_desktop.foundation.lance import (
+    create_doc_table,
+    create_metadata_table,
+    create_tag_table,
+    ensure_scalar_indexes,
+    ensure_vector_index,
+    fetch_metadata_rows,
+    find_vector_index,
+    normalize_stored_vectors,
+    search_text,
+    search_vectors,
+    upsert_metadata_rows,
+    upsert_vectors,
+    vector_dimension,
+    vector_metric,
+    vectors_are_normalized,
+)
+
+
+def _doc_row(name: str, vector: list[float] | None) -> dict[str, object]:
+    return {"source_path": f"/docs/{name}", "markdown_path": f"/md/{name}.md", "vector": vector}
+
+
+def test_search_vectors_returns_top_k_in_distance_order(tmp_path) -> None:
+    table = create_doc_table(tmp_path, "emb_doc")
+    table.add(
+        [
+            _doc_row("far", [-1.0, 0.0]),
+            _doc_row("exact", [2.0, 0.0]),
+            _doc_row("close", [1.0, 0.5]),
+            _doc_row("orthogonal", [0.0, 3.0]),
+        ],
+    )
+
+    rows = search_vectors(table, [1.0, 0.0], limit=2)
+
+    assert [row["source_path"] for row in rows] == ["/docs/exact", "/docs/close"]
+    assert rows[0]["_distance"] == pytest.approx(0.0, abs=1e-6)
+    assert rows[0]["markdown_path"] == "/md/exact.md"
+    assert rows[0]["vector"] == pytest.approx([2.0, 0.0])
+
+
+def test_search_vectors_reads_only_requested_columns(tmp_path) -> None:
+    table = create_tag_table(tmp_path, "emb_tags", dim=2)
+    table.add([{**_doc_row("a", [1.0, 0.0]), "tag_text": "lease"}])
+
+    rows = search_vectors(table, [1.0, 0.0], limit=1, columns=["source_path"])
+
+    assert set(rows[0]) == {"source_path", "vector", "_distance"}
+
+
+def test_search_vectors_skips_null_and_mismatched_vectors(tmp_path) -> None:
+    table = create_doc_table(tmp_path, "emb_doc")
+    table.add(
+        [
+            _doc_row("missing", None),
+            _doc_row("zero", [0.0, 0.0]),
+            _doc_row("match", [0.5, 0.5]),
+        ],
+    )
+    table.add([_doc_row("wrong-dim", [1.0, 0.0, 0.0])])
+
+    rows = search_vectors(table, [1.0, 0.0], limit=5)
+
+    assert [row["source_path"] for row in rows] == ["/docs/match", "/docs/zero"]
+    assert rows[1]["_distance"] == float("inf")
+
+
+def _fixed_size_table(root, *, rows: int, dim: int = 16):
+    table = create_doc_table(root, "emb_doc", dim=dim)
+    vectors = np.random.default_rng(0).standard_normal((rows, dim), dtype=np.float32)
+    table.add(
+        [_doc_row(str(index), vector.tolist()) for index, vector in enumerate(vectors)],
+    )
+    return table, vectors
+
+
+def test_ensure_vector_index_waits_for_threshold_then_builds(tmp_path) -> None:
+    table, vectors = _fixed_size_table(tmp_path, rows=300)
+
+    assert ensure_vector_index(table, min_rows=1_000) == "below-threshold"
+    assert find_vector_index(table) is None
+    assert ensure_vector_index(table, min_rows=256) == "created"
+    assert ensure_vector_index(table, min_rows=256) == "current"
+
+    rows = search_vectors(table, vectors[7].tolist(), limit=1, nprobes=50, refine_factor=5)
+    assert rows[0]["source_path"] == "/docs/7"
+
+
+def test_ann_search_scores_match_exact_scan_on_normalized_tables(tmp_path) -> None:
+    table, vectors = _fixed_size_table(tmp_path, rows=600, dim=8)
+    normalize_stored_vectors(table, key_columns=["source_path"])
+    query = (vectors[3] * 4.0 + vectors[9]).tolist()
+    exact = search_vectors(table, query, limit=3)
+
+    assert ensure_vector_index(table, min_rows=256) == "created"
+    approximate = search_vectors(table, query, limit=3, nprobes=50, refine_factor=20)
+
+    assert [row["source_path"] for row in approximate] == [row["source_path"] for row in exact]
+    assert [row["_distance"] for row in approximate] == pytest.approx(
+        [row["_distance"] for row in exact], abs=1e-4
+    )
+    assert all(0.0 <= row["_distance"] <= 2.0 for row in approximate)
+
+
+def test_ensure_vector_index_skips_variable_length_vectors(tmp_path) -> None:
+    table = create_doc_table(tmp_path, "emb_doc")
+    table.add([_doc_row("only", [1.0, 0.0])])
+
+    assert ensure_vector_index(table, min_rows=0) == "unsupported"
+
+
+def test_create_doc_table_migrates_variable_length_vectors_in_place(tmp_path) -> None:
+    legacy = create_doc_table(tmp_path, "emb_doc")
+    legacy.add([_doc_row("a", [1.0, 0.0, 0.0]), _doc_row("b", None)])
+    assert vector_dimension(legacy) is None
+
+    table = create_doc_table(tmp_path, "emb_doc")
+
+    assert vector_dimension(table) == 3
+    rows = {row["source_path"]: row["vector"] for row in table.to_arrow().to_pylist()}
+    assert rows == {"/docs/a": pytest.approx([1.0, 0.0, 0.0]), "/docs/b": None}
+    with pytest.raises(ValueError, match="3-dimensional"):
+        create_doc_table(tmp_path, "emb_doc", dim=4)
+
+
+def test_embedding_store_fixes_vector_width_from_first_embedding(tmp_path) -> None:
+    store = LanceEmbeddingStore(tmp_path)
+    assert vector_dimension(store.doc_table) is None
+
+    store.upsert_many(
+        [
+            {
+                "source_path": str(tmp_path / "note.txt"),
+                "markdown_path": str(tmp_path / "note.txt.md"),
+                "variant": "document",
+                "variant_label": None,
+                "vector": [0.1, 0.2],
+            },
+        ],
+    )
+
+    assert vector_dimension(store.doc_table) == 2
+    assert vector_dimension(store.tag_table) == 2
+
+
+def test_normalize_stored_vectors_backfills_and_switches_to_dot_product(tmp_path) -> None:
+    table = create_doc_table(tmp_path, "emb_doc", dim=2)
+    table.add([_doc_row("a", [3.0, 4.0]), _doc_row("b", [0.0, 2.0]), _doc_row("c", None)])
+    assert not vectors_are_normalized(table)
+
+    rewritten = normalize_stored_vectors(table, key_columns=["source_path"], batch_size=2)
+
+    assert rewritten == 3
+    assert vectors_are_normalized(table)
+    assert vector_metric(table) == "dot"
+    rows = {row["source_path"]: row["vector"] for row in table.to_arrow().to_pylist()}
+    assert rows["/docs/a"] == pytest.approx([0.6, 0.8])
+    assert rows["/docs/b"] == pytest.approx([0.0, 1.0])
+    assert rows["/docs/c"] is None
+    hits = search_vectors(table, [0.0, 5.0], limit=1)
+    assert hits[0]["source_path"] == "/docs/b"
+    assert hits[0]["_distance"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_upsert_vectors_commits_each_table_once_per_batch(tmp_path) -> None:
+    doc_table = create_doc_table(tmp_path, "emb_doc", dim=2)
+    tag_table = create_tag_table(tmp_path, "emb_tags", dim=2)
+    doc_table.add([_doc_row("a", [0.0, 1.0])])
+    doc_version, tag_version = doc_table.version, tag_table.version
+
+    upsert_vectors(
+        doc_table=doc_table,
+        tag_table=tag_table,
+        doc_records=[_doc_row("a", [1.0, 0.0]), _doc_row("b", [0.0, 1.0])],
+        tag_records=[
+            {**_doc_row("a", [1.0, 0.0]), "tag_text": "lease"},
+            {**_doc_row("a", [0.0, 1.0]), "tag_text": "invoice"},
+            {**_doc_row("a", [0.6, 0.8]), "tag_text": "invoice"},
+        ],
+    )
+
+    assert doc_table.version == doc_version + 1
+    assert tag_table.version == tag_version + 1
+    docs = {row["source_path"]: row["vector"] for row in doc_table.to_arrow().to_pylist()}
+    assert docs == {"/docs/a": pytest.approx([1.0, 0.0]), "/docs/b": pytest.approx([0.0, 1.0])}
+    tags = {row["tag_text"]: row["vector"] for row in tag_table.to_arrow().to_pylist()}
+    assert tags == {"lease": pytest.approx([1.0, 0.0]), "invoice": pytest.approx([0.6, 0.8])}
+
+
+def test_chunk_upsert_replaces_previous_chunks_of_each_source(tmp_path) -> None:
+    store = LanceEmbeddingStore(tmp_path)
+
+    def chunks(name: str, count: int) -> list[dict[str, object]]:
+        return [
+            {
+                **_doc_row(name, [1.0, float(index)]),
+                "variant": "chunks",
+                "chunk_index": index,
+                "start": index * 10,
+                "end": index * 10 + 10,
+                "heading": f"Section {index}",
+            }
+            for index in range(count)
+        ]
+
+    store.upsert_many(chunks("a", 3) + chunks("b", 2))
+    version = store.chunk_table.version
+    store.upsert_many(chunks("a", 1))
+
+    assert store.chunk_table.version == version + 1
+    rows = store.chunk_table.to_arrow().to_pylist()
+    assert sorted((row["source_path"], row["chunk_index"]) for row in rows) == [
+        ("/docs/a", 0),
+        ("/docs/b", 0),
+        ("/docs/b", 1),
+    ]
+    assert store.sources("chunks") == {"/docs/a", "/docs/b"}
+    hits = store.search([0.0, 1.0], variant="chunks", limit=1)
+    assert (hits[0]["source_path"], hits[0]["variant_label"]) == ("/docs/b", "Section 1")
+
+
+def test_fetch_metadata_rows_filters_and_projects(tmp_path) -> None:
+    table = create_metadata_table(tmp_path, "properties")
+    names = ["a", "b", "o'brien", "c"]
+    upsert_metadata_rows(
+        table,
+        [{"source_path": f"/docs/{name}", "description": name, "tags": [name]} for name in names],
+    )
+
+    rows = fetch_metadata_rows(
+        table,
+        ["/docs/o'brien", "/docs/c", "/docs/missing"],
+        columns=["description"],
+        chunk_size=1,
+    )
+
+    assert rows == {
+        "/docs/o'brien": {"source_path": "/docs/o'brien", "description": "o'brien"},
+        "/docs/c": {"source_path": "/docs/c", "description": "c"},
+    }
+
+
+def test_ensure_scalar_indexes_creates_then_extends(tmp_path) -> None:
+    table = create_tag_table(tmp_path, "emb_tags", dim=2)
+    indexes = {"source_path": "BTREE", "tag_text": "BITMAP"}
+
+    assert ensure_scalar_indexes(table, indexes) == {
+        "source_path": "created",
+        "tag_text": "created",
+    }
+    table.add([{**_doc_row(str(index), [1.0, 0.0]), "tag_text": "lease"} for index in range(5)])
+    assert ensure_scalar_indexes(table, indexes) == {
+        "source_path": "current",
+        "tag_text": "current",
+    }
+    assert ensure_scalar_indexes(table, indexes, min_unindexed_rows=1) == {
+        "source_path": "extended",
+        "tag_text": "extended",
+    }
+    stats = table.index_stats("source_path_idx")
+    assert (stats.num_indexed_rows, stats.num_unindexed_rows) == (5, 0)
+    plan = table.search().where("source_path = '/docs/3'").explain_plan()
+    assert "ScalarIndexQuery" in plan
+
+
+def test_search_text_matches_unindexed_rows_without_writing(tmp_path) -> None:
+    table = create_metadata_table(tmp_path, "properties")
+    indexes = {"content": "FTS", "description": "FTS"}
+    table.add([{"source_path": "/docs/old", "description": "lease", "content": "Old terms"}])
+    ensure_scalar_indexes(table, indexes)
+    table.add([{"source_path": "/docs/new", "description": "memo", "content": "Ref AB-1234"}])
+    version = table.version
+
+    rows = search_text(table, "AB-1234", columns=list(indexes), limit=5, select=["source_path"])
+
+    assert [row["source_path"] for row in rows] == ["/docs/new"]
+    assert table.version == version
+    assert table.index_stats("content_idx").num_unindexed_rows == 1
+
+
+def test_opening_stores_does_not_write(tmp_path) -> None:
+    metadata_table = create_metadata_table(tmp_path, "properties")
+    metadata_table.add([{"source_path": "/docs/a", "description": "a", "content": "A"}])
+    doc_table = create_doc_table(tmp_path, "emb_doc", dim=2)
+    doc_table.add([_doc_row("a", [1.0, 0.0])])
+    versions = (metadata_table.version, doc_table.version)
+
+    metadata_store = LanceMetadataStore(tmp_path, "properties")
+    embedding_store = LanceEmbeddingStore(tmp_path)
+    metadata_store.search_text("A", limit=1)
+    embedding_store.search([1.0, 0.0], variant="document", limit=1)
+
+    assert (metadata_store.table.version, embedding_store.doc_table.version) == versions
+    assert metadata_store.table.list_indices() == []
+    assert not vectors_are_normalized(embedding_store.tag_table)
+    embedding_store.upsert_many(
+        [{**_doc_row("a", [0.0, 2.0]), "variant": "tags", "variant_label": "lease"}]
+    )
+    assert vectors_are_normalized(embedding_store.tag_table)
+    metadata_store.ensure_scalar_indexes()
+    assert {index.columns[0] for index in metadata_store.table.list_indices()} == {
+        "source_path",
+        "content",
+        "description",
+    }
@@ -0,0 +1,112 @@
+"""Tests for compaction, version cleanup, and orphan pruning of the Lance tables."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from sematic_desktop.data.stores import (
+    LanceEmbeddingStore,
+    LanceManifestStore,
+    LanceMetadataStore,
+)
+from sematic_desktop.services.indexing import prune_index
+from sematic_desktop.services.maintenance import maintain_index_tables
+
+
+def test_maintain_index_tables_compacts_and_prunes(tmp_path) -> None:
+    metadata_store = LanceMetadataStore(tmp_path, "properties")
+    embedding_store = LanceEmbeddingStore(tmp_path)
+    for index in range(6):
+        source = f"/docs/{index}.txt"
+        metadata_store.upsert({"source_path": source, "description": "d", "tags": ["t"]})
+        embedding_store.upsert_many(
+            [
+                {
+                    "source_path": source,
+                    "markdown_path": f"{source}.md",
+                    "variant": "document",
+                    "vector": [1.0, 0.0],
+                }
+            ]
+        )
+
+    results = {
+        result.table_name: result
+        for result in maintain_index_tables(tmp_path, retention=timedelta(0))
+    }
+
+    assert set(results) == {"properties", "emb_doc", "emb_tags", "emb_chunks"}
+    properties = results["properties"]
+    assert properties.before.fragments == 6
+    assert properties.after.fragments == 1
+    assert properties.after.versions < properties.before.versions
+    assert properties.after.rows == 6
+    assert results["emb_doc"].after.fragments == 1
+    reopened = LanceMetadataStore(tmp_path, "properties")
+    assert reopened.fetch_by_paths(["/docs/3.txt"])["/docs/3.txt"]["description"] == "d"
+
+
+def test_prune_index_removes_rows_and_markdown_of_deleted_files(tmp_path) -> None:
+    source_dir = tmp_path / "docs"
+    (source_dir / "sub").mkdir(parents=True)
+    markdown_dir = tmp_path / "markdown" / "docs"
+    metadata_folder = tmp_path / "metadata" / "docs"
+    metadata_store = LanceMetadataStore(metadata_folder, "properties")
+    embedding_store = LanceEmbeddingStore(metadata_folder)
+    manifest_store = LanceManifestStore(metadata_folder)
+    for relative in ("keep.txt", "gone.txt", "sub/old.txt"):
+        source = source_dir / relative
+        if relative == "keep.txt":
+            source.write_text("still here", encoding="utf-8")
+        markdown = markdown_dir / f"{relative}.md"
+        markdown.parent.mkdir(parents=True, exist_ok=True)
+        markdown.write_text("# md", encoding="utf-8")
+        metadata_store.upsert({"source_path": str(source), "tags": ["t"]})
+        embedding_store.upsert_many(
+            [
+                {
+                    "source_path": str(source),
+                    "markdown_path": str(markdown),
+                    "variant": variant,
+                    "variant_label": "t",
+                    "chunk_index": 0,
+                    "start": 0,
+                    "end": 4,
+                    "vector": [1.0, 0.0],
+                }
+                for variant in ("document", "tags", "chunks")
+            ]
+        )
+        manifest_store.upsert_many(
+            [{"source_path": str(source), "size_bytes": 1, "mtime_ns": 1, "content_hash": "h"}]
+        )
+    (source_dir / "sub").rmdir()
+
+    result = prune_index(
+        source_dir,
+        output_root=tmp_path / "markdown",
+        metadata_root=tmp_path / "metadata",
+        allowed_extensions=["txt"],
+    )
+
+    assert result.removed_rows == {
+        "properties": 2,
+        "emb_doc": 2,
+        "emb_tags": 2,
+        "emb_chunks": 2,
+        "manifest": 2,
+    }
+    assert sorted(path.name for path in result.removed_markdown) == ["gone.txt.md", "old.txt.md"]
+    assert [path.name for path in markdown_dir.rglob("*")] == ["keep.txt.md"]
+    keep = str(source_dir / "keep.txt")
+    assert LanceMetadataStore(metadata_folder, "properties").sources() == {keep}
+    reopened = LanceEmbeddingStore(metadata_folder)
+    assert reopened.sources("document") == reopened.sources("tags") == {keep}
+    assert reopened.sources("chunks") == {keep}
+    assert LanceManifestStore(metadata_folder).sources() == {keep}
+    assert (
+        prune_index(
+            source_dir, output_root=tmp_path / "markdown", metadata_root=tmp_path / "metadata"
+        ).total
+        == 0
+    )
@@ -0,0 +1,110 @@
+"""Tests for the OllamaClient HTTP backend and its CLI fallback."""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sematic_desktop.middleware.ollama import OllamaClient, OllamaError
+from sematic_desktop.middleware.summarizer import SUMMARY_SCHEMA, MarkdownSummarizer
+
+
+class _OllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    requests: list[tuple[str, dict]] = []
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).requests.append((self.path, payload))
+        if self.path == "/api/chat":
+            reply = {"message": {"role": "assistant", "content": " chat reply "}}
+        else:
+            reply = {"response": '{"description": "Doc summary", "tags": ["Alpha"]}'}
+        body = json.dumps(reply).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def ollama_server():
+    _OllamaHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _unused_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def test_summarizer_uses_http_generate_with_json_schema(ollama_server) -> None:
+    client = OllamaClient(host=ollama_server, keep_alive="10m", num_ctx=8192)
+
+    summary = MarkdownSummarizer(client=client).summarize("# Heading\n\nBody")
+
+    assert summary.description == "Doc summary"
+    assert summary.tags == ["alpha"]
+    path, payload = _OllamaHandler.requests[0]
+    assert path == "/api/generate"
+    assert payload["format"] == SUMMARY_SCHEMA
+    assert payload["stream"] is False
+    assert payload["keep_alive"] == "10m"
+    assert payload["options"] == {"num_ctx": 8192}
+
+
+def test_chat_posts_messages(ollama_server) -> None:
+    client = OllamaClient(host=ollama_server, backend="http")
+    messages = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Hi"}]
+
+    assert client.chat("gemma3", messages) == "chat reply"
+    assert _OllamaHandler.requests == [
+        ("/api/chat", {"model": "gemma3", "messages": messages, "stream": False})
+    ]
+
+
+def test_auto_backend_falls_back_to_cli_when_server_is_down() -> None:
+    host = f"http://127.0.0.1:{_unused_port()}"
+
+    cli = OllamaClient(host=host, binary="echo", keep_alive=0)
+    assert (
+        cli.generate("gemma3", "hello", format="json") == "run gemma3 --format json --keepalive 0"
+    )
+    with pytest.raises(OllamaError):
+        OllamaClient(host=host, backend="http").generate("gemma3", "hello")
+
+
+def test_auto_backend_does_not_fall_back_on_timeouts() -> None:
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        host = f"http://127.0.0.1:{listener.getsockname()[1]}"
+
+        client = OllamaClient(host=host, binary="echo", timeout=0.2)
+        with pytest.raises(OllamaError):
+            client.generate("gemma3", "hello")
+
+
+def test_cli_options_route_to_cli_or_are_rejected(ollama_server) -> None:
+    messages = [{"role": "user", "content": "Hi"}]
+
+    client = OllamaClient(host=ollama_server, binary="echo")
+    assert client.generate("gemma3", "hello", options=["--verbose"]) == "run gemma3 --verbose"
+    assert client.chat("gemma3", messages, options=["--verbose"]) == "run gemma3 --verbose"
+    assert _OllamaHandler.requests == []
+    with pytest.raises(ValueError):
+        OllamaClient(host=ollama_server, backend="http").chat("gemma3", messages, options=["-v"])
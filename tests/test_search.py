@@ -4,8 +4,10 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from sematic_desktop.data.stores import LanceEmbeddingStore, LanceMetadataStore
-from sematic_desktop.services.search import SemanticSearchEngine
+from sematic_desktop.services.search import ContextAnswerer, SemanticSearchEngine
 
 
 class StubEmbeddingClient:
@@ -101,3 +103,176 @@ def test_search_engine_supports_all_modes(tmp_path) -> None:
     assert "answer: What is note?" == answer_payload["answer"]
     assert answerer.calls
     assert answer_payload["hits"]
+
+
+def test_search_chunks_ranks_documents_by_their_best_chunks(tmp_path) -> None:
+    metadata_store = LanceMetadataStore(tmp_path / "metadata", "docs")
+    embedding_store = LanceEmbeddingStore(tmp_path / "embeddings")
+    records = []
+    for name, vectors in (("a", [[0.6, 0.8], [0.0, 1.0]]), ("b", [[1.0, 0.0], [0.8, 0.6]])):
+        source = str(tmp_path / "docs" / f"{name}.txt")
+        metadata_store.upsert({"source_path": source, "description": f"doc {name}", "tags": []})
+        records.extend(
+            {
+                "source_path": source,
+                "markdown_path": f"{source}.md",
+                "variant": "chunks",
+                "chunk_index": index,
+                "start": index * 100,
+                "end": index * 100 + 50,
+                "heading": f"{name} {index}",
+                "vector": vector,
+            }
+            for index, vector in enumerate(vectors)
+        )
+    embedding_store.upsert_many(records)
+    engine = SemanticSearchEngine(
+        metadata_store,
+        embedding_store,
+        embedding_client=StubEmbeddingClient({"default": [1.0, 0.0]}),
+        answerer=StubAnswerer(),
+    )
+
+    hits = engine.search_chunks("anything", top_k=2, chunks_per_document=1)
+
+    assert [Path(hit.source_path).name for hit in hits] == ["b.txt", "a.txt"]
+    assert hits[0].description == "doc b"
+    assert [(chunk.chunk_index, chunk.start, chunk.heading) for chunk in hits[0].chunks] == [
+        (0, 0, "b 0")
+    ]
+    assert [chunk.chunk_index for chunk in hits[1].chunks] == [0]
+    assert hits[0].score == pytest.approx(1.0)
+
+
+def test_answer_question_reads_best_passages_within_token_budget(tmp_path) -> None:
+    metadata_store = LanceMetadataStore(tmp_path / "metadata", "docs")
+    embedding_store = LanceEmbeddingStore(tmp_path / "embeddings")
+    sections = {
+        "Front matter": "x" * 300,
+        "Rent": "Rent is due monthly.",
+        "Pets": "No pets – später.",
+    }
+    markdown = "".join(f"## {title}\n\n{body}\n\n" for title, body in sections.items())
+    markdown_path = _write_markdown(tmp_path, "lease.md", markdown)
+    encoded = markdown.encode("utf-8")
+    source = str(tmp_path / "docs" / "lease.txt")
+    metadata_store.upsert({"source_path": source, "description": "Lease", "tags": []})
+    vectors = {"Front matter": [0.0, 1.0], "Rent": [1.0, 0.0], "Pets": [0.8, 0.6]}
+    records = []
+    for index, title in enumerate(sections):
+        start = encoded.index(f"## {title}".encode())
+        end = start + len(f"## {title}\n\n{sections[title]}".encode())
+        records.append(
+            {
+                "source_path": source,
+                "markdown_path": str(markdown_path),
+                "variant": "chunks",
+                "chunk_index": index,
+                "start": start,
+                "end": end,
+                "heading": title,
+                "vector": vectors[title],
+            }
+        )
+    embedding_store.upsert_many(records)
+    answerer = StubAnswerer()
+    engine = SemanticSearchEngine(
+        metadata_store,
+        embedding_store,
+        embedding_client=StubEmbeddingClient({"default": [1.0, 0.0]}),
+        answerer=answerer,
+        context_token_budget=16,
+    )
+
+    payload = engine.answer_question("When is rent due?", top_k=1)
+
+    assert payload["contexts"] == [
+        {
+            "source_path": source,
+            "section": "Rent",
+            "content": "## Rent\n\nRent is due monthly.\n\n[...]\n\n## Pets\n\nNo pets – später.",
+        }
+    ]
+    assert len(payload["contexts"][0]["content"]) == 16 * 4
+    assert answerer.calls[0][1] == payload["contexts"]
+
+    # The separator counts against the budget, so both passages no longer fit.
+    payload = engine.answer_question("When is rent due?", top_k=1, token_budget=15)
+    assert payload["contexts"][0]["content"] == "## Rent\n\nRent is due monthly."
+
+    # 26 characters fit in 28 even though the passage is 29 bytes long.
+    payload = engine.answer_question("When is rent due?", top_k=1, token_budget=7)
+    assert payload["contexts"][0]["content"] == "## Pets\n\nNo pets – später."
+
+    payload = engine.answer_question("When is rent due?", top_k=1, token_budget=4)
+    assert payload["contexts"][0]["content"] == "## Rent\n\nRent is"
+
+
+def test_context_answerer_sends_budgeted_contexts_unchanged() -> None:
+    contexts = [{"source_path": f"/docs/{index}", "content": "x" * 3_000} for index in range(5)]
+
+    prompt = ContextAnswerer()._build_messages("Why?", contexts)[1]["content"]
+
+    assert prompt.count("x" * 3_000) == 5 and "Document 5 (source: /docs/4)" in prompt
+    capped = ContextAnswerer(max_documents=2, max_chars_per_doc=10)._build_messages(
+        "Why?", contexts
+    )
+    assert "Document 3" not in capped[1]["content"] and "x" * 11 not in capped[1]["content"]
+
+
+class FailingEmbeddingClient:
+    def embed(self, text: str) -> list[float]:
+        raise AssertionError("lexical search must not embed the query")
+
+
+def test_lexical_and_hybrid_search_fuse_bm25_with_vectors(tmp_path) -> None:
+    metadata_store = LanceMetadataStore(tmp_path / "metadata", "docs")
+    embedding_store = LanceEmbeddingStore(tmp_path / "embeddings")
+    documents = {
+        "a": ("Contract AB-1234 covers the lease terms.", [0.0, 1.0]),
+        "b": ("Holiday photos from the coast.", [1.0, 0.0]),
+        "c": ("Notes about the lease renewal.", [0.8, 0.6]),
+    }
+    for name, (content, vector) in documents.items():
+        source = str(tmp_path / "docs" / f"{name}.txt")
+        metadata_store.upsert(
+            {
+                "source_path": source,
+                "markdown_path": f"{source}.md",
+                "description": f"doc {name}",
+                "tags": [],
+                "content": content,
+            }
+        )
+        embedding_store.upsert_many(
+            [
+                {
+                    "source_path": source,
+                    "markdown_path": f"{source}.md",
+                    "variant": "document",
+                    "vector": vector,
+                }
+            ]
+        )
+
+    lexical = SemanticSearchEngine(
+        metadata_store,
+        embedding_store,
+        embedding_client=FailingEmbeddingClient(),
+        answerer=StubAnswerer(),
+    ).search_lexical("AB-1234")
+    assert [Path(hit.source_path).name for hit in lexical] == ["a.txt"]
+    assert lexical[0].variant == "lexical" and lexical[0].description == "doc a"
+
+    engine = SemanticSearchEngine(
+        metadata_store,
+        embedding_store,
+        embedding_client=StubEmbeddingClient({"default": [1.0, 0.0]}),
+        answerer=StubAnswerer(),
+    )
+    hits = engine.search_hybrid("AB-1234 lease", top_k=3)
+
+    assert [Path(hit.source_path).name for hit in hits] == ["a.txt", "c.txt", "b.txt"]
+    assert {hit.variant for hit in hits} == {"hybrid"}
+    assert hits[0].score == pytest.approx(1 / 61 + 1 / 63)
+    assert hits[2].score == pytest.approx(1 / 61)
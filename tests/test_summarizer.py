@@ -2,16 +2,25 @@
 
 from __future__ import annotations
 
-from sematic_desktop.middleware.summarizer import MarkdownSummarizer
+from sematic_desktop.middleware.caching import TieredCache
+from sematic_desktop.middleware.summarizer import (
+    SUMMARY_PROMPT_VERSION,
+    SUMMARY_SCHEMA,
+    MarkdownSummarizer,
+)
 
 
 class StubOllamaClient:
     def __init__(self, response: str) -> None:
         self.response = response
         self.requests: list[tuple[str, str]] = []
+        self.formats: list[object] = []
 
-    def generate(self, model: str, prompt: str) -> str:  # pragma: no cover - exercised indirectly
+    def generate(
+        self, model: str, prompt: str, *, format: object = None
+    ) -> str:  # pragma: no cover - exercised indirectly
         self.requests.append((model, prompt))
+        self.formats.append(format)
         return self.response
 
 
@@ -25,6 +34,7 @@ def test_markdown_summarizer_normalizes_tags() -> None:
     assert summary.description == "Doc summary"
     assert summary.tags == ["alpha", "beta"]
     assert client.requests  # ensures the client was invoked
+    assert client.formats == [SUMMARY_SCHEMA]
 
 
 def test_markdown_summarizer_extracts_json_from_wrapped_output() -> None:
@@ -36,3 +46,30 @@ def test_markdown_summarizer_extracts_json_from_wrapped_output() -> None:
 
     assert summary.description == "Terse"
     assert summary.tags == ["one", "two"]
+
+
+def test_markdown_summarizer_reuses_cached_summaries(tmp_path) -> None:
+    response = '{"description": "Doc summary", "tags": ["Alpha"]}'
+    client = StubOllamaClient(response)
+    cache_path = tmp_path / "summaries.sqlite3"
+    summarizer = MarkdownSummarizer(client=client)
+    assert SUMMARY_PROMPT_VERSION in summarizer.cache_namespace
+
+    with TieredCache(cache_path, namespace=summarizer.cache_namespace, max_bytes=1 << 20) as cache:
+        summarizer.cache = cache
+        first = summarizer.summarize("# Same content")
+        second = summarizer.summarize("  # Same content\n")
+        summarizer.summarize("# Other content")
+        stats = summarizer.cache_stats()
+
+    assert first == second
+    assert len(client.requests) == 2
+    assert stats is not None
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+
+    shorter = MarkdownSummarizer(client=client, max_chars=100)
+    with TieredCache(cache_path, namespace=shorter.cache_namespace, max_bytes=1 << 20) as cache:
+        assert cache.stats().entries == 0
+        shorter.cache = cache
+        shorter.summarize("# Same content")
+    assert len(client.requests) == 3
@@ -0,0 +1,77 @@
+"""Tests for the resident vector matrix cache."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from sematic_desktop.data.stores import LanceEmbeddingStore
+from sematic_desktop.foundation.lance import create_doc_table
+from sematic_desktop.foundation.vector_cache import ResidentVectorMatrix
+
+
+def _doc_row(name: str, vector: list[float]) -> dict[str, object]:
+    return {"source_path": f"/docs/{name}", "markdown_path": f"/md/{name}.md", "vector": vector}
+
+
+def _cache(max_bytes: int = 1_000_000) -> ResidentVectorMatrix:
+    return ResidentVectorMatrix(key_columns=["source_path", "markdown_path"], max_bytes=max_bytes)
+
+
+def test_resident_matrix_picks_up_appends_and_deletes(tmp_path) -> None:
+    table = create_doc_table(tmp_path, "emb_doc", dim=2)
+    table.add([_doc_row("a", [1.0, 0.0]), _doc_row("b", [0.0, 1.0])])
+    cache = _cache()
+
+    rows = cache.search(table, [1.0, 0.1], limit=1)
+    assert rows is not None and rows[0]["source_path"] == "/docs/a"
+    assert rows[0]["markdown_path"] == "/md/a.md"
+    assert rows[0]["vector"] == pytest.approx([1.0, 0.0])
+
+    table.add([_doc_row("c", [1.0, 0.1])])
+    rows = cache.search(table, [1.0, 0.1], limit=1)
+    assert rows is not None and rows[0]["source_path"] == "/docs/c"
+    assert rows[0]["_distance"] == pytest.approx(0.0, abs=1e-6)
+
+    table.delete("source_path = '/docs/c'")
+    rows = cache.search(table, [1.0, 0.1], limit=3)
+    assert rows is not None
+    assert [row["source_path"] for row in rows] == ["/docs/a", "/docs/b"]
+
+
+def test_resident_matrix_respects_memory_cap_and_eviction(tmp_path) -> None:
+    table = create_doc_table(tmp_path, "emb_doc", dim=2)
+    table.add([_doc_row("a", [1.0, 0.0])])
+
+    assert _cache(max_bytes=4).search(table, [1.0, 0.0], limit=1) is None
+
+    cache = _cache()
+    assert cache.search(table, [1.0, 0.0], limit=1)
+    assert cache.nbytes > 0
+    cache.evict()
+    assert cache.nbytes == 0
+
+
+def test_store_searches_the_ann_index_instead_of_the_resident_copy(tmp_path) -> None:
+    store = LanceEmbeddingStore(
+        tmp_path, resident_cache_max_bytes=1_000_000, vector_index_min_rows=256
+    )
+    vectors = np.random.default_rng(5).normal(size=(600, 8))
+    store.upsert_many(
+        [
+            {**_doc_row(str(index), vector.tolist()), "variant": "document"}
+            for index, vector in enumerate(vectors)
+        ]
+    )
+    cache = store._resident["document"]
+
+    exact = store.search(vectors[3].tolist(), variant="document", limit=3)
+    assert cache.nbytes > 0
+
+    assert store.ensure_vector_indexes()["emb_doc"] == "created"
+    approximate = store.search(
+        vectors[3].tolist(), variant="document", limit=3, nprobes=50, refine_factor=20
+    )
+
+    assert cache.nbytes == 0
+    assert [row["source_path"] for row in approximate] == [row["source_path"] for row in exact]
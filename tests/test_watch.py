@@ -0,0 +1,231 @@
+"""Tests for file watching and incremental reindexing of watched folders."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import lancedb
+import pytest
+
+from sematic_desktop.foundation.file_watch import (
+    FileEvent,
+    InotifyWatcher,
+    PollingWatcher,
+    inotify_available,
+)
+from sematic_desktop.services.indexing import MarkdownIndexService
+from sematic_desktop.services.watch import FolderWatcher
+
+
+def test_polling_watcher_reports_changed_and_removed_files(tmp_path) -> None:
+    (tmp_path / "keep.txt").write_text("keep", encoding="utf-8")
+    (tmp_path / "drop.txt").write_text("drop", encoding="utf-8")
+    (tmp_path / ".hidden").mkdir()
+    watcher = PollingWatcher(tmp_path, interval=0.0)
+
+    (tmp_path / "drop.txt").unlink()
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "new.txt").write_text("new", encoding="utf-8")
+    (tmp_path / ".hidden" / "skip.txt").write_text("skip", encoding="utf-8")
+    events = watcher.read(timeout=0.0)
+
+    assert sorted((event.path.relative_to(tmp_path), event.kind) for event in events) == [
+        (Path("drop.txt"), "removed"),
+        (Path("sub/new.txt"), "changed"),
+    ]
+    assert watcher.read(timeout=0.0) == []
+
+
+@pytest.mark.skipif(not inotify_available(), reason="inotify is Linux-only")
+def test_inotify_watcher_follows_new_and_moved_directories(tmp_path) -> None:
+    watcher = InotifyWatcher(tmp_path)
+    try:
+        (tmp_path / "sub").mkdir()
+        assert watcher.read(timeout=1.0) == [FileEvent(tmp_path / "sub", "changed")]
+
+        (tmp_path / "sub" / "note.txt").write_text("hello", encoding="utf-8")
+        os.rename(tmp_path / "sub", tmp_path / "moved")
+        events = watcher.read(timeout=1.0)
+    finally:
+        watcher.close()
+
+    assert FileEvent(tmp_path / "sub" / "note.txt", "changed") in events
+    assert events[-2:] == [
+        FileEvent(tmp_path / "sub", "removed"),
+        FileEvent(tmp_path / "moved", "changed"),
+    ]
+
+
+class FakeWatcher:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.batches: list[list[FileEvent]] = []
+        self.timeouts: list[float] = []
+        self.closed = False
+
+    def read(self, timeout: float) -> list[FileEvent]:
+        self.timeouts.append(timeout)
+        return self.batches.pop(0) if self.batches else []
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class RecordingService:
+    def __init__(self) -> None:
+        self.calls: list[list[Path] | None] = []
+
+    def build_index(self, folder, *, paths=None, **_) -> list[Path]:
+        self.calls.append(None if paths is None else list(paths))
+        return []
+
+
+def test_folder_watcher_debounces_and_coalesces_events(tmp_path) -> None:
+    fake = FakeWatcher(tmp_path)
+    service = RecordingService()
+    now = [0.0]
+    watcher = FolderWatcher(
+        tmp_path,
+        service=service,
+        watcher=fake,
+        debounce=1.0,
+        max_delay=3.0,
+        clock=lambda: now[0],
+    )
+    watcher.start()
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+
+    fake.batches = [
+        [FileEvent(a, "changed"), FileEvent(a, "changed")],
+        [FileEvent(b, "removed")],
+        [FileEvent(b, "changed")],
+    ]
+    watcher.poll_once(5.0)
+    now[0] = 0.5
+    watcher.poll_once(5.0)
+    assert watcher.pending == {a: "changed", b: "removed"}
+    now[0] = 1.0
+    watcher.poll_once(5.0)
+    assert fake.timeouts == [5.0, 0.5, 0.5]
+    assert service.calls == [None]
+
+    now[0] = 2.0
+    watcher.poll_once(5.0)
+
+    assert service.calls == [None, [a, b]]
+    assert watcher.pending == {}
+
+    for step in range(1, 6):
+        fake.batches = [[FileEvent(a, "changed")]]
+        now[0] = 2.0 + step * 0.9
+        watcher.poll_once(0.0)
+    assert service.calls == [None, [a, b], [a]]
+
+    fake.batches = [[FileEvent(tmp_path, "rescan")]]
+    watcher.poll_once(0.0)
+    now[0] += 1.0
+    watcher.poll_once(0.0)
+    assert service.calls == [None, [a, b], [a], None]
+
+
+class FlakyService(RecordingService):
+    def __init__(self, failures: int, stop_event: threading.Event | None = None) -> None:
+        super().__init__()
+        self.failures = failures
+        self.stop_event = stop_event
+
+    def build_index(self, folder, *, paths=None, **options) -> list[Path]:
+        super().build_index(folder, paths=paths, **options)
+        if paths is not None and self.failures:
+            self.failures -= 1
+            raise RuntimeError("index unavailable")
+        if paths is not None and self.stop_event is not None:
+            self.stop_event.set()
+        return []
+
+
+def test_folder_watcher_requeues_paths_when_a_flush_fails(tmp_path) -> None:
+    fake = FakeWatcher(tmp_path)
+    service = FlakyService(failures=1)
+    now = [0.0]
+    watcher = FolderWatcher(
+        tmp_path, service=service, watcher=fake, debounce=1.0, clock=lambda: now[0]
+    )
+    watcher.start()
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+
+    fake.batches = [[FileEvent(a, "changed"), FileEvent(b, "removed")]]
+    watcher.poll_once(0.0)
+    now[0] = 1.0
+    with pytest.raises(RuntimeError):
+        watcher.poll_once(0.0)
+    assert watcher.pending == {a: "changed", b: "removed"}
+
+    fake.batches = [[FileEvent(b, "changed")]]
+    watcher.poll_once(0.0)
+    now[0] = 2.0
+    watcher.poll_once(0.0)
+
+    assert service.calls == [None, [a, b], [a, b]]
+    assert watcher.pending == {}
+
+
+def test_folder_watcher_run_survives_failing_flushes(tmp_path) -> None:
+    fake = FakeWatcher(tmp_path)
+    stop_event = threading.Event()
+    service = FlakyService(failures=2, stop_event=stop_event)
+    watcher = FolderWatcher(tmp_path, service=service, watcher=fake, debounce=0.0)
+    fake.batches = [[FileEvent(tmp_path / "a.txt", "changed")]]
+
+    watcher.run(stop_event)
+
+    assert service.calls == [None, *[[tmp_path / "a.txt"]] * 3]
+    assert fake.closed
+
+
+class FileReadingMarkItDown:
+    def convert(self, path: str) -> object:
+        class Result:
+            text_content = Path(path).read_text(encoding="utf-8")
+
+        return Result()
+
+
+def test_folder_watcher_indexes_new_files_and_removes_deleted_ones(tmp_path) -> None:
+    source_dir = tmp_path / "docs"
+    source_dir.mkdir()
+    (source_dir / "old.txt").write_text("old", encoding="utf-8")
+    service = MarkdownIndexService()
+    watcher = FolderWatcher(
+        source_dir,
+        service=service,
+        backend="polling",
+        poll_interval=0.0,
+        debounce=0.0,
+        output_root=tmp_path / "markdown",
+        metadata_root=tmp_path / "metadata",
+        allowed_extensions=["txt"],
+        markitdown_converter=FileReadingMarkItDown(),
+        enable_markdown_summaries=False,
+        enable_embeddings=False,
+    )
+    try:
+        assert [path.name for path in watcher.start()] == ["old.txt.md"]
+
+        (source_dir / "new.txt").write_text("new", encoding="utf-8")
+        (source_dir / "old.txt").unlink()
+        written = watcher.poll_once(0.0)
+    finally:
+        watcher.close()
+
+    assert [path.name for path in written] == ["new.txt.md"]
+    diff = service.last_manifest_diff
+    assert [path.name for path in diff.new] == ["new.txt"]
+    assert [Path(path).name for path in diff.removed] == ["old.txt"]
+    assert not (tmp_path / "markdown" / "docs" / "old.txt.md").exists()
+    db = lancedb.connect(str(tmp_path / "metadata" / "docs"))
+    for table_name in ("properties", "manifest"):
+        sources = db.open_table(table_name).to_arrow().column("source_path").to_pylist()
+        assert [Path(source).name for source in sources] == ["new.txt"]
@@ -0,0 +1,52 @@
+"""Index a folder, then keep the index current as files change."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+
+from sematic_desktop.presentation.index_cli import run_watch_cli
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Watch a folder and reindex files as they are added, edited, or deleted.",
+    )
+    parser.add_argument(
+        "--folder",
+        default="my_folder",
+        help="Source folder to index and watch (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=1.0,
+        help="Seconds of quiet before pending changes are indexed (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("auto", "inotify", "polling"),
+        default="auto",
+        help="Change notification backend; 'auto' prefers inotify (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between scans when polling (default: %(default)s).",
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    print(f"Watching {Path(args.folder).resolve()} (Ctrl+C to stop).")
+    run_watch_cli(
+        Path(args.folder),
+        debounce=args.debounce,
+        backend=args.backend,
+        poll_interval=args.poll_interval,
+    )
+
+
+if __name__ == "__main__":
+    main()